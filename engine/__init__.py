@@ -4,10 +4,14 @@ A comprehensive trading signal engine that replicates Pine Script PulseWave S/R
 
 Components:
 - sr_engine: Support/Resistance level detection
+- indicators: Shared indicator cache (ATR, ADX, EMA, RSI, ...)
 - regime_detector: Market regime classification  
 - confluence_scorer: Multi-factor signal scoring
 - signal_generator: Trading signal generation
 - backtester: Performance analysis
+- sweep: Parallel parameter grid search over backtests
+- walk_forward: Rolling in-sample optimization, stitched out-of-sample runs
+- portfolio: Multi-symbol backtest with shared capital
 - data_fetcher: OHLCV data from Binance
 - main: Complete platform integration
 
@@ -23,11 +27,15 @@ __version__ = "1.1.0"
 __author__ = "PulseWave Development Team"
 
 # Core imports
-from .sr_engine import SupportResistanceEngine, SRLevel, SRResult
-from .regime_detector import RegimeDetector, RegimeResult, MarketRegime
+from .sr_engine import SupportResistanceEngine, StreamingSREngine, SRLevel, SRResult, SRResultArray, SRHistory
+from .indicators import IndicatorFrame
+from .regime_detector import RegimeDetector, RegimeState, RegimeTracker, RegimeResult, RegimeTransition, MarketRegime
 from .confluence_scorer import ConfluenceScorer, ConfluenceResult, SignalDirection
 from .signal_generator import SignalGenerator, TradingSignal, Signal
 from .backtester import PulseWaveBacktester, BacktestResult, PositionSizing
+from .sweep import ParameterSweep
+from .walk_forward import WalkForward, WalkForwardResult
+from .portfolio import PortfolioBacktester
 from .data_fetcher import BinanceDataFetcher, fetch_crypto_data
 from .main import PulseWavePlatform
 
@@ -36,19 +44,30 @@ __all__ = [
     # Core classes
     'PulseWavePlatform',
     'SupportResistanceEngine',
+    'StreamingSREngine',
     'RegimeDetector', 
+    'RegimeState',
+    'RegimeTracker',
     'ConfluenceScorer',
     'SignalGenerator',
     'PulseWaveBacktester',
+    'ParameterSweep',
+    'WalkForward',
+    'PortfolioBacktester',
     'BinanceDataFetcher',
+    'IndicatorFrame',
     
     # Data structures
     'SRLevel',
     'SRResult',
+    'SRResultArray',
+    'SRHistory',
     'RegimeResult',
+    'RegimeTransition',
     'ConfluenceResult', 
     'TradingSignal',
     'BacktestResult',
+    'WalkForwardResult',
     
     # Enums
     'MarketRegime',
@@ -7,12 +7,13 @@ Supports position sizing: fixed, percent, Kelly criterion
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, NamedTuple
+from typing import List, Dict, Optional, NamedTuple, Tuple
 from enum import Enum
 import logging
 from dataclasses import dataclass
 
-from signal_generator import SignalGenerator, TradingSignal, Signal
+from signal_generator import SignalGenerator, SignalSeries, TradingSignal, Signal
+from indicators import IndicatorFrame, indicator_frame
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,7 @@ class Trade:
     exit_reason: str
     bars_held: int
     confidence: float
+    symbol: Optional[str] = None  # Set by the portfolio backtester
 
 
 class BacktestResult(NamedTuple):
@@ -60,6 +62,18 @@ class BacktestResult(NamedTuple):
     largest_win: float
     largest_loss: float
     avg_bars_held: float
+    equity_curve: Optional[pd.Series] = None  # Equity by bar, starting with initial capital
+
+
+class OpenPosition(NamedTuple):
+    """Open position record used by the backtest simulation kernel"""
+    signal_type: Signal
+    entry_index: int
+    entry_price: float
+    stop_loss: float
+    take_profit: float
+    position_size: float
+    confidence: float
 
 
 class PulseWaveBacktester:
@@ -93,15 +107,31 @@ class PulseWaveBacktester:
         self.initial_capital = initial_capital
         
     def _calculate_position_size(self, data: pd.DataFrame, signal: TradingSignal,
-                               current_capital: float, index: int) -> float:
+                               current_capital: float, index: int,
+                               indicators: Optional[IndicatorFrame] = None,
+                               atr: Optional[float] = None) -> float:
         """
         Calculate position size based on selected method
+        
+        atr, when given, is the ATR at index and replaces the one computed from data.
         """
         if signal.signal == Signal.NEUTRAL:
             return 0.0
         
-        current_price = signal.entry_price
-        risk_per_share = abs(signal.entry_price - signal.stop_loss)
+        if self.position_sizing == PositionSizing.ATR and atr is None:
+            if indicators is not None and len(indicators) == index + 1:
+                atr = self._calculate_atr(data, indicators=indicators)
+            else:
+                atr = self._calculate_atr(data.iloc[:index+1])
+        
+        return self._size_position(signal.entry_price, signal.stop_loss, signal.risk_reward_ratio,
+                                   current_capital, atr)
+    
+    def _size_position(self, entry_price: float, stop_loss: float, risk_reward_ratio: float,
+                       current_capital: float, atr: Optional[float] = None) -> float:
+        """Shares for a LONG/SHORT entry; atr is only read by ATR sizing"""
+        current_price = entry_price
+        risk_per_share = abs(entry_price - stop_loss)
         
         if self.position_sizing == PositionSizing.FIXED:
             # Fixed dollar amount
@@ -114,7 +144,6 @@ class PulseWaveBacktester:
             
         elif self.position_sizing == PositionSizing.ATR:
             # ATR-based position sizing
-            atr = self._calculate_atr(data.iloc[:index+1])
             atr_multiple = risk_per_share / atr if atr > 0 else 1
             base_size = current_capital * 0.02  # Base 2% risk
             shares = base_size / (atr * max(atr_multiple, 1))
@@ -123,7 +152,7 @@ class PulseWaveBacktester:
             # Kelly criterion (simplified - would need historical win/loss data)
             # Using conservative approach
             win_rate = 0.55  # Assume based on confluence score
-            avg_win = signal.risk_reward_ratio
+            avg_win = risk_reward_ratio
             avg_loss = 1.0
             kelly_pct = (win_rate * avg_win - (1 - win_rate) * avg_loss) / avg_win
             kelly_pct = max(0, min(kelly_pct * 0.5, 0.05))  # Conservative Kelly
@@ -137,23 +166,26 @@ class PulseWaveBacktester:
         max_shares = (current_capital * 0.95) / current_price  # Keep 5% cash buffer
         return min(shares, max_shares)
     
-    def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_atr(self, data: pd.DataFrame, period: int = 14,
+                       indicators: Optional[IndicatorFrame] = None) -> float:
         """Calculate Average True Range"""
+        high_low = data['high'].iloc[-1] - data['low'].iloc[-1]
+        
         if len(data) < period + 1:
-            return data['high'].iloc[-1] - data['low'].iloc[-1]
+            return high_low
         
-        high = data['high']
-        low = data['low']
-        close = data['close']
+        atr = indicator_frame(data, indicators).atr(period).iloc[-1]
         
-        high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
+        return atr if not np.isnan(atr) else high_low
+    
+    def _atr_at(self, data: pd.DataFrame, atr: np.ndarray, i: int, period: int = 14) -> float:
+        """_calculate_atr(data.iloc[:i+1]) read from a precomputed ATR array"""
+        high_low = data['high'].iloc[i] - data['low'].iloc[i]
         
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean().iloc[-1]
+        if i + 1 < period + 1:
+            return high_low
         
-        return atr if not np.isnan(atr) else high_low.iloc[-1]
+        return atr[i] if not np.isnan(atr[i]) else high_low
     
     def _apply_slippage_and_commission(self, price: float, is_buy: bool, size: float) -> float:
         """Apply realistic slippage and commission to trade"""
@@ -169,18 +201,94 @@ class PulseWaveBacktester:
         
         return execution_price, commission_cost
     
+    def _find_exit(self, close: np.ndarray, low: np.ndarray, high: np.ndarray,
+                   position: OpenPosition) -> Optional[Tuple[int, float, str]]:
+        """
+        First bar after entry where the position exits
+        
+        Stop loss and take profit are searched over the whole holding window
+        at once; on the first bar that hits either, the per-bar order applies
+        (close vs stop, close vs target, then the bar's extremes vs stop and
+        target). The time limit exits at the close and overrides a price exit
+        on the same bar.
+        
+        Args:
+            close, low, high: OHLC arrays of the backtest data
+            position: The open position
+            
+        Returns:
+            (exit index, exit price before slippage, exit reason), or None if
+            the position is still open on the last bar
+        """
+        start = position.entry_index + 1
+        time_index = position.entry_index + max(1, int(np.ceil(self.max_bars_held)))
+        end = min(time_index, len(close))
+        stop_loss = position.stop_loss
+        take_profit = position.take_profit
+        is_long = position.signal_type == Signal.LONG
+        
+        window_close = close[start:end]
+        if is_long:
+            stop_hit = (window_close <= stop_loss) | (low[start:end] <= stop_loss)
+            target_hit = (window_close >= take_profit) | (high[start:end] >= take_profit)
+        else:
+            stop_hit = (window_close >= stop_loss) | (high[start:end] >= stop_loss)
+            target_hit = (window_close <= take_profit) | (low[start:end] <= take_profit)
+        
+        hits = np.flatnonzero(stop_hit | target_hit)
+        if len(hits) > 0:
+            i = start + int(hits[0])
+            if is_long:
+                close_stop = close[i] <= stop_loss
+                close_target = close[i] >= take_profit
+            else:
+                close_stop = close[i] >= stop_loss
+                close_target = close[i] <= take_profit
+            
+            if close_stop or (not close_target and stop_hit[i - start]):
+                return i, stop_loss, "Stop Loss"
+            return i, take_profit, "Take Profit"
+        
+        if time_index < len(close):
+            return time_index, close[time_index], "Time Limit"
+        
+        return None
+    
+    def _mark_to_market(self, equity_curve: np.ndarray, filled: int, close: np.ndarray,
+                        position: OpenPosition, capital: float) -> int:
+        """Write capital plus unrealized P&L at each close into equity_curve[filled:]; returns the new fill count"""
+        if position.signal_type == Signal.LONG:
+            unrealized_pnl = (close - position.entry_price) * position.position_size
+        else:
+            unrealized_pnl = (position.entry_price - close) * position.position_size
+        
+        equity_curve[filled:filled + len(close)] = capital + unrealized_pnl
+        return filled + len(close)
+    
     def run_backtest(self, data: pd.DataFrame, 
                     start_date: Optional[str] = None,
                     end_date: Optional[str] = None,
-                    min_bars_for_signal: int = 100) -> BacktestResult:
+                    min_bars_for_signal: int = 100,
+                    precompute: bool = False,
+                    signal_series: Optional[SignalSeries] = None) -> BacktestResult:
         """
         Run complete backtest on historical data
         
+        With precompute, S/R levels, regime, confluence scores and ATR are
+        computed for every bar up front (SignalGenerator.precompute) and the
+        loop only reads them, instead of re-running generate_signal on each
+        growing prefix. Trades and the equity curve are identical.
+        
         Args:
             data: OHLCV DataFrame with datetime index
             start_date: Start date for backtest (optional)
             end_date: End date for backtest (optional)
             min_bars_for_signal: Minimum bars needed before generating signals
+            precompute: Use the linear-time precomputed signal path
+            signal_series: Precomputed SignalSeries of data after date
+                filtering, or of a longer frame that data is a prefix of
+                (implies precompute); lets runs that differ only in signal
+                thresholds, backtest settings or end bar share one precompute
             
         Returns:
             BacktestResult with all performance metrics
@@ -196,166 +304,162 @@ class PulseWaveBacktester:
         
         # Initialize tracking variables
         trades = []
-        current_position = None
         current_capital = self.initial_capital
-        equity_curve = [self.initial_capital]
+        
+        # Contiguous OHLC arrays for the simulation kernel; the equity curve
+        # holds the starting capital plus at most one value per simulated bar
+        close = np.ascontiguousarray(data['close'].to_numpy(dtype=float))
+        low = np.ascontiguousarray(data['low'].to_numpy(dtype=float))
+        high = np.ascontiguousarray(data['high'].to_numpy(dtype=float))
+        equity_curve = np.empty(len(data) - min_bars_for_signal + 1)
+        equity_bars = np.empty(len(equity_curve), dtype=np.intp)
+        equity_curve[0] = self.initial_capital
+        equity_bars[0] = max(min_bars_for_signal - 1, 0)
+        filled = 1
         
         logger.info(f"Starting backtest with {len(data)} bars from {data.index[0]} to {data.index[-1]}")
         
-        # Iterate through data
-        for i in range(min_bars_for_signal, len(data)):
+        if signal_series is None and precompute:
+            signal_series = self.signal_generator.precompute(data)
+        elif signal_series is not None and len(signal_series.close) < len(data):
+            raise ValueError("signal_series does not match the backtest data")
+        
+        # Flat bars are visited one at a time looking for signals; once a
+        # position opens, its exit bar is found in one search and the bars in
+        # between are marked to market together
+        i = min_bars_for_signal
+        while i < len(data):
             current_date = data.index[i]
-            current_data = data.iloc[:i+1]  # All data up to current point
+            position = None
             
-            # Check if we have an open position
-            if current_position is not None:
-                current_price = data['close'].iloc[i]
-                entry_price = current_position['entry_price']
-                stop_loss = current_position['stop_loss']
-                take_profit = current_position['take_profit']
-                position_size = current_position['position_size']
-                signal_type = current_position['signal_type']
-                entry_time = current_position['entry_time']
-                bars_held = i - current_position['entry_index']
-                
-                # Check exit conditions
-                exit_triggered = False
-                exit_price = current_price
-                exit_reason = ""
-                
-                if signal_type == Signal.LONG:
-                    if current_price <= stop_loss:
-                        exit_price = stop_loss
-                        exit_reason = "Stop Loss"
-                        exit_triggered = True
-                    elif current_price >= take_profit:
-                        exit_price = take_profit
-                        exit_reason = "Take Profit"
-                        exit_triggered = True
-                    elif data['low'].iloc[i] <= stop_loss:
-                        exit_price = stop_loss
-                        exit_reason = "Stop Loss"
-                        exit_triggered = True
-                    elif data['high'].iloc[i] >= take_profit:
-                        exit_price = take_profit
-                        exit_reason = "Take Profit"
-                        exit_triggered = True
-                
-                elif signal_type == Signal.SHORT:
-                    if current_price >= stop_loss:
-                        exit_price = stop_loss
-                        exit_reason = "Stop Loss"
-                        exit_triggered = True
-                    elif current_price <= take_profit:
-                        exit_price = take_profit
-                        exit_reason = "Take Profit"
-                        exit_triggered = True
-                    elif data['high'].iloc[i] >= stop_loss:
-                        exit_price = stop_loss
-                        exit_reason = "Stop Loss"
-                        exit_triggered = True
-                    elif data['low'].iloc[i] <= take_profit:
-                        exit_price = take_profit
-                        exit_reason = "Take Profit"
-                        exit_triggered = True
-                
-                # Time-based exit
-                if bars_held >= self.max_bars_held:
-                    exit_price = current_price
-                    exit_reason = "Time Limit"
-                    exit_triggered = True
+            try:
+                if signal_series is not None:
+                    signal = self.signal_generator.signal_at(signal_series, i)
+                else:
+                    current_data = data.iloc[:i+1]  # All data up to current point
+                    indicators = IndicatorFrame(current_data)
+                    signal = self.signal_generator.generate_signal(current_data, indicators=indicators)
                 
-                if exit_triggered:
-                    # Close position
-                    exit_price, commission_cost = self._apply_slippage_and_commission(
-                        exit_price, signal_type == Signal.SHORT, position_size
-                    )
-                    
-                    # Calculate P&L
-                    if signal_type == Signal.LONG:
-                        pnl = (exit_price - entry_price) * position_size - commission_cost
-                    else:  # SHORT
-                        pnl = (entry_price - exit_price) * position_size - commission_cost
-                    
-                    pnl_pct = pnl / (entry_price * position_size) * 100
-                    current_capital += pnl
-                    
-                    # Record trade
-                    trade = Trade(
-                        entry_time=entry_time,
-                        exit_time=current_date,
-                        signal_type=signal_type,
-                        entry_price=entry_price,
-                        exit_price=exit_price,
-                        stop_loss=stop_loss,
-                        take_profit=take_profit,
-                        position_size=position_size,
-                        pnl=pnl,
-                        pnl_pct=pnl_pct,
-                        exit_reason=exit_reason,
-                        bars_held=bars_held,
-                        confidence=current_position['confidence']
-                    )
-                    trades.append(trade)
-                    
-                    logger.info(f"Closed {signal_type.value} position: {pnl:.2f} ({pnl_pct:.2f}%) - {exit_reason}")
-                    
-                    current_position = None
-            
-            else:
-                # No position - look for new signals
-                try:
-                    signal = self.signal_generator.generate_signal(current_data)
-                    
-                    if signal.signal != Signal.NEUTRAL:
-                        # Calculate position size
+                if signal.signal != Signal.NEUTRAL:
+                    # Calculate position size
+                    if signal_series is not None:
                         position_size = self._calculate_position_size(
-                            current_data, signal, current_capital, i
+                            data, signal, current_capital, i,
+                            atr=self._atr_at(data, signal_series.atr, i)
+                        )
+                    else:
+                        position_size = self._calculate_position_size(
+                            current_data, signal, current_capital, i, indicators
+                        )
+                    
+                    if position_size > 0:
+                        # Enter position
+                        entry_price, commission_cost = self._apply_slippage_and_commission(
+                            signal.entry_price, True, position_size
                         )
                         
-                        if position_size > 0:
-                            # Enter position
-                            entry_price, commission_cost = self._apply_slippage_and_commission(
-                                signal.entry_price, True, position_size
-                            )
-                            
-                            current_capital -= commission_cost
-                            
-                            current_position = {
-                                'signal_type': signal.signal,
-                                'entry_price': entry_price,
-                                'stop_loss': signal.stop_loss,
-                                'take_profit': signal.take_profit,
-                                'position_size': position_size,
-                                'entry_time': current_date,
-                                'entry_index': i,
-                                'confidence': signal.confidence
-                            }
-                            
-                            logger.info(f"Opened {signal.signal.value} position at {entry_price:.4f}, size: {position_size:.2f}")
-                
-                except Exception as e:
-                    logger.error(f"Error generating signal at {current_date}: {e}")
-                    continue
+                        current_capital -= commission_cost
+                        
+                        position = OpenPosition(
+                            signal_type=signal.signal,
+                            entry_index=i,
+                            entry_price=entry_price,
+                            stop_loss=signal.stop_loss,
+                            take_profit=signal.take_profit,
+                            position_size=position_size,
+                            confidence=signal.confidence
+                        )
+                        
+                        logger.info(f"Opened {signal.signal.value} position at {entry_price:.4f}, size: {position_size:.2f}")
             
-            # Update equity curve
-            if current_position:
-                # Mark-to-market current position
-                current_price = data['close'].iloc[i]
-                if current_position['signal_type'] == Signal.LONG:
-                    unrealized_pnl = (current_price - current_position['entry_price']) * current_position['position_size']
-                else:
-                    unrealized_pnl = (current_position['entry_price'] - current_price) * current_position['position_size']
-                equity = current_capital + unrealized_pnl
-            else:
-                equity = current_capital
+            except Exception as e:
+                logger.error(f"Error generating signal at {current_date}: {e}")
+                i += 1
+                continue
             
-            equity_curve.append(equity)
+            if position is None:
+                equity_curve[filled] = current_capital
+                equity_bars[filled] = i
+                filled += 1
+                i += 1
+                continue
+            
+            # Mark-to-market from the entry bar up to (not including) the exit bar
+            exit_hit = self._find_exit(close, low, high, position)
+            exit_index = exit_hit[0] if exit_hit is not None else len(data)
+            marked = filled
+            filled = self._mark_to_market(equity_curve, filled, close[i:exit_index],
+                                          position, current_capital)
+            equity_bars[marked:filled] = np.arange(i, exit_index)
+            
+            if exit_hit is None:
+                break  # Still open on the last bar
+            
+            exit_index, exit_price, exit_reason = exit_hit
+            signal_type = position.signal_type
+            entry_price = position.entry_price
+            position_size = position.position_size
+            bars_held = exit_index - position.entry_index
+            
+            # Close position
+            exit_price, commission_cost = self._apply_slippage_and_commission(
+                exit_price, signal_type == Signal.SHORT, position_size
+            )
+            
+            # Calculate P&L
+            if signal_type == Signal.LONG:
+                pnl = (exit_price - entry_price) * position_size - commission_cost
+            else:  # SHORT
+                pnl = (entry_price - exit_price) * position_size - commission_cost
+            
+            pnl_pct = pnl / (entry_price * position_size) * 100
+            current_capital += pnl
+            
+            # Record trade
+            trade = Trade(
+                entry_time=data.index[position.entry_index],
+                exit_time=data.index[exit_index],
+                signal_type=signal_type,
+                entry_price=entry_price,
+                exit_price=exit_price,
+                stop_loss=position.stop_loss,
+                take_profit=position.take_profit,
+                position_size=position_size,
+                pnl=pnl,
+                pnl_pct=pnl_pct,
+                exit_reason=exit_reason,
+                bars_held=bars_held,
+                confidence=position.confidence
+            )
+            trades.append(trade)
+            
+            logger.info(f"Closed {signal_type.value} position: {pnl:.2f} ({pnl_pct:.2f}%) - {exit_reason}")
+            
+            equity_curve[filled] = current_capital
+            equity_bars[filled] = exit_index
+            filled += 1
+            i = exit_index + 1
         
         # Calculate performance metrics
+        equity_curve = pd.Series(equity_curve[:filled], index=data.index[equity_bars[:filled]])
+        return self._calculate_metrics(trades, equity_curve, data)
+    
+    def calculate_metrics(self, trades: List[Trade], equity_curve: pd.Series, data: pd.DataFrame) -> BacktestResult:
+        """
+        Performance metrics for trades and an equity curve assembled outside
+        run_backtest (e.g. stitched walk-forward windows)
+        
+        Args:
+            trades: Closed trades
+            equity_curve: Equity by bar, starting with initial capital
+            data: OHLCV DataFrame the trades were taken on
+            
+        Returns:
+            BacktestResult
+        """
         return self._calculate_metrics(trades, equity_curve, data)
     
-    def _calculate_metrics(self, trades: List[Trade], equity_curve: List[float], data: pd.DataFrame) -> BacktestResult:
+    def _calculate_metrics(self, trades: List[Trade], equity_curve: pd.Series, data: pd.DataFrame) -> BacktestResult:
         """Calculate all backtest performance metrics"""
         if not trades:
             return BacktestResult(
@@ -373,7 +477,8 @@ class PulseWaveBacktester:
                 avg_loss=0.0,
                 largest_win=0.0,
                 largest_loss=0.0,
-                avg_bars_held=0.0
+                avg_bars_held=0.0,
+                equity_curve=equity_curve
             )
         
         # Basic metrics
@@ -385,7 +490,7 @@ class PulseWaveBacktester:
         
         # P&L metrics
         total_pnl = sum(t.pnl for t in trades)
-        total_return = (equity_curve[-1] - self.initial_capital) / self.initial_capital * 100
+        total_return = (equity_curve.iloc[-1] - self.initial_capital) / self.initial_capital * 100
         
         winning_pnl = sum(t.pnl for t in trades if t.pnl > 0)
         losing_pnl = abs(sum(t.pnl for t in trades if t.pnl < 0))
@@ -403,14 +508,14 @@ class PulseWaveBacktester:
         avg_bars_held = sum(t.bars_held for t in trades) / total_trades if total_trades > 0 else 0
         
         # Drawdown calculation
-        equity_series = pd.Series(equity_curve)
+        equity_series = pd.Series(equity_curve.to_numpy())
         rolling_max = equity_series.expanding().max()
         drawdown = (equity_series - rolling_max) / rolling_max
         max_drawdown = drawdown.min() * 100  # Convert to percentage
         
         # Sharpe ratio calculation
         if len(equity_curve) > 1:
-            returns = pd.Series(equity_curve).pct_change().dropna()
+            returns = equity_series.pct_change().dropna()
             if len(returns) > 0 and returns.std() > 0:
                 sharpe_ratio = returns.mean() / returns.std() * np.sqrt(252)  # Annualized
             else:
@@ -433,7 +538,8 @@ class PulseWaveBacktester:
             avg_loss=avg_loss,
             largest_win=largest_win,
             largest_loss=largest_loss,
-            avg_bars_held=avg_bars_held
+            avg_bars_held=avg_bars_held,
+            equity_curve=equity_curve
         )
     
     def print_backtest_results(self, result: BacktestResult) -> None:
@@ -11,12 +11,16 @@ Scores signals 0-100 based on multiple factors:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, NamedTuple, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+import time
 import logging
 from enum import Enum
 
-from sr_engine import SRResult, SRLevel
+from sr_engine import SRResult, SRLevel, SRHistory
 from regime_detector import RegimeResult, MarketRegime
+from indicators import IndicatorFrame, indicator_frame
+from reasoning import Reason, ReasonText, Reasoning
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +31,75 @@ class SignalDirection(Enum):
     SHORT = "SHORT"
 
 
+# Built-in factor_breakdown keys, in scoring order
+CONFLUENCE_FACTORS = ('sr_proximity', 'sr_strength', 'regime_alignment', 'rsi_condition',
+                      'volume_confirmation', 'mtf_agreement', 'trend_alignment')
+
+
 class ConfluenceResult(NamedTuple):
     """Confluence scoring result"""
     total_score: float  # 0-100
     signal_direction: SignalDirection
     factor_breakdown: Dict[str, float]
-    reasoning: List[str]
+    reasoning: Reasoning    # Rendered to text on access
+
+
+class FactorContext(NamedTuple):
+    """Inputs shared by every factor for one confluence evaluation"""
+    data: pd.DataFrame
+    current_price: float
+    sr_results: Dict[str, SRResult]
+    primary_sr: SRResult
+    regime_result: RegimeResult
+    indicators: IndicatorFrame
+
+
+class SeriesFactorContext(NamedTuple):
+    """Inputs shared by every factor for score_series"""
+    data: pd.DataFrame
+    price: np.ndarray           # Close at every bar
+    bars: np.ndarray            # len(data.iloc[:i+1]) at every bar
+    histories: List[SRHistory]  # Primary timeframe first
+    regime_series: pd.DataFrame
+    indicators: IndicatorFrame
+
+
+@dataclass
+class ConfluenceFactor:
+    """
+    One pluggable confluence factor
+    
+    score(context, direction) returns (points, reason) for the last bar;
+    series(context, direction), if given, returns points for every bar.
+    requires names the shared indicators the factor reads ('rsi',
+    'volume_ma', 'ema_trend'), which the shared IndicatorFrame computes on
+    first use. Points are multiplied by weight; max_points is the unweighted
+    cap and must bound score(), since early-exit scoring relies on it. cost
+    ranks factors for early-exit scoring (cheapest first).
+    """
+    name: str
+    label: str
+    max_points: float
+    score: Callable[[FactorContext, SignalDirection], Tuple[float, ReasonText]]
+    series: Optional[Callable[[SeriesFactorContext, SignalDirection], np.ndarray]] = None
+    requires: Tuple[str, ...] = ()
+    weight: float = 1.0
+    enabled: bool = True
+    cost: int = 1
+    
+    @property
+    def weighted_max(self) -> float:
+        return self.max_points * self.weight
+
+
+class FactorTiming(NamedTuple):
+    """Accumulated wall time of one factor"""
+    calls: int
+    total_seconds: float
+    
+    @property
+    def mean_us(self) -> float:
+        return self.total_seconds / self.calls * 1e6 if self.calls else 0.0
 
 
 class ConfluenceScorer:
@@ -49,6 +116,9 @@ class ConfluenceScorer:
     7. Trend Alignment (0-10 points) - Signal aligns with EMA trend
     
     Total: 100 points maximum
+    
+    Factors are ConfluenceFactor objects in self.factors and can be
+    disabled, reweighted (configure_factors) or extended (register_factor).
     """
     
     def __init__(
@@ -56,28 +126,127 @@ class ConfluenceScorer:
         rsi_period: int = 14,
         volume_ma_period: int = 20,
         ema_trend_period: int = 50,
-        proximity_threshold_pct: float = 2.0  # Within 2% of S/R level
+        proximity_threshold_pct: float = 2.0,  # Within 2% of S/R level
+        factors: Optional[Dict[str, Union[bool, float, dict]]] = None
     ):
         self.rsi_period = rsi_period
         self.volume_ma_period = volume_ma_period
         self.ema_trend_period = ema_trend_period
         self.proximity_threshold_pct = proximity_threshold_pct
         
-    def _calculate_rsi(self, data: pd.DataFrame) -> pd.Series:
-        """Calculate RSI indicator"""
-        close = data['close']
-        delta = close.diff()
-        
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
+        self.factors: Dict[str, ConfluenceFactor] = {
+            factor.name: factor for factor in self._default_factors()
+        }
+        if factors:
+            self.configure_factors(factors)
         
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        self.factor_timings: Dict[str, FactorTiming] = {}
+    
+    def _default_factors(self) -> List[ConfluenceFactor]:
+        """The seven built-in factors, in scoring order"""
+        # Costs rank measured time per call (print_factor_timings): the S/R,
+        # regime and MTF factors take microseconds, the indicator factors
+        # hundreds, mostly computing their series on first use. Equal costs
+        # keep this order, so RSI's 15 points can prune before volume and trend
+        return [
+            ConfluenceFactor('sr_proximity', 'S/R Proximity', 20, self._factor_sr_proximity, self._proximity_series,
+                             cost=3),
+            ConfluenceFactor('sr_strength', 'S/R Strength', 15, self._factor_sr_strength, self._strength_series,
+                             cost=2),
+            ConfluenceFactor('regime_alignment', 'Regime Alignment', 20,
+                             self._factor_regime_alignment, self._regime_alignment_series, cost=1),
+            ConfluenceFactor('rsi_condition', 'RSI Condition', 15, self._factor_rsi_condition,
+                             self._rsi_series, requires=('rsi',), cost=4),
+            ConfluenceFactor('volume_confirmation', 'Volume Confirmation', 10, self._factor_volume_confirmation,
+                             self._volume_series, requires=('volume_ma',), cost=4),
+            ConfluenceFactor('mtf_agreement', 'MTF Agreement', 10, self._factor_mtf_agreement, self._mtf_series,
+                             cost=3),
+            ConfluenceFactor('trend_alignment', 'Trend Alignment', 10, self._factor_trend_alignment,
+                             self._trend_series, requires=('ema_trend',), cost=4)
+        ]
+    
+    def register_factor(self, factor: ConfluenceFactor) -> None:
+        """Add a factor (scored after the existing ones) or replace one with the same name"""
+        self.factors[factor.name] = factor
+    
+    def configure_factors(self, config: Dict[str, Union[bool, float, dict]]) -> None:
+        """
+        Enable, disable or reweight factors
         
-        return rsi
+        Args:
+            config: {name: False | True | weight | {'enabled': bool, 'weight': float}}
+        """
+        for name, setting in config.items():
+            if name not in self.factors:
+                raise ValueError(f"Unknown confluence factor '{name}' (known: {', '.join(self.factors)})")
+            
+            factor = self.factors[name]
+            if isinstance(setting, bool):
+                factor.enabled = setting
+            elif isinstance(setting, (int, float)):
+                factor.weight = float(setting)
+            else:
+                factor.enabled = setting.get('enabled', factor.enabled)
+                factor.weight = setting.get('weight', factor.weight)
+            
+            if factor.weight < 0:
+                raise ValueError(f"Confluence factor '{name}' weight must be >= 0, got {factor.weight}")
+    
+    @property
+    def enabled_factors(self) -> List[ConfluenceFactor]:
+        return [factor for factor in self.factors.values() if factor.enabled]
+    
+    def required_indicators(self) -> Tuple[str, ...]:
+        """Shared indicators read by the enabled factors"""
+        required = []
+        for factor in self.enabled_factors:
+            required.extend(name for name in factor.requires if name not in required)
+        return tuple(required)
+    
+    def _record_timing(self, name: str, seconds: float) -> None:
+        calls, total = self.factor_timings.get(name, (0, 0.0))
+        self.factor_timings[name] = FactorTiming(calls + 1, total + seconds)
+    
+    def reset_factor_timings(self) -> None:
+        self.factor_timings = {}
+    
+    def print_factor_timings(self) -> None:
+        """Print accumulated wall time per factor, most expensive first"""
+        print(f"\n=== Confluence Factor Timings ===")
+        print(f"{'Factor':<22} | {'Calls':>8} | {'Total ms':>10} | {'Mean us':>9}")
+        print("-" * 58)
+        for name, timing in sorted(self.factor_timings.items(), key=lambda item: -item[1].total_seconds):
+            print(f"{name:<22} | {timing.calls:>8} | {timing.total_seconds * 1000:>10.2f} | {timing.mean_us:>9.1f}")
+    
+    # Adapters from FactorContext to the individual scoring methods
+    
+    def _factor_sr_proximity(self, context: FactorContext, direction: SignalDirection):
+        return self._score_sr_proximity(context.current_price, context.primary_sr, direction)
+    
+    def _factor_sr_strength(self, context: FactorContext, direction: SignalDirection):
+        return self._score_sr_strength(context.current_price, context.primary_sr, direction)
+    
+    def _factor_regime_alignment(self, context: FactorContext, direction: SignalDirection):
+        return self._score_regime_alignment(context.regime_result, direction)
+    
+    def _factor_rsi_condition(self, context: FactorContext, direction: SignalDirection):
+        return self._score_rsi_condition(context.data, direction, context.indicators)
+    
+    def _factor_volume_confirmation(self, context: FactorContext, direction: SignalDirection):
+        return self._score_volume_confirmation(context.data, direction, context.indicators)
+    
+    def _factor_mtf_agreement(self, context: FactorContext, direction: SignalDirection):
+        return self._score_multitimeframe_agreement(context.sr_results, direction)
+    
+    def _factor_trend_alignment(self, context: FactorContext, direction: SignalDirection):
+        return self._score_trend_alignment(context.data, direction, context.indicators)
+    
+    def _calculate_rsi(self, data: pd.DataFrame, indicators: Optional[IndicatorFrame] = None) -> pd.Series:
+        """Calculate RSI indicator"""
+        return indicator_frame(data, indicators).rsi(self.rsi_period)
     
     def _score_sr_proximity(self, current_price: float, sr_result: SRResult, 
-                          signal_direction: SignalDirection) -> tuple[float, str]:
+                          signal_direction: SignalDirection) -> tuple[float, ReasonText]:
         """
         Score S/R proximity factor (0-20 points)
         Higher score for being close to relevant S/R level
@@ -85,40 +254,40 @@ class ConfluenceScorer:
         if not sr_result.levels:
             return 0.0, "No S/R levels available"
         
-        relevant_levels = []
+        index = sr_result.level_index
         
         if signal_direction == SignalDirection.LONG:
-            # For long signals, look for support levels below current price
-            relevant_levels = [lvl for lvl in sr_result.levels if lvl.mid < current_price and not lvl.is_resistance]
+            # For long signals, look for support levels below current price (nearest first)
+            relevant_levels = [lvl for lvl in index.below(current_price) if not lvl.is_resistance]
         else:
-            # For short signals, look for resistance levels above current price  
-            relevant_levels = [lvl for lvl in sr_result.levels if lvl.mid > current_price and lvl.is_resistance]
+            # For short signals, look for resistance levels above current price (nearest first)
+            relevant_levels = [lvl for lvl in index.above(current_price) if lvl.is_resistance]
         
         if not relevant_levels:
-            return 5.0, f"No relevant S/R levels for {signal_direction.value}"
+            return 5.0, Reason("No relevant S/R levels for {}", (signal_direction.value,))
         
-        # Find closest relevant level
-        closest_level = min(relevant_levels, key=lambda x: abs(x.mid - current_price))
+        # Closest relevant level
+        closest_level = relevant_levels[0]
         
         distance_pct = abs(closest_level.mid - current_price) / current_price * 100
         
         if distance_pct <= self.proximity_threshold_pct:
             # Very close to S/R level
             score = 20 - (distance_pct / self.proximity_threshold_pct * 10)  # 10-20 points
-            reason = f"Very close to {closest_level.mid:.4f} ({distance_pct:.2f}%)"
+            reason = Reason("Very close to {:.4f} ({:.2f}%)", (closest_level.mid, distance_pct))
         elif distance_pct <= self.proximity_threshold_pct * 2:
             # Moderately close
             score = 10 - ((distance_pct - self.proximity_threshold_pct) / self.proximity_threshold_pct * 5)  # 5-10 points
-            reason = f"Near {closest_level.mid:.4f} ({distance_pct:.2f}%)"
+            reason = Reason("Near {:.4f} ({:.2f}%)", (closest_level.mid, distance_pct))
         else:
             # Far from S/R level
             score = 2.0
-            reason = f"Far from S/R levels (closest: {distance_pct:.2f}%)"
+            reason = Reason("Far from S/R levels (closest: {:.2f}%)", (distance_pct,))
         
         return max(score, 0.0), reason
     
     def _score_sr_strength(self, current_price: float, sr_result: SRResult,
-                         signal_direction: SignalDirection) -> tuple[float, str]:
+                         signal_direction: SignalDirection) -> tuple[float, ReasonText]:
         """
         Score S/R strength factor (0-15 points)
         Higher score for stronger nearby S/R levels
@@ -127,16 +296,9 @@ class ConfluenceScorer:
             return 0.0, "No S/R levels available"
         
         # Find relevant levels within reasonable distance
-        relevant_levels = []
         max_distance_pct = 5.0  # Consider levels within 5%
-        
-        for level in sr_result.levels:
-            distance_pct = abs(level.mid - current_price) / current_price * 100
-            if distance_pct <= max_distance_pct:
-                if signal_direction == SignalDirection.LONG and level.mid <= current_price:
-                    relevant_levels.append(level)
-                elif signal_direction == SignalDirection.SHORT and level.mid >= current_price:
-                    relevant_levels.append(level)
+        side = 'below' if signal_direction == SignalDirection.LONG else 'above'
+        relevant_levels = sr_result.level_index.within_pct(current_price, max_distance_pct, side)
         
         if not relevant_levels:
             return 3.0, "No relevant strong levels nearby"
@@ -147,21 +309,21 @@ class ConfluenceScorer:
         # Score based on strength (typically 3-20+ touches)
         if strongest_level.strength >= 10:
             score = 15.0
-            reason = f"Very strong level ({strongest_level.strength} touches)"
+            reason = Reason("Very strong level ({} touches)", (strongest_level.strength,))
         elif strongest_level.strength >= 7:
             score = 12.0
-            reason = f"Strong level ({strongest_level.strength} touches)"
+            reason = Reason("Strong level ({} touches)", (strongest_level.strength,))
         elif strongest_level.strength >= 5:
             score = 8.0
-            reason = f"Moderate level ({strongest_level.strength} touches)"
+            reason = Reason("Moderate level ({} touches)", (strongest_level.strength,))
         else:
             score = 4.0
-            reason = f"Weak level ({strongest_level.strength} touches)"
+            reason = Reason("Weak level ({} touches)", (strongest_level.strength,))
         
         return score, reason
     
     def _score_regime_alignment(self, regime_result: RegimeResult, 
-                              signal_direction: SignalDirection) -> tuple[float, str]:
+                              signal_direction: SignalDirection) -> tuple[float, ReasonText]:
         """
         Score regime alignment factor (0-20 points)
         Higher score when signal direction matches market regime
@@ -172,7 +334,7 @@ class ConfluenceScorer:
         if signal_direction == SignalDirection.LONG:
             if regime == MarketRegime.TRENDING_UP:
                 score = confidence / 100 * 20  # Full points if high confidence uptrend
-                reason = f"Strong uptrend alignment ({confidence:.1f}%)"
+                reason = Reason("Strong uptrend alignment ({:.1f}%)", (confidence,))
             elif regime == MarketRegime.RANGING:
                 score = 8.0  # Neutral in ranging market
                 reason = f"Ranging market - moderate long opportunity"
@@ -186,7 +348,7 @@ class ConfluenceScorer:
         else:  # SHORT
             if regime == MarketRegime.TRENDING_DOWN:
                 score = confidence / 100 * 20  # Full points if high confidence downtrend
-                reason = f"Strong downtrend alignment ({confidence:.1f}%)"
+                reason = Reason("Strong downtrend alignment ({:.1f}%)", (confidence,))
             elif regime == MarketRegime.RANGING:
                 score = 8.0  # Neutral in ranging market
                 reason = f"Ranging market - moderate short opportunity"
@@ -199,7 +361,8 @@ class ConfluenceScorer:
         
         return score, reason
     
-    def _score_rsi_condition(self, data: pd.DataFrame, signal_direction: SignalDirection) -> tuple[float, str]:
+    def _score_rsi_condition(self, data: pd.DataFrame, signal_direction: SignalDirection,
+                             indicators: Optional[IndicatorFrame] = None) -> tuple[float, ReasonText]:
         """
         Score RSI condition factor (0-15 points)
         Higher score when RSI supports signal direction
@@ -207,46 +370,47 @@ class ConfluenceScorer:
         if len(data) < self.rsi_period + 5:
             return 5.0, "Insufficient data for RSI"
         
-        rsi = self._calculate_rsi(data)
+        rsi = self._calculate_rsi(data, indicators)
         current_rsi = rsi.iloc[-1]
         
         if signal_direction == SignalDirection.LONG:
             if current_rsi <= 30:
                 score = 15.0
-                reason = f"RSI oversold ({current_rsi:.1f}) - strong long signal"
+                reason = Reason("RSI oversold ({:.1f}) - strong long signal", (current_rsi,))
             elif current_rsi <= 40:
                 score = 10.0
-                reason = f"RSI below 40 ({current_rsi:.1f}) - good long setup"
+                reason = Reason("RSI below 40 ({:.1f}) - good long setup", (current_rsi,))
             elif current_rsi <= 50:
                 score = 6.0
-                reason = f"RSI neutral-bearish ({current_rsi:.1f})"
+                reason = Reason("RSI neutral-bearish ({:.1f})", (current_rsi,))
             elif current_rsi <= 70:
                 score = 3.0
-                reason = f"RSI rising ({current_rsi:.1f}) - late to long"
+                reason = Reason("RSI rising ({:.1f}) - late to long", (current_rsi,))
             else:
                 score = 1.0
-                reason = f"RSI overbought ({current_rsi:.1f}) - poor long entry"
+                reason = Reason("RSI overbought ({:.1f}) - poor long entry", (current_rsi,))
         
         else:  # SHORT
             if current_rsi >= 70:
                 score = 15.0
-                reason = f"RSI overbought ({current_rsi:.1f}) - strong short signal"
+                reason = Reason("RSI overbought ({:.1f}) - strong short signal", (current_rsi,))
             elif current_rsi >= 60:
                 score = 10.0
-                reason = f"RSI above 60 ({current_rsi:.1f}) - good short setup"
+                reason = Reason("RSI above 60 ({:.1f}) - good short setup", (current_rsi,))
             elif current_rsi >= 50:
                 score = 6.0
-                reason = f"RSI neutral-bullish ({current_rsi:.1f})"
+                reason = Reason("RSI neutral-bullish ({:.1f})", (current_rsi,))
             elif current_rsi >= 30:
                 score = 3.0
-                reason = f"RSI falling ({current_rsi:.1f}) - late to short"
+                reason = Reason("RSI falling ({:.1f}) - late to short", (current_rsi,))
             else:
                 score = 1.0
-                reason = f"RSI oversold ({current_rsi:.1f}) - poor short entry"
+                reason = Reason("RSI oversold ({:.1f}) - poor short entry", (current_rsi,))
         
         return score, reason
     
-    def _score_volume_confirmation(self, data: pd.DataFrame, signal_direction: SignalDirection) -> tuple[float, str]:
+    def _score_volume_confirmation(self, data: pd.DataFrame, signal_direction: SignalDirection,
+                                   indicators: Optional[IndicatorFrame] = None) -> tuple[float, ReasonText]:
         """
         Score volume confirmation factor (0-10 points)
         Higher score when volume supports the move
@@ -255,7 +419,7 @@ class ConfluenceScorer:
             return 5.0, "No volume data or insufficient history"
         
         volume = data['volume']
-        volume_ma = volume.rolling(window=self.volume_ma_period).mean()
+        volume_ma = indicator_frame(data, indicators).sma('volume', self.volume_ma_period)
         
         current_volume = volume.iloc[-1]
         avg_volume = volume_ma.iloc[-1]
@@ -273,35 +437,35 @@ class ConfluenceScorer:
         if signal_direction == SignalDirection.LONG:
             if volume_ratio > 1.5 and price_change > 0:
                 score = 10.0
-                reason = f"Strong volume confirmation ({volume_ratio:.1f}x avg)"
+                reason = Reason("Strong volume confirmation ({:.1f}x avg)", (volume_ratio,))
             elif volume_ratio > 1.2 and volume_trend > 1.1:
                 score = 7.0
-                reason = f"Good volume support ({volume_ratio:.1f}x avg)"
+                reason = Reason("Good volume support ({:.1f}x avg)", (volume_ratio,))
             elif volume_ratio > 0.8:
                 score = 5.0
-                reason = f"Average volume ({volume_ratio:.1f}x avg)"
+                reason = Reason("Average volume ({:.1f}x avg)", (volume_ratio,))
             else:
                 score = 2.0
-                reason = f"Low volume concern ({volume_ratio:.1f}x avg)"
+                reason = Reason("Low volume concern ({:.1f}x avg)", (volume_ratio,))
         
         else:  # SHORT
             if volume_ratio > 1.5 and price_change < 0:
                 score = 10.0
-                reason = f"Strong volume confirmation ({volume_ratio:.1f}x avg)"
+                reason = Reason("Strong volume confirmation ({:.1f}x avg)", (volume_ratio,))
             elif volume_ratio > 1.2 and volume_trend > 1.1:
                 score = 7.0
-                reason = f"Good volume support ({volume_ratio:.1f}x avg)"
+                reason = Reason("Good volume support ({:.1f}x avg)", (volume_ratio,))
             elif volume_ratio > 0.8:
                 score = 5.0
-                reason = f"Average volume ({volume_ratio:.1f}x avg)"
+                reason = Reason("Average volume ({:.1f}x avg)", (volume_ratio,))
             else:
                 score = 2.0
-                reason = f"Low volume concern ({volume_ratio:.1f}x avg)"
+                reason = Reason("Low volume concern ({:.1f}x avg)", (volume_ratio,))
         
         return score, reason
     
     def _score_multitimeframe_agreement(self, sr_results: Dict[str, SRResult],
-                                      signal_direction: SignalDirection) -> tuple[float, str]:
+                                      signal_direction: SignalDirection) -> tuple[float, ReasonText]:
         """
         Score multi-timeframe agreement factor (0-10 points)
         Higher score when multiple timeframes show relevant S/R levels
@@ -313,16 +477,10 @@ class ConfluenceScorer:
         supporting_timeframes = 0
         total_timeframes = len(sr_results)
         
+        side = 'below' if signal_direction == SignalDirection.LONG else 'above'
+        
         for tf, sr_result in sr_results.items():
-            relevant_levels = []
-            
-            for level in sr_result.levels:
-                distance_pct = abs(level.mid - current_price) / current_price * 100
-                if distance_pct <= 3.0:  # Within 3% 
-                    if signal_direction == SignalDirection.LONG and level.mid <= current_price:
-                        relevant_levels.append(level)
-                    elif signal_direction == SignalDirection.SHORT and level.mid >= current_price:
-                        relevant_levels.append(level)
+            relevant_levels = sr_result.level_index.within_pct(current_price, 3.0, side)  # Within 3%
             
             if relevant_levels:
                 supporting_timeframes += 1
@@ -331,20 +489,21 @@ class ConfluenceScorer:
         
         if agreement_ratio >= 0.8:
             score = 10.0
-            reason = f"Strong MTF agreement ({supporting_timeframes}/{total_timeframes})"
+            reason = Reason("Strong MTF agreement ({}/{})", (supporting_timeframes, total_timeframes))
         elif agreement_ratio >= 0.6:
             score = 7.0
-            reason = f"Good MTF agreement ({supporting_timeframes}/{total_timeframes})"
+            reason = Reason("Good MTF agreement ({}/{})", (supporting_timeframes, total_timeframes))
         elif agreement_ratio >= 0.4:
             score = 5.0
-            reason = f"Moderate MTF agreement ({supporting_timeframes}/{total_timeframes})"
+            reason = Reason("Moderate MTF agreement ({}/{})", (supporting_timeframes, total_timeframes))
         else:
             score = 2.0
-            reason = f"Poor MTF agreement ({supporting_timeframes}/{total_timeframes})"
+            reason = Reason("Poor MTF agreement ({}/{})", (supporting_timeframes, total_timeframes))
         
         return score, reason
     
-    def _score_trend_alignment(self, data: pd.DataFrame, signal_direction: SignalDirection) -> tuple[float, str]:
+    def _score_trend_alignment(self, data: pd.DataFrame, signal_direction: SignalDirection,
+                               indicators: Optional[IndicatorFrame] = None) -> tuple[float, ReasonText]:
         """
         Score trend alignment factor (0-10 points)
         Higher score when signal aligns with EMA trend
@@ -353,7 +512,7 @@ class ConfluenceScorer:
             return 5.0, "Insufficient data for trend analysis"
         
         close = data['close']
-        ema = close.ewm(span=self.ema_trend_period).mean()
+        ema = indicator_frame(data, indicators).ema(self.ema_trend_period)
         
         current_price = close.iloc[-1]
         current_ema = ema.iloc[-1]
@@ -367,7 +526,7 @@ class ConfluenceScorer:
         if signal_direction == SignalDirection.LONG:
             if price_vs_ema > 1 and ema_slope > 0.1:
                 score = 10.0
-                reason = f"Strong uptrend alignment (Price {price_vs_ema:.1f}% above EMA)"
+                reason = Reason("Strong uptrend alignment (Price {:.1f}% above EMA)", (price_vs_ema,))
             elif price_vs_ema > 0 and ema_slope > 0:
                 score = 7.0
                 reason = f"Good uptrend alignment"
@@ -376,12 +535,12 @@ class ConfluenceScorer:
                 reason = f"Near EMA support"
             else:
                 score = 2.0
-                reason = f"Below EMA trend ({price_vs_ema:.1f}%)"
+                reason = Reason("Below EMA trend ({:.1f}%)", (price_vs_ema,))
         
         else:  # SHORT
             if price_vs_ema < -1 and ema_slope < -0.1:
                 score = 10.0
-                reason = f"Strong downtrend alignment (Price {abs(price_vs_ema):.1f}% below EMA)"
+                reason = Reason("Strong downtrend alignment (Price {:.1f}% below EMA)", (abs(price_vs_ema),))
             elif price_vs_ema < 0 and ema_slope < 0:
                 score = 7.0
                 reason = f"Good downtrend alignment"
@@ -390,7 +549,7 @@ class ConfluenceScorer:
                 reason = f"Near EMA resistance"
             else:
                 score = 2.0
-                reason = f"Above EMA trend ({price_vs_ema:.1f}%)"
+                reason = Reason("Above EMA trend ({:.1f}%)", (price_vs_ema,))
         
         return score, reason
     
@@ -399,61 +558,66 @@ class ConfluenceScorer:
         data: pd.DataFrame,
         sr_results: Dict[str, SRResult],
         regime_result: RegimeResult,
-        signal_direction: SignalDirection
-    ) -> ConfluenceResult:
+        signal_direction: SignalDirection,
+        indicators: Optional[IndicatorFrame] = None,
+        min_score: Optional[float] = None
+    ) -> Optional[ConfluenceResult]:
         """
         Calculate overall confluence score for a signal
         
+        With min_score, factors are evaluated cheapest first and scoring stops
+        as soon as the points still achievable (each remaining factor at its
+        weighted max) cannot reach min_score. Scores that finish are identical
+        to a full evaluation.
+        
         Args:
             data: OHLCV DataFrame
             sr_results: Dict of S/R results by timeframe
             regime_result: Market regime detection result
             signal_direction: LONG or SHORT signal
+            indicators: Optional shared IndicatorFrame for data
+            min_score: Optional score the result must be able to reach
             
         Returns:
-            ConfluenceResult with total score and breakdown
+            ConfluenceResult with total score and breakdown (also when it
+            falls short of min_score), or None when min_score is given and
+            provably out of reach before every factor was scored
         """
         current_price = data['close'].iloc[-1]
         primary_sr = list(sr_results.values())[0]  # Use primary timeframe for main S/R analysis
+        indicators = indicator_frame(data, indicators)
+        context = FactorContext(data, current_price, sr_results, primary_sr, regime_result, indicators)
+        
+        enabled = self.enabled_factors
+        if min_score is None:
+            order = enabled
+        else:
+            order = sorted(enabled, key=lambda factor: factor.cost)
+            achievable = sum(factor.weighted_max for factor in order)
         
         # Calculate individual factor scores
+        scored = {}
+        for position, factor in enumerate(order, 1):
+            started = time.perf_counter()
+            score, reason = factor.score(context, signal_direction)
+            score = score * factor.weight
+            self._record_timing(factor.name, time.perf_counter() - started)
+            scored[factor.name] = (score, reason)
+            
+            # Once every factor is scored the full result is returned, short or not
+            if min_score is not None and position < len(order):
+                # Swap this factor's cap for its actual points; the small slack
+                # keeps float rounding from pruning a score that could tie
+                achievable += score - factor.weighted_max
+                if achievable < min_score - 1e-9:
+                    return None
+        
         factors = {}
         reasoning = []
-        
-        # 1. S/R Proximity (0-20 points)
-        prox_score, prox_reason = self._score_sr_proximity(current_price, primary_sr, signal_direction)
-        factors['sr_proximity'] = prox_score
-        reasoning.append(f"S/R Proximity ({prox_score:.1f}/20): {prox_reason}")
-        
-        # 2. S/R Strength (0-15 points)
-        strength_score, strength_reason = self._score_sr_strength(current_price, primary_sr, signal_direction)
-        factors['sr_strength'] = strength_score
-        reasoning.append(f"S/R Strength ({strength_score:.1f}/15): {strength_reason}")
-        
-        # 3. Regime Alignment (0-20 points)
-        regime_score, regime_reason = self._score_regime_alignment(regime_result, signal_direction)
-        factors['regime_alignment'] = regime_score
-        reasoning.append(f"Regime Alignment ({regime_score:.1f}/20): {regime_reason}")
-        
-        # 4. RSI Condition (0-15 points)
-        rsi_score, rsi_reason = self._score_rsi_condition(data, signal_direction)
-        factors['rsi_condition'] = rsi_score
-        reasoning.append(f"RSI Condition ({rsi_score:.1f}/15): {rsi_reason}")
-        
-        # 5. Volume Confirmation (0-10 points)
-        volume_score, volume_reason = self._score_volume_confirmation(data, signal_direction)
-        factors['volume_confirmation'] = volume_score
-        reasoning.append(f"Volume Confirmation ({volume_score:.1f}/10): {volume_reason}")
-        
-        # 6. Multi-timeframe Agreement (0-10 points)
-        mtf_score, mtf_reason = self._score_multitimeframe_agreement(sr_results, signal_direction)
-        factors['mtf_agreement'] = mtf_score
-        reasoning.append(f"MTF Agreement ({mtf_score:.1f}/10): {mtf_reason}")
-        
-        # 7. Trend Alignment (0-10 points)
-        trend_score, trend_reason = self._score_trend_alignment(data, signal_direction)
-        factors['trend_alignment'] = trend_score
-        reasoning.append(f"Trend Alignment ({trend_score:.1f}/10): {trend_reason}")
+        for factor in enabled:
+            score, reason = scored[factor.name]
+            factors[factor.name] = score
+            reasoning.append(Reason("{} ({:.1f}/{:g}): {}", (factor.label, score, factor.weighted_max, reason)))
         
         # Calculate total score
         total_score = sum(factors.values())
@@ -462,8 +626,220 @@ class ConfluenceScorer:
             total_score=min(total_score, 100.0),  # Cap at 100
             signal_direction=signal_direction,
             factor_breakdown=factors,
-            reasoning=reasoning
+            reasoning=Reasoning(reasoning)
+        )
+    
+    def _proximity_series(self, context: SeriesFactorContext, direction: SignalDirection) -> np.ndarray:
+        """_score_sr_proximity for every bar"""
+        price, history = context.price, context.histories[0]
+        mids = history.mids
+        # Support strictly below price for longs, resistance strictly above for shorts
+        relevant = mids < price[:, None] if direction == SignalDirection.LONG else mids > price[:, None]
+        
+        with np.errstate(invalid='ignore'):
+            distance_pct = np.abs(mids - price[:, None]) / price[:, None] * 100
+            distance_pct = np.where(relevant, distance_pct, np.inf).min(axis=1)
+        
+        threshold = self.proximity_threshold_pct
+        score = np.select(
+            [distance_pct <= threshold, distance_pct <= threshold * 2],
+            [20 - (distance_pct / threshold * 10),
+             10 - ((distance_pct - threshold) / threshold * 5)],
+            2.0
+        )
+        score = np.where(0.0 > score, 0.0, score)
+        score = np.where(relevant.any(axis=1), score, 5.0)
+        return np.where(history.level_counts > 0, score, 0.0)
+    
+    def _within_pct_mask(self, price: np.ndarray, history: SRHistory, max_distance_pct: float,
+                         direction: SignalDirection) -> np.ndarray:
+        """SRLevelIndex.within_pct(price, max_distance_pct, side) membership for every bar"""
+        mids = history.mids
+        on_side = mids <= price[:, None] if direction == SignalDirection.LONG else mids >= price[:, None]
+        with np.errstate(invalid='ignore'):
+            return on_side & (np.abs(mids - price[:, None]) / price[:, None] * 100 <= max_distance_pct)
+    
+    def _strength_series(self, context: SeriesFactorContext, direction: SignalDirection) -> np.ndarray:
+        """_score_sr_strength for every bar"""
+        price, history = context.price, context.histories[0]
+        relevant = self._within_pct_mask(price, history, 5.0, direction)
+        strongest = np.where(relevant, history.strengths, -1).max(axis=1)
+        
+        score = np.select([strongest >= 10, strongest >= 7, strongest >= 5], [15.0, 12.0, 8.0], 4.0)
+        score = np.where(relevant.any(axis=1), score, 3.0)
+        return np.where(history.level_counts > 0, score, 0.0)
+    
+    def _regime_alignment_series(self, context: SeriesFactorContext, direction: SignalDirection) -> np.ndarray:
+        """_score_regime_alignment for every bar"""
+        regime_series = context.regime_series
+        regimes = regime_series['regime'].to_numpy()
+        confidence = regime_series['confidence'].to_numpy(dtype=float)
+        
+        if direction == SignalDirection.LONG:
+            aligned, against = MarketRegime.TRENDING_UP, MarketRegime.TRENDING_DOWN
+        else:
+            aligned, against = MarketRegime.TRENDING_DOWN, MarketRegime.TRENDING_UP
+        
+        return np.select(
+            [regimes == aligned, regimes == MarketRegime.RANGING, regimes == MarketRegime.VOLATILE,
+             regimes == against],
+            [confidence / 100 * 20, 8.0, 5.0, 2.0],
+            2.0
+        )
+    
+    def _rsi_series(self, context: SeriesFactorContext, direction: SignalDirection) -> np.ndarray:
+        """_score_rsi_condition for every bar"""
+        bars = context.bars
+        rsi = context.indicators.rsi(self.rsi_period).to_numpy(dtype=float)
+        
+        if direction == SignalDirection.LONG:
+            score = np.select([rsi <= 30, rsi <= 40, rsi <= 50, rsi <= 70], [15.0, 10.0, 6.0, 3.0], 1.0)
+        else:
+            score = np.select([rsi >= 70, rsi >= 60, rsi >= 50, rsi >= 30], [15.0, 10.0, 6.0, 3.0], 1.0)
+        
+        return np.where(bars < self.rsi_period + 5, 5.0, score)
+    
+    def _volume_series(self, context: SeriesFactorContext, direction: SignalDirection) -> np.ndarray:
+        """_score_volume_confirmation for every bar"""
+        data, bars, indicators = context.data, context.bars, context.indicators
+        if 'volume' not in data.columns:
+            return np.full(len(data), 5.0)
+        
+        volume = data['volume'].to_numpy(dtype=float)
+        volume_ma = indicators.sma('volume', self.volume_ma_period).to_numpy(dtype=float)
+        close = data['close'].to_numpy(dtype=float)
+        
+        def lagged(values, k):
+            # values[i - k] at bar i (NaN before the start)
+            out = np.full(len(values), np.nan)
+            out[k:] = values[:len(values) - k]
+            return out
+        
+        def mean3(a, b, c):
+            # Series.mean() over three bars: NaN skipped, summed in order
+            terms = (a, b, c)
+            total = sum(np.where(np.isnan(t), 0.0, t) for t in terms)
+            count = sum((~np.isnan(t)).astype(int) for t in terms)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(count > 0, total / count, np.nan)
+        
+        recent_vol_avg = mean3(lagged(volume, 2), lagged(volume, 1), volume)
+        previous_vol_avg = mean3(lagged(volume, 5), lagged(volume, 4), lagged(volume, 3))
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            volume_ratio = np.where(volume_ma > 0, volume / volume_ma, 1.0)
+            volume_trend = np.where(previous_vol_avg > 0, recent_vol_avg / previous_vol_avg, 1.0)
+            previous_close = lagged(close, 1)
+            price_change = (close - previous_close) / previous_close
+        
+        confirmed = price_change > 0 if direction == SignalDirection.LONG else price_change < 0
+        score = np.select(
+            [(volume_ratio > 1.5) & confirmed, (volume_ratio > 1.2) & (volume_trend > 1.1), volume_ratio > 0.8],
+            [10.0, 7.0, 5.0],
+            2.0
         )
+        return np.where(bars < self.volume_ma_period + 5, 5.0, score)
+    
+    def _mtf_series(self, context: SeriesFactorContext, direction: SignalDirection) -> np.ndarray:
+        """_score_multitimeframe_agreement for every bar"""
+        price, histories = context.price, context.histories
+        if len(histories) <= 1:
+            return np.full(len(price), 5.0)
+        
+        supporting = sum(self._within_pct_mask(price, history, 3.0, direction).any(axis=1).astype(int)
+                         for history in histories)
+        agreement_ratio = supporting / len(histories)
+        
+        return np.select([agreement_ratio >= 0.8, agreement_ratio >= 0.6, agreement_ratio >= 0.4],
+                         [10.0, 7.0, 5.0], 2.0)
+    
+    def _trend_series(self, context: SeriesFactorContext, direction: SignalDirection) -> np.ndarray:
+        """_score_trend_alignment for every bar"""
+        bars = context.bars
+        close = context.data['close'].to_numpy(dtype=float)
+        ema = context.indicators.ema(self.ema_trend_period).to_numpy(dtype=float)
+        ema_back = np.full(len(ema), np.nan)
+        ema_back[4:] = ema[:-4]
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ema_slope = (ema - ema_back) / ema_back * 100
+            price_vs_ema = (close - ema) / ema * 100
+        
+        if direction == SignalDirection.LONG:
+            score = np.select(
+                [(price_vs_ema > 1) & (ema_slope > 0.1), (price_vs_ema > 0) & (ema_slope > 0), price_vs_ema > -1],
+                [10.0, 7.0, 5.0],
+                2.0
+            )
+        else:
+            score = np.select(
+                [(price_vs_ema < -1) & (ema_slope < -0.1), (price_vs_ema < 0) & (ema_slope < 0), price_vs_ema < 1],
+                [10.0, 7.0, 5.0],
+                2.0
+            )
+        
+        return np.where(bars < self.ema_trend_period + 5, 5.0, score)
+    
+    def score_series(
+        self,
+        data: pd.DataFrame,
+        sr_history: Union[SRHistory, Dict[str, SRHistory]],
+        regime_series: pd.DataFrame,
+        indicators: Optional[IndicatorFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Confluence scores for both directions at every bar in one pass
+        
+        Row i holds what calculate_confluence_score gives on data.iloc[:i+1]
+        with the S/R and regime results of bar i, without reasoning strings.
+        
+        Args:
+            data: OHLCV DataFrame
+            sr_history: SRHistory for data, or a dict of them by timeframe
+                (first one primary) to mirror calculate_confluence_score's sr_results
+            regime_series: RegimeDetector.detect_regime_series(data)
+            indicators: Optional shared IndicatorFrame for data
+            
+        Returns:
+            DataFrame indexed like data with 'long_total' and 'short_total'
+            plus 'long_<factor>' / 'short_<factor>' for every enabled factor
+        """
+        histories = list(sr_history.values()) if isinstance(sr_history, dict) else [sr_history]
+        primary = histories[0]
+        if len(primary) != len(data) or len(regime_series) != len(data):
+            raise ValueError("sr_history and regime_series must have one row per bar of data")
+        
+        factors = self.enabled_factors
+        for factor in factors:
+            if factor.series is None:
+                raise ValueError(f"Confluence factor '{factor.name}' has no series implementation")
+        
+        indicators = indicator_frame(data, indicators)
+        context = SeriesFactorContext(
+            data=data,
+            price=data['close'].to_numpy(dtype=float),
+            bars=np.arange(1, len(data) + 1),     # len(data.iloc[:i+1])
+            histories=histories,
+            regime_series=regime_series,
+            indicators=indicators
+        )
+        
+        columns = {}
+        for direction in (SignalDirection.LONG, SignalDirection.SHORT):
+            prefix = direction.value.lower()
+            scores = {}
+            for factor in factors:
+                started = time.perf_counter()
+                scores[factor.name] = factor.series(context, direction) * factor.weight
+                self._record_timing(factor.name, time.perf_counter() - started)
+            
+            # Same summation order and cap as calculate_confluence_score
+            total = sum(scores.values())
+            columns[f'{prefix}_total'] = np.where(100.0 < total, 100.0, total)
+            for name, values in scores.items():
+                columns[f'{prefix}_{name}'] = values
+        
+        return pd.DataFrame(columns, index=data.index)
     
     def print_confluence_analysis(self, confluence_result: ConfluenceResult) -> None:
         """Print formatted confluence analysis"""
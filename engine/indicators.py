@@ -0,0 +1,164 @@
+"""
+Shared technical indicators
+Pure Series functions plus IndicatorFrame, a per-DataFrame cache keyed by
+(indicator, params) that the regime, confluence, signal and backtest layers
+read from so overlapping rolling windows are computed once per DataFrame
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Hashable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    """True range; NaN on the first bar where there is no previous close"""
+    high_low = high - low
+    high_close = np.abs(high - close.shift())
+    low_close = np.abs(low - close.shift())
+
+    return np.maximum(high_low, np.maximum(high_close, low_close))
+
+
+def sma(series: pd.Series, period: int) -> pd.Series:
+    """Simple moving average (NaN until `period` values are available)"""
+    return series.rolling(window=period).mean()
+
+
+def ema(series: pd.Series, span: int) -> pd.Series:
+    """Exponential moving average, pandas ewm(span).mean()"""
+    return series.ewm(span=span).mean()
+
+
+def rsi(close: pd.Series, period: int) -> pd.Series:
+    """RSI with simple-average gains and losses"""
+    delta = close.diff()
+
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def directional_movement(high: pd.Series, low: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """+DM and -DM with negative moves set to zero"""
+    plus_dm = high.diff()
+    minus_dm = low.diff() * -1
+
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm < 0] = 0
+
+    return plus_dm, minus_dm
+
+
+def adx(plus_dm: pd.Series, minus_dm: pd.Series, atr: pd.Series, period: int) -> pd.Series:
+    """Average Directional Index from directional movement and ATR"""
+    plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
+    minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
+
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+
+    return dx.rolling(window=period).mean()
+
+
+def bollinger_width(close: pd.Series, period: int, num_std: float) -> pd.Series:
+    """Bollinger Band width as a percentage of the middle band"""
+    middle = close.rolling(window=period).mean()
+    std = close.rolling(window=period).std()
+
+    upper_band = middle + (std * num_std)
+    lower_band = middle - (std * num_std)
+
+    return ((upper_band - lower_band) / middle) * 100
+
+
+def momentum(close: pd.Series, period: int) -> pd.Series:
+    """Percent change over `period` bars"""
+    return ((close - close.shift(period)) / close.shift(period)) * 100
+
+
+class IndicatorFrame:
+    """
+    Indicator cache for one OHLCV DataFrame
+
+    Every indicator is computed on first request and stored under
+    (indicator, params), so e.g. the 14-bar ATR used by the regime detector,
+    the stop-loss logic and ATR position sizing is one rolling window.
+    The cached Series are shared; treat them as read-only.
+
+    Usage:
+        indicators = IndicatorFrame(data)
+        atr = indicators.atr(14)
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self._cache: Dict[Hashable, object] = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _cached(self, key: Hashable, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def true_range(self) -> pd.Series:
+        return self._cached(('true_range',), lambda: true_range(
+            self.data['high'], self.data['low'], self.data['close']
+        ))
+
+    def atr(self, period: int) -> pd.Series:
+        return self._cached(('atr', period), lambda: sma(self.true_range(), period))
+
+    def sma(self, column: str, period: int) -> pd.Series:
+        return self._cached(('sma', column, period), lambda: sma(self.data[column], period))
+
+    def ema(self, span: int, column: str = 'close') -> pd.Series:
+        return self._cached(('ema', column, span), lambda: ema(self.data[column], span))
+
+    def rsi(self, period: int) -> pd.Series:
+        return self._cached(('rsi', period), lambda: rsi(self.data['close'], period))
+
+    def directional_movement(self) -> Tuple[pd.Series, pd.Series]:
+        return self._cached(('directional_movement',), lambda: directional_movement(
+            self.data['high'], self.data['low']
+        ))
+
+    def adx(self, period: int, atr_period: int) -> pd.Series:
+        def compute():
+            plus_dm, minus_dm = self.directional_movement()
+            return adx(plus_dm, minus_dm, self.atr(atr_period), period)
+        return self._cached(('adx', period, atr_period), compute)
+
+    def bollinger_width(self, period: int, num_std: float) -> pd.Series:
+        return self._cached(('bollinger_width', period, num_std),
+                            lambda: bollinger_width(self.data['close'], period, num_std))
+
+    def momentum(self, period: int) -> pd.Series:
+        return self._cached(('momentum', period), lambda: momentum(self.data['close'], period))
+
+
+def indicator_frame(data: pd.DataFrame, indicators: Optional[IndicatorFrame] = None) -> IndicatorFrame:
+    """
+    Return indicators if it wraps data, else a fresh IndicatorFrame for data
+
+    Only a frame built on this very DataFrame object is reused: a copy, an
+    updated live frame or another symbol on the same index may hold
+    different prices under the same bars.
+    """
+    if indicators is None:
+        return IndicatorFrame(data)
+    if indicators.data is not data:
+        logger.warning(f"IndicatorFrame passed for a different DataFrame ({len(indicators.data)} bars, "
+                       f"data has {len(data)}); computing indicators for data instead")
+        return IndicatorFrame(data)
+    return indicators
+
+
+if __name__ == "__main__":
+    # Example usage
+    pass
@@ -18,11 +18,11 @@ import sys
 from typing import Dict, List, Optional
 
 from data_fetcher import BinanceDataFetcher, fetch_crypto_data
-from sr_engine import SupportResistanceEngine
-from regime_detector import RegimeDetector
-from confluence_scorer import ConfluenceScorer
-from signal_generator import SignalGenerator
+from regime_detector import RegimeTracker
 from backtester import PulseWaveBacktester, PositionSizing
+from sweep import ParameterSweep, build_signal_generator
+from walk_forward import WalkForward
+from portfolio import PortfolioBacktester
 
 # Configure logging
 logging.basicConfig(
@@ -54,36 +54,17 @@ class PulseWavePlatform:
         # Initialize components
         self.data_fetcher = BinanceDataFetcher()
         
-        self.sr_engine = SupportResistanceEngine(
-            pivot_period=self.config.get('pivot_period', 10),
-            max_pivots=self.config.get('max_pivots', 60),
-            channel_width_pct=self.config.get('channel_width_pct', 10),
-            max_sr_levels=self.config.get('max_sr_levels', 8),
-            min_strength=self.config.get('min_strength', 3),
-            lookback_period=self.config.get('lookback_period', 400)
-        )
-        
-        self.regime_detector = RegimeDetector(
-            atr_period=self.config.get('atr_period', 14),
-            adx_period=self.config.get('adx_period', 14),
-            bb_period=self.config.get('bb_period', 20),
-            ema_fast=self.config.get('ema_fast', 20),
-            ema_slow=self.config.get('ema_slow', 50)
-        )
-        
-        self.confluence_scorer = ConfluenceScorer(
-            rsi_period=self.config.get('rsi_period', 14),
-            volume_ma_period=self.config.get('volume_ma_period', 20),
-            proximity_threshold_pct=self.config.get('proximity_threshold_pct', 2.0)
-        )
+        # Components are wired by build_signal_generator, which the sweep shares
+        self.signal_generator = build_signal_generator(self.config)
+        self.sr_engine = self.signal_generator.sr_engine
+        self.regime_detector = self.signal_generator.regime_detector
+        self.confluence_scorer = self.signal_generator.confluence_scorer
         
-        self.signal_generator = SignalGenerator(
-            sr_engine=self.sr_engine,
-            regime_detector=self.regime_detector,
-            confluence_scorer=self.confluence_scorer,
-            min_confluence_score=self.config.get('min_confluence_score', 45.0),
-            min_risk_reward=self.config.get('min_risk_reward', 1.5),
-            max_stop_loss_pct=self.config.get('max_stop_loss_pct', 3.0)
+        # Per-symbol regime state; analyze_symbol reports confirmed changes only
+        self.regime_tracker = RegimeTracker(
+            self.regime_detector,
+            confirm_bars=self.config.get('regime_confirm_bars', 3),
+            min_dwell_bars=self.config.get('regime_min_dwell_bars', 5)
         )
         
         logger.info("PulseWave platform initialized")
@@ -98,6 +79,7 @@ class PulseWavePlatform:
             'max_sr_levels': 8,
             'min_strength': 3,
             'lookback_period': 400,
+            'sr_cache_size': 128,
             
             # Regime Detection
             'atr_period': 14,
@@ -105,16 +87,21 @@ class PulseWavePlatform:
             'bb_period': 20,
             'ema_fast': 20,
             'ema_slow': 50,
+            'regime_confirm_bars': 3,
+            'regime_min_dwell_bars': 5,
             
             # Confluence Scoring
             'rsi_period': 14,
             'volume_ma_period': 20,
             'proximity_threshold_pct': 2.0,
+            'confluence_factors': {},  # e.g. {'volume_confirmation': False, 'rsi_condition': 1.5}
             
             # Signal Generation
             'min_confluence_score': 45.0,
             'min_risk_reward': 1.5,
             'max_stop_loss_pct': 3.0,
+            'early_exit_scoring': True,
+            'backtest_precompute': True,
             
             # Data Fetching
             'symbol': 'BTCUSDT',
@@ -173,10 +160,14 @@ class PulseWavePlatform:
             # Step 3: Regime Detection
             logger.info("Detecting market regime...")
             regime_result = self.regime_detector.detect_regime(primary_data)
+            regime_transition = self.regime_tracker.observe(symbol, regime_result, primary_data.index[-1])
             
             # Step 4: Signal Generation
             logger.info("Generating trading signal...")
-            signal = self.signal_generator.generate_signal(primary_data, timeframes)
+            # Each timeframe's S/R runs on its own fetched bars
+            signal = self.signal_generator.generate_signal(
+                data_dict, [tf for tf in timeframes if tf in data_dict]
+            )
             
             # Compile results
             results = {
@@ -186,6 +177,7 @@ class PulseWavePlatform:
                 'data': data_dict,
                 'sr_results': sr_results,
                 'regime_result': regime_result,
+                'regime_transition': regime_transition,
                 'signal': signal,
                 'timeframes': timeframes
             }
@@ -270,7 +262,9 @@ class PulseWavePlatform:
             
             # Run backtest
             logger.info("Running backtest...")
-            results = backtester.run_backtest(data)
+            results = backtester.run_backtest(
+                data, precompute=self.config.get('backtest_precompute', True)
+            )
             
             # Print results
             backtester.print_backtest_results(results)
@@ -281,6 +275,152 @@ class PulseWavePlatform:
             logger.error(f"Error during backtesting: {e}")
             raise
     
+    def run_sweep(
+        self,
+        grid: Dict[str, List],
+        symbol: str = None,
+        timeframe: str = None,
+        days_back: int = 180,
+        output_path: Optional[str] = None,
+        workers: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Backtest every combination of a parameter grid on one symbol
+        
+        Args:
+            grid: Dictionary of {config key: candidate values}; keys are this
+                platform's config keys plus backtester settings such as
+                position_sizing, position_size and max_bars_held
+            symbol: Trading pair symbol
+            timeframe: Timeframe to backtest (default: first configured timeframe)
+            days_back: Historical data period
+            output_path: JSONL file for incremental results (rerun to resume)
+            workers: Number of worker processes (default: CPU count)
+            
+        Returns:
+            Ranked results table
+        """
+        symbol = symbol or self.config['symbol']
+        timeframe = timeframe or self.config['timeframes'][0]
+        
+        logger.info(f"Starting parameter sweep for {symbol} {timeframe} with {days_back} days of data")
+        
+        data = self.data_fetcher.get_historical_data(
+            symbol=symbol,
+            interval=timeframe,
+            days_back=days_back
+        )
+        
+        sweep = ParameterSweep(self.config, workers=workers)
+        table = sweep.run(data, grid, output_path=output_path)
+        sweep.print_results(table)
+        
+        return table
+    
+    def run_walk_forward(
+        self,
+        grid: Dict[str, List],
+        in_sample_bars: int,
+        out_of_sample_bars: int,
+        symbol: str = None,
+        timeframe: str = None,
+        days_back: int = 365,
+        anchored: bool = False,
+        workers: Optional[int] = None
+    ):
+        """
+        Walk-forward optimization of a parameter grid on one symbol
+        
+        Args:
+            grid: Dictionary of {config key: candidate values} (see run_sweep)
+            in_sample_bars: Bars per optimization window
+            out_of_sample_bars: Bars per evaluation window (and the step)
+            symbol: Trading pair symbol
+            timeframe: Timeframe to backtest (default: first configured timeframe)
+            days_back: Historical data period
+            anchored: Grow in-sample windows instead of rolling them
+            workers: Number of worker processes (default: CPU count)
+            
+        Returns:
+            WalkForwardResult
+        """
+        symbol = symbol or self.config['symbol']
+        timeframe = timeframe or self.config['timeframes'][0]
+        
+        logger.info(f"Starting walk-forward for {symbol} {timeframe} with {days_back} days of data")
+        
+        data = self.data_fetcher.get_historical_data(
+            symbol=symbol,
+            interval=timeframe,
+            days_back=days_back
+        )
+        
+        walk_forward = WalkForward(in_sample_bars, out_of_sample_bars, self.config,
+                                   anchored=anchored, workers=workers)
+        result = walk_forward.run(data, grid)
+        walk_forward.print_results(result)
+        
+        return result
+    
+    def run_portfolio_backtest(
+        self,
+        symbols: List[str],
+        timeframe: str = None,
+        days_back: int = 180,
+        position_sizing: PositionSizing = PositionSizing.PERCENT,
+        position_size: float = 0.02,
+        initial_capital: float = 100000,
+        max_positions: int = 10,
+        max_symbol_exposure: float = 0.2,
+        workers: Optional[int] = None
+    ):
+        """
+        Run a shared-capital backtest across several symbols
+        
+        Args:
+            symbols: Trading pair symbols
+            timeframe: Timeframe to backtest (default: first configured timeframe)
+            days_back: Historical data period
+            position_sizing: Position sizing method
+            position_size: Position size parameter
+            initial_capital: Starting capital shared by all symbols
+            max_positions: Maximum concurrent positions
+            max_symbol_exposure: Maximum entry notional per symbol (fraction of capital)
+            workers: Number of signal worker processes (default: CPU count)
+            
+        Returns:
+            BacktestResult with per-symbol trades
+        """
+        timeframe = timeframe or self.config['timeframes'][0]
+        
+        logger.info(f"Starting portfolio backtest for {len(symbols)} symbols on {timeframe}")
+        
+        frames = {}
+        for symbol in symbols:
+            try:
+                frames[symbol] = self.data_fetcher.get_historical_data(
+                    symbol=symbol,
+                    interval=timeframe,
+                    days_back=days_back
+                )
+            except Exception as e:
+                logger.error(f"Error fetching {symbol}, leaving it out: {e}")
+        
+        backtester = PortfolioBacktester(
+            signal_generator=self.signal_generator,
+            position_sizing=position_sizing,
+            position_size=position_size,
+            initial_capital=initial_capital,
+            max_positions=max_positions,
+            max_symbol_exposure=max_symbol_exposure,
+            workers=workers
+        )
+        
+        results = backtester.run_portfolio_backtest(frames)
+        backtester.print_backtest_results(results)
+        
+        return results
+    
     def live_monitoring(
         self,
         symbol: str = None,
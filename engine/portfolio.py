@@ -0,0 +1,331 @@
+"""
+Portfolio backtester
+Event-driven backtest of many symbols against one capital pool, with a limit
+on concurrent positions, per-symbol exposure caps and no leverage
+"""
+
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+from typing import Dict, NamedTuple, Optional
+import os
+import logging
+
+from signal_generator import SignalGenerator, Signal
+from backtester import PulseWaveBacktester, BacktestResult, OpenPosition, PositionSizing, Trade
+from shared_data import FrameSpec, SharedFrames, attach_frame
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolSignals(NamedTuple):
+    """Non-neutral signals of one symbol, one element per signal bar"""
+    bars: np.ndarray            # Bar positions in the symbol's frame
+    is_long: np.ndarray
+    entry_price: np.ndarray
+    stop_loss: np.ndarray
+    take_profit: np.ndarray
+    confidence: np.ndarray
+    risk_reward_ratio: np.ndarray
+    atr: np.ndarray             # ATR at the bar, for ATR sizing
+
+
+def _symbol_signals_task(backtester: 'PortfolioBacktester', spec: FrameSpec, index: pd.Index,
+                         symbol: str, min_bars_for_signal: int) -> SymbolSignals:
+    """Process-pool entry point: attach the shared frame and compute its signals"""
+    return backtester._symbol_signals(attach_frame(spec, index), symbol, min_bars_for_signal)
+
+
+class PortfolioBacktester(PulseWaveBacktester):
+    """
+    Backtests PulseWave signals on many symbols with shared capital
+
+    Signals only depend on each symbol's own bars, so every symbol's signals
+    are computed up front in a process pool (SignalGenerator.precompute, OHLCV
+    in shared memory). The simulation then steps through the entry and exit
+    events of the time-aligned panel in order: exits first, then entries by
+    confidence while position slots are free. An entered position's exit is
+    found right away with the single-symbol kernel and queued, and equity is
+    marked to market from the position spans once at the end.
+
+    Per symbol, entries, exits, sizing, slippage and commission follow
+    run_backtest (at most one position, no re-entry on the exit bar), with
+    the pool's realized capital as the sizing base. The entry notional of
+    all open positions is kept within that capital: an entry is shrunk to
+    the capital not yet committed, or skipped when none is left. A
+    one-symbol portfolio with max_symbol_exposure <= 1 reproduces
+    run_backtest(precompute=True).
+
+    Usage:
+        portfolio = PortfolioBacktester(generator, max_positions=10, max_symbol_exposure=0.2)
+        result = portfolio.run_portfolio_backtest({'BTCUSDT': btc_1h, 'ETHUSDT': eth_1h})
+    """
+
+    def __init__(
+        self,
+        signal_generator: SignalGenerator,
+        position_sizing: PositionSizing = PositionSizing.PERCENT,
+        position_size: float = 0.02,
+        commission: float = 0.001,
+        slippage: float = 0.0005,
+        max_bars_held: int = 100,
+        initial_capital: float = 100000,
+        max_positions: int = 10,             # Concurrent open positions across symbols
+        max_symbol_exposure: float = 0.2,    # Max entry notional per symbol, as a fraction of capital
+        symbol_exposure: Optional[Dict[str, float]] = None,  # Per-symbol overrides of max_symbol_exposure
+        workers: Optional[int] = None        # Signal worker processes (default: CPU count)
+    ):
+        super().__init__(signal_generator, position_sizing, position_size, commission,
+                         slippage, max_bars_held, initial_capital)
+        self.max_positions = max_positions
+        self.max_symbol_exposure = max_symbol_exposure
+        self.symbol_exposure = dict(symbol_exposure or {})
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    def _symbol_signals(self, data: pd.DataFrame, symbol: str, min_bars_for_signal: int) -> SymbolSignals:
+        """Every non-neutral signal of one symbol from bar min_bars_for_signal on; errors skip the bar"""
+        rows = []
+        try:
+            signal_series = self.signal_generator.precompute(data)
+        except Exception as e:
+            logger.error(f"Error precomputing signals for {symbol}: {e}")
+            signal_series = None
+
+        for i in range(min_bars_for_signal, len(data) if signal_series is not None else 0):
+            try:
+                signal = self.signal_generator.signal_at(signal_series, i)
+            except Exception as e:
+                logger.error(f"Error generating {symbol} signal at {data.index[i]}: {e}")
+                continue
+
+            if signal.signal != Signal.NEUTRAL:
+                rows.append((i, signal.signal == Signal.LONG, signal.entry_price, signal.stop_loss,
+                             signal.take_profit, signal.confidence, signal.risk_reward_ratio,
+                             self._atr_at(data, signal_series.atr, i)))
+
+        columns = list(zip(*rows)) if rows else [()] * len(SymbolSignals._fields)
+        return SymbolSignals(
+            bars=np.array(columns[0], dtype=np.intp),
+            is_long=np.array(columns[1], dtype=bool),
+            **{field: np.array(values, dtype=float)
+               for field, values in zip(SymbolSignals._fields[2:], columns[2:])}
+        )
+
+    def _panel_signals(self, frames: Dict[str, pd.DataFrame],
+                       min_bars_for_signal: int) -> Dict[str, SymbolSignals]:
+        """SymbolSignals of every frame, in a process pool when there are several"""
+        workers = min(self.workers, len(frames))
+
+        if workers <= 1:
+            return {symbol: self._symbol_signals(data, symbol, min_bars_for_signal)
+                    for symbol, data in frames.items()}
+
+        symbols = list(frames)
+        with SharedFrames(frames) as shared:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    _symbol_signals_task,
+                    [self] * len(symbols),
+                    [shared.specs[symbol] for symbol in symbols],
+                    [frames[symbol].index for symbol in symbols],
+                    symbols,
+                    [min_bars_for_signal] * len(symbols),
+                    chunksize=max(1, len(symbols) // (workers * 4))
+                )
+                signals = dict(zip(symbols, results))
+
+        logger.info(f"Computed signals for {len(signals)} symbols with {workers} workers")
+        return signals
+
+    def run_portfolio_backtest(self, frames: Dict[str, pd.DataFrame],
+                               start_date: Optional[str] = None,
+                               end_date: Optional[str] = None,
+                               min_bars_for_signal: int = 100) -> BacktestResult:
+        """
+        Run a shared-capital backtest over many symbols
+
+        Args:
+            frames: Dictionary of {symbol: OHLCV DataFrame with datetime index};
+                bars are aligned on the union of the indexes
+            start_date: Start date for backtest (optional)
+            end_date: End date for backtest (optional)
+            min_bars_for_signal: Minimum bars of a symbol before its first signal
+
+        Returns:
+            BacktestResult over the whole portfolio; trades carry their symbol
+        """
+        usable = {}
+        for symbol, data in frames.items():
+            if start_date:
+                data = data[data.index >= start_date]
+            if end_date:
+                data = data[data.index <= end_date]
+            if len(data) < min_bars_for_signal + 50:
+                logger.warning(f"Skipping {symbol}: insufficient data for backtesting")
+                continue
+            usable[symbol] = data
+
+        if not usable:
+            raise ValueError("Insufficient data for backtesting")
+
+        symbols = list(usable)
+        index = usable[symbols[0]].index
+        for symbol in symbols[1:]:
+            index = index.union(usable[symbol].index)
+        bar_times = {symbol: index.get_indexer(usable[symbol].index) for symbol in symbols}
+
+        logger.info(f"Starting portfolio backtest of {len(symbols)} symbols over {len(index)} bars "
+                    f"from {index[0]} to {index[-1]}")
+
+        signals = self._panel_signals(usable, min_bars_for_signal)
+        ohlc = {
+            symbol: tuple(np.ascontiguousarray(usable[symbol][col].to_numpy(dtype=float))
+                          for col in ('close', 'low', 'high'))
+            for symbol in symbols
+        }
+
+        # Entry candidates by time, then confidence (highest first), then symbol order
+        candidate_symbol = np.concatenate([np.full(len(signals[symbol].bars), k, dtype=np.intp)
+                                           for k, symbol in enumerate(symbols)])
+        candidate_signal = np.concatenate([np.arange(len(signals[symbol].bars)) for symbol in symbols])
+        candidate_time = np.concatenate([bar_times[symbol][signals[symbol].bars] for symbol in symbols])
+        candidate_confidence = np.concatenate([signals[symbol].confidence for symbol in symbols])
+        order = np.lexsort((candidate_symbol, -candidate_confidence, candidate_time))
+
+        trades = []
+        current_capital = self.initial_capital
+        realized = np.full(len(index), np.nan)    # Capital after each time's events
+        open_positions: Dict[str, OpenPosition] = {}
+        committed: Dict[str, float] = {}          # Entry notional of each open position
+        last_exit: Dict[str, int] = {}
+        exits = []                                # Heap of (time, symbol id, exit bar, price, reason)
+        spans = []                                # (symbol, first time, end time, position) to mark to market
+
+        def close_position(time: int, k: int, exit_index: int, exit_price: float, exit_reason: str) -> None:
+            nonlocal current_capital
+            symbol = symbols[k]
+            position = open_positions.pop(symbol)
+            del committed[symbol]
+            signal_type = position.signal_type
+            entry_price = position.entry_price
+            position_size = position.position_size
+
+            exit_price, commission_cost = self._apply_slippage_and_commission(
+                exit_price, signal_type == Signal.SHORT, position_size
+            )
+            if signal_type == Signal.LONG:
+                pnl = (exit_price - entry_price) * position_size - commission_cost
+            else:  # SHORT
+                pnl = (entry_price - exit_price) * position_size - commission_cost
+
+            pnl_pct = pnl / (entry_price * position_size) * 100
+            current_capital += pnl
+            realized[time] = current_capital
+            last_exit[symbol] = time
+
+            trades.append(Trade(
+                entry_time=usable[symbol].index[position.entry_index],
+                exit_time=usable[symbol].index[exit_index],
+                signal_type=signal_type,
+                entry_price=entry_price,
+                exit_price=exit_price,
+                stop_loss=position.stop_loss,
+                take_profit=position.take_profit,
+                position_size=position_size,
+                pnl=pnl,
+                pnl_pct=pnl_pct,
+                exit_reason=exit_reason,
+                bars_held=exit_index - position.entry_index,
+                confidence=position.confidence,
+                symbol=symbol
+            ))
+            logger.info(f"Closed {symbol} {signal_type.value} position: {pnl:.2f} ({pnl_pct:.2f}%) - {exit_reason}")
+
+        for c in order:
+            time = candidate_time[c]
+            while exits and exits[0][0] <= time:
+                close_position(*heappop(exits))
+
+            k = candidate_symbol[c]
+            symbol = symbols[k]
+            if (symbol in open_positions or last_exit.get(symbol) == time
+                    or len(open_positions) >= self.max_positions):
+                continue
+
+            signal = signals[symbol]
+            s = candidate_signal[c]
+            entry_price = signal.entry_price[s]
+            position_size = self._size_position(entry_price, signal.stop_loss[s],
+                                                signal.risk_reward_ratio[s], current_capital, signal.atr[s])
+
+            # Per-symbol exposure cap on the entry notional, then the capital
+            # not committed to other open positions
+            max_notional = min(self.symbol_exposure.get(symbol, self.max_symbol_exposure) * current_capital,
+                               current_capital - sum(committed.values()))
+            if position_size * entry_price > max_notional:
+                position_size = max_notional / entry_price
+            if not position_size > 0:
+                continue
+
+            fill_price, commission_cost = self._apply_slippage_and_commission(entry_price, True, position_size)
+            current_capital -= commission_cost
+            realized[time] = current_capital
+
+            position = OpenPosition(
+                signal_type=Signal.LONG if signal.is_long[s] else Signal.SHORT,
+                entry_index=int(signal.bars[s]),
+                entry_price=fill_price,
+                stop_loss=signal.stop_loss[s],
+                take_profit=signal.take_profit[s],
+                position_size=position_size,
+                confidence=signal.confidence[s]
+            )
+            open_positions[symbol] = position
+            committed[symbol] = position_size * entry_price
+            logger.info(f"Opened {symbol} {position.signal_type.value} position at {fill_price:.4f}, "
+                        f"size: {position_size:.2f}")
+
+            close, low, high = ohlc[symbol]
+            exit_hit = self._find_exit(close, low, high, position)
+            if exit_hit is None:
+                spans.append((symbol, time, len(index), position))  # Still open on the last bar
+            else:
+                exit_index, exit_price, exit_reason = exit_hit
+                exit_time = bar_times[symbol][exit_index]
+                spans.append((symbol, time, exit_time, position))
+                heappush(exits, (exit_time, k, exit_index, exit_price, exit_reason))
+
+        while exits:
+            close_position(*heappop(exits))
+
+        start = min(bar_times[symbol][min_bars_for_signal] for symbol in symbols)
+        equity_curve = self._portfolio_equity(index, start, realized, spans, usable, bar_times)
+        return self._calculate_metrics(trades, equity_curve, None)
+
+    def _portfolio_equity(self, index: pd.Index, start: int, realized: np.ndarray, spans: list,
+                          frames: Dict[str, pd.DataFrame], bar_times: Dict[str, np.ndarray]) -> pd.Series:
+        """Equity from bar start on: realized capital plus open positions marked at each symbol's last close"""
+        capital = pd.Series(realized[start:]).ffill().fillna(self.initial_capital).to_numpy()
+        unrealized = np.zeros(len(capital))
+
+        aligned_close: Dict[str, np.ndarray] = {}
+        for symbol, first, end, position in spans:
+            if symbol not in aligned_close:
+                close = np.full(len(index), np.nan)
+                close[bar_times[symbol]] = frames[symbol]['close'].to_numpy(dtype=float)
+                aligned_close[symbol] = pd.Series(close).ffill().to_numpy()
+
+            close = aligned_close[symbol][first:end]
+            if position.signal_type == Signal.LONG:
+                unrealized[first - start:end - start] += (close - position.entry_price) * position.position_size
+            else:
+                unrealized[first - start:end - start] += (position.entry_price - close) * position.position_size
+
+        equity = np.concatenate(([self.initial_capital], capital + unrealized))
+        return pd.Series(equity, index=index[[max(start - 1, 0)]].append(index[start:]))
+
+
+if __name__ == "__main__":
+    # Example usage
+    pass
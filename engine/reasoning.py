@@ -0,0 +1,75 @@
+"""
+Lazy explanation text
+Signals and confluence results carry Reason objects (a format template plus
+its values) and only render them to strings when printed or published
+"""
+
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Union
+
+
+class Reason(NamedTuple):
+    """
+    One explanation line, rendered with template.format(*values) on demand
+
+    Values may themselves be Reasons, which render when the outer one does.
+    """
+    template: str
+    values: tuple = ()
+
+    def __str__(self) -> str:
+        return self.template.format(*self.values)
+
+
+# An explanation line, lazy or already rendered
+ReasonText = Union[Reason, str]
+
+
+class Reasoning(Sequence[str]):
+    """
+    Read-only list of explanation lines backed by Reasons and/or plain strings
+
+    Indexing and iteration yield rendered strings, so it reads like the
+    List[str] it replaces; slicing stays lazy.
+
+    Usage:
+        reasoning = Reasoning([Reason("Confluence score: {:.1f}/100", (score,))])
+        for line in reasoning:
+            print(line)
+    """
+
+    __slots__ = ('reasons',)
+
+    def __init__(self, reasons: Iterable[ReasonText] = ()):
+        self.reasons = list(reasons)
+
+    def __len__(self) -> int:
+        return len(self.reasons)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return Reasoning(self.reasons[i])
+        return str(self.reasons[i])
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(reason) for reason in self.reasons)
+
+    def __add__(self, other: Iterable[ReasonText]) -> 'Reasoning':
+        other = other.reasons if isinstance(other, Reasoning) else list(other)
+        return Reasoning(self.reasons + other)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Reasoning, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def to_list(self) -> List[str]:
+        """Render every line"""
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"Reasoning({self.to_list()!r})"
+
+
+if __name__ == "__main__":
+    # Example usage
+    pass
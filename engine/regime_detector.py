@@ -6,10 +6,13 @@ Uses ATR ratio, ADX, Bollinger Band width, price vs EMA position
 
 import pandas as pd
 import numpy as np
-from typing import Tuple, NamedTuple
+from typing import Dict, List, Tuple, NamedTuple, Optional
+from collections import deque
 from enum import Enum
 import logging
 
+from indicators import IndicatorFrame, indicator_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +31,11 @@ class RegimeResult(NamedTuple):
     components: dict   # Breakdown of each factor
 
 
+# Component keys of RegimeResult.components, in insertion order
+REGIME_COMPONENTS = ('atr_ratio', 'adx', 'bb_width', 'trend_strength', 'volatility_score',
+                     'momentum_alignment', 'ema_trend', 'is_uptrend', 'is_momentum_bullish')
+
+
 class RegimeDetector:
     """
     Detects market regime using multiple technical indicators:
@@ -61,65 +69,26 @@ class RegimeDetector:
         self.momentum_fast = momentum_fast
         self.momentum_slow = momentum_slow
         
-    def _calculate_atr(self, data: pd.DataFrame) -> pd.Series:
+    def _calculate_atr(self, data: pd.DataFrame, indicators: Optional[IndicatorFrame] = None) -> pd.Series:
         """Calculate Average True Range"""
-        high_low = data['high'] - data['low']
-        high_close = np.abs(data['high'] - data['close'].shift())
-        low_close = np.abs(data['low'] - data['close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=self.atr_period).mean()
-        
-        return atr
+        return indicator_frame(data, indicators).atr(self.atr_period)
     
-    def _calculate_adx(self, data: pd.DataFrame) -> pd.Series:
+    def _calculate_adx(self, data: pd.DataFrame, indicators: Optional[IndicatorFrame] = None) -> pd.Series:
         """Calculate Average Directional Index (ADX)"""
-        high = data['high']
-        low = data['low']
-        close = data['close']
-        
-        # Calculate directional movements
-        plus_dm = high.diff()
-        minus_dm = low.diff() * -1
-        
-        # Set negative movements to zero
-        plus_dm[plus_dm < 0] = 0
-        minus_dm[minus_dm < 0] = 0
-        
-        # Calculate True Range
-        atr = self._calculate_atr(data)
-        
-        # Calculate smoothed directional indicators
-        plus_di = 100 * (plus_dm.rolling(window=self.adx_period).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=self.adx_period).mean() / atr)
-        
-        # Calculate DX
-        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-        
-        # Calculate ADX (smoothed DX)
-        adx = dx.rolling(window=self.adx_period).mean()
-        
-        return adx
+        return indicator_frame(data, indicators).adx(self.adx_period, self.atr_period)
     
-    def _calculate_bollinger_width(self, data: pd.DataFrame) -> pd.Series:
+    def _calculate_bollinger_width(self, data: pd.DataFrame, indicators: Optional[IndicatorFrame] = None) -> pd.Series:
         """Calculate Bollinger Band Width as percentage"""
-        close = data['close']
-        sma = close.rolling(window=self.bb_period).mean()
-        std = close.rolling(window=self.bb_period).std()
-        
-        upper_band = sma + (std * self.bb_std)
-        lower_band = sma - (std * self.bb_std)
-        
-        bb_width = ((upper_band - lower_band) / sma) * 100
-        
-        return bb_width
+        return indicator_frame(data, indicators).bollinger_width(self.bb_period, self.bb_std)
     
-    def _calculate_ema_position(self, data: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    def _calculate_ema_position(self, data: pd.DataFrame,
+                                indicators: Optional[IndicatorFrame] = None) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """Calculate EMA position indicators"""
+        indicators = indicator_frame(data, indicators)
         close = data['close']
         
-        ema_fast = close.ewm(span=self.ema_fast).mean()
-        ema_slow = close.ewm(span=self.ema_slow).mean()
+        ema_fast = indicators.ema(self.ema_fast)
+        ema_slow = indicators.ema(self.ema_slow)
         
         # Price position relative to EMAs
         price_vs_fast = ((close - ema_fast) / ema_fast) * 100
@@ -130,14 +99,11 @@ class RegimeDetector:
         
         return price_vs_fast, price_vs_slow, ema_trend
     
-    def _calculate_momentum(self, data: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    def _calculate_momentum(self, data: pd.DataFrame,
+                            indicators: Optional[IndicatorFrame] = None) -> Tuple[pd.Series, pd.Series]:
         """Calculate price momentum indicators"""
-        close = data['close']
-        
-        momentum_fast = ((close - close.shift(self.momentum_fast)) / close.shift(self.momentum_fast)) * 100
-        momentum_slow = ((close - close.shift(self.momentum_slow)) / close.shift(self.momentum_slow)) * 100
-        
-        return momentum_fast, momentum_slow
+        indicators = indicator_frame(data, indicators)
+        return indicators.momentum(self.momentum_fast), indicators.momentum(self.momentum_slow)
     
     def _score_trend_strength(self, adx_value: float, ema_trend: float) -> Tuple[float, bool]:
         """
@@ -193,30 +159,27 @@ class RegimeDetector:
         
         return alignment_score, is_bullish
     
-    def detect_regime(self, data: pd.DataFrame) -> RegimeResult:
+    def detect_regime(self, data: pd.DataFrame, indicators: Optional[IndicatorFrame] = None) -> RegimeResult:
         """
         Detect market regime for given OHLCV data
         
         Args:
             data: DataFrame with OHLC data
+            indicators: Optional shared IndicatorFrame for data
             
         Returns:
             RegimeResult with regime classification and confidence
         """
-        if len(data) < max(self.adx_period, self.bb_period, self.ema_slow, self.momentum_slow) + 10:
-            logger.warning("Insufficient data for regime detection")
-            return RegimeResult(
-                regime=MarketRegime.RANGING,
-                confidence=50.0,
-                components={}
-            )
+        if len(data) < self._min_bars():
+            return self._insufficient_data_result()
         
         # Calculate all indicators
-        atr = self._calculate_atr(data)
-        adx = self._calculate_adx(data)
-        bb_width = self._calculate_bollinger_width(data)
-        price_vs_fast, price_vs_slow, ema_trend = self._calculate_ema_position(data)
-        momentum_fast, momentum_slow = self._calculate_momentum(data)
+        indicators = indicator_frame(data, indicators)
+        atr = self._calculate_atr(data, indicators)
+        adx = self._calculate_adx(data, indicators)
+        bb_width = self._calculate_bollinger_width(data, indicators)
+        price_vs_fast, price_vs_slow, ema_trend = self._calculate_ema_position(data, indicators)
+        momentum_fast, momentum_slow = self._calculate_momentum(data, indicators)
         
         # Get latest values
         current_atr = atr.iloc[-1]
@@ -232,6 +195,30 @@ class RegimeDetector:
         atr_ma = atr.rolling(window=20).mean().iloc[-1]
         atr_ratio = current_atr / atr_ma if atr_ma > 0 else 1.0
         
+        return self._classify_regime(
+            atr_ratio, current_adx, current_bb_width,
+            current_price_vs_fast, current_price_vs_slow, current_ema_trend,
+            current_momentum_fast, current_momentum_slow
+        )
+    
+    def _min_bars(self) -> int:
+        """Bars needed before the regime is classified"""
+        return max(self.adx_period, self.bb_period, self.ema_slow, self.momentum_slow) + 10
+    
+    def _insufficient_data_result(self) -> RegimeResult:
+        """Neutral result returned until _min_bars() bars are available"""
+        logger.warning("Insufficient data for regime detection")
+        return RegimeResult(
+            regime=MarketRegime.RANGING,
+            confidence=50.0,
+            components={}
+        )
+    
+    def _classify_regime(self, atr_ratio: float, current_adx: float, current_bb_width: float,
+                         current_price_vs_fast: float, current_price_vs_slow: float,
+                         current_ema_trend: float, current_momentum_fast: float,
+                         current_momentum_slow: float) -> RegimeResult:
+        """Score the latest indicator values and classify the regime"""
         # Score components
         trend_strength, is_uptrend = self._score_trend_strength(current_adx, current_ema_trend)
         volatility_score = self._score_volatility(atr_ratio, current_bb_width)
@@ -286,6 +273,209 @@ class RegimeDetector:
             components=components
         )
     
+    def _indicator_arrays(self, data, indicators: IndicatorFrame) -> Dict[str, np.ndarray]:
+        """
+        Latest-value inputs of _classify_regime for every bar (and column)
+        
+        data may be an OHLC DataFrame or a mapping of (time x symbol) DataFrames;
+        the indicator functions are column-wise, so both give the same values.
+        """
+        atr = self._calculate_atr(data, indicators)
+        price_vs_fast, price_vs_slow, ema_trend = self._calculate_ema_position(data, indicators)
+        momentum_fast, momentum_slow = self._calculate_momentum(data, indicators)
+        
+        arrays = {
+            'atr': atr,
+            'atr_ma': atr.rolling(window=20).mean(),
+            'adx': self._calculate_adx(data, indicators),
+            'bb_width': self._calculate_bollinger_width(data, indicators),
+            'price_vs_fast': price_vs_fast,
+            'price_vs_slow': price_vs_slow,
+            'ema_trend': ema_trend,
+            'momentum_fast': momentum_fast,
+            'momentum_slow': momentum_slow
+        }
+        return {name: values.to_numpy(dtype=float) for name, values in arrays.items()}
+    
+    def _classify_regime_arrays(self, atr: np.ndarray, atr_ma: np.ndarray, adx: np.ndarray,
+                                bb_width: np.ndarray, price_vs_fast: np.ndarray,
+                                price_vs_slow: np.ndarray, ema_trend: np.ndarray,
+                                momentum_fast: np.ndarray, momentum_slow: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Array version of the ATR ratio, scoring and _classify_regime
+        
+        Python max/min are mirrored with np.where so NaN and signed-zero
+        results match the scalar path exactly.
+        
+        Returns:
+            Dict with 'regime', 'confidence' and REGIME_COMPONENTS arrays
+        """
+        def py_max(a, b):
+            return np.where(b > a, b, a)
+        
+        def py_min(a, b):
+            return np.where(b < a, b, a)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            atr_ratio = np.where(atr_ma > 0, atr / atr_ma, 1.0)
+            
+            # _score_trend_strength
+            trend_strength = np.where(adx >= 25, py_min((adx - 25) / 25, 1.0), 0.0)
+            is_uptrend = ema_trend > 0
+            
+            # _score_volatility
+            atr_score = py_min(py_max(atr_ratio - 1.0, 0.0) / 1.0, 1.0)
+            bb_score = py_min(py_max(bb_width - 2.0, 0.0) / 8.0, 1.0)
+            volatility_score = (atr_score + bb_score) / 2.0
+        
+        # _score_momentum_alignment
+        bullish_signals = ((price_vs_fast > 0).astype(int) + (price_vs_slow > 0) +
+                           (momentum_fast > 0) + (momentum_slow > 0))
+        bearish_signals = 4 - bullish_signals
+        momentum_alignment = np.select(
+            [bullish_signals >= 3, bearish_signals >= 3],
+            [bullish_signals / 4.0, bearish_signals / 4.0],
+            0.5
+        )
+        is_momentum_bullish = np.select(
+            [bullish_signals >= 3, bearish_signals >= 3],
+            [True, False],
+            momentum_fast > momentum_slow
+        ).astype(bool)
+        
+        # Classification tree of _classify_regime
+        high_volatility = volatility_score > 0.7
+        volatile_trend = high_volatility & (trend_strength > 0.6) & (momentum_alignment > 0.7)
+        trending = ~high_volatility & (trend_strength > 0.5) & (momentum_alignment > 0.6)
+        aligned = is_uptrend == is_momentum_bullish
+        
+        up, down, ranging, volatile = (MarketRegime.TRENDING_UP, MarketRegime.TRENDING_DOWN,
+                                       MarketRegime.RANGING, MarketRegime.VOLATILE)
+        regime = np.select(
+            [volatile_trend, high_volatility, trending & aligned, trending],
+            [np.where(is_uptrend & is_momentum_bullish, up, down), volatile,
+             np.where(is_uptrend, up, down), ranging],
+            ranging
+        )
+        confidence = np.select(
+            [volatile_trend, high_volatility, trending & aligned, trending],
+            [py_min(85 + (trend_strength * 15), 95.0),
+             py_min(60 + (volatility_score * 30), 85.0),
+             py_min(70 + (trend_strength * 20) + (momentum_alignment * 10), 95.0),
+             60.0],
+            py_min(50 + ((1 - trend_strength) * 20) + ((1 - momentum_alignment) * 15), 80.0)
+        )
+        
+        return {
+            'regime': regime,
+            'confidence': confidence,
+            'atr_ratio': atr_ratio,
+            'adx': adx,
+            'bb_width': bb_width,
+            'trend_strength': trend_strength,
+            'volatility_score': volatility_score,
+            'momentum_alignment': momentum_alignment,
+            'ema_trend': ema_trend,
+            'is_uptrend': is_uptrend,
+            'is_momentum_bullish': is_momentum_bullish
+        }
+    
+    def _mask_insufficient(self, result: pd.DataFrame, insufficient: np.ndarray) -> pd.DataFrame:
+        """Apply detect_regime's RANGING/50 fallback (NaN components) to rows lacking history"""
+        if insufficient.any():
+            result.loc[insufficient, 'regime'] = MarketRegime.RANGING
+            result.loc[insufficient, 'confidence'] = 50.0
+            for col in REGIME_COMPONENTS:
+                if result[col].dtype != bool:
+                    result.loc[insufficient, col] = np.nan
+        return result
+    
+    def detect_regime_series(self, data: pd.DataFrame, indicators: Optional[IndicatorFrame] = None) -> pd.DataFrame:
+        """
+        Detect the market regime at every bar in one vectorized pass
+        
+        Row i holds what detect_regime(data.iloc[:i+1]) returns: the indicators
+        are causal, so one full-length computation serves every prefix, and the
+        scoring / classification tree runs as array operations.
+        
+        Args:
+            data: DataFrame with OHLC data
+            indicators: Optional shared IndicatorFrame for data
+            
+        Returns:
+            DataFrame indexed like data with 'regime' (MarketRegime),
+            'confidence' and the component columns; bars before enough
+            history exist are RANGING at 50% with NaN components
+        """
+        arrays = self._indicator_arrays(data, indicator_frame(data, indicators))
+        result = pd.DataFrame(self._classify_regime_arrays(**arrays), index=data.index)
+        
+        # Same fallback as detect_regime while history is too short
+        insufficient = np.arange(len(data)) < self._min_bars() - 1
+        return self._mask_insufficient(result, insufficient)
+    
+    def regime_result_at(self, regime_series: pd.DataFrame, i: int) -> RegimeResult:
+        """Rebuild the RegimeResult for bar i of a detect_regime_series frame"""
+        if i < self._min_bars() - 1:
+            return RegimeResult(regime=MarketRegime.RANGING, confidence=50.0, components={})
+        
+        return self._row_result(regime_series.iloc[i])
+    
+    def _row_result(self, row: pd.Series) -> RegimeResult:
+        return RegimeResult(
+            regime=row['regime'],
+            confidence=row['confidence'],
+            components={col: row[col] for col in REGIME_COMPONENTS}
+        )
+    
+    def detect_regime_panel(self, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                            symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Detect the current regime for many symbols at once
+        
+        Takes time-aligned (time x symbol) arrays and computes every indicator
+        for all columns together, so a whole universe costs a few array
+        operations instead of one detect_regime call per symbol. Symbols with
+        shorter history should be NaN-padded at the start.
+        
+        Args:
+            high, low, close: Arrays of shape (bars, symbols)
+            symbols: Column labels (default: 0..symbols-1)
+            
+        Returns:
+            DataFrame indexed by symbol with 'regime', 'confidence', the
+            component columns and 'bars' (history length); each row matches
+            detect_regime on that symbol's own bars
+        """
+        high, low, close = (np.asarray(values, dtype=float) for values in (high, low, close))
+        if symbols is None:
+            symbols = list(range(close.shape[1]))
+        
+        panel = {
+            name: pd.DataFrame(values, columns=symbols)
+            for name, values in (('high', high), ('low', low), ('close', close))
+        }
+        arrays = self._indicator_arrays(panel, IndicatorFrame(panel))
+        latest = {name: values[-1] if len(values) else np.full(len(symbols), np.nan)
+                  for name, values in arrays.items()}
+        
+        result = pd.DataFrame(self._classify_regime_arrays(**latest), index=pd.Index(symbols, name='symbol'))
+        
+        # History starts at each symbol's first valid close
+        has_data = ~np.isnan(close)
+        first_valid = np.where(has_data.any(axis=0), has_data.argmax(axis=0), len(close))
+        result['bars'] = len(close) - first_valid
+        
+        return self._mask_insufficient(result, result['bars'].to_numpy() < self._min_bars())
+    
+    def panel_results(self, regime_panel: pd.DataFrame) -> Dict[str, RegimeResult]:
+        """Per-symbol RegimeResult objects from a detect_regime_panel table"""
+        return {
+            symbol: (self._row_result(row) if row['bars'] >= self._min_bars()
+                     else RegimeResult(regime=MarketRegime.RANGING, confidence=50.0, components={}))
+            for symbol, row in regime_panel.iterrows()
+        }
+    
     def print_regime_analysis(self, regime_result: RegimeResult) -> None:
         """Print formatted regime analysis"""
         print(f"\n=== Market Regime Analysis ===")
@@ -305,6 +495,397 @@ class RegimeDetector:
         print(f"  Momentum Direction: {'BULLISH' if comp.get('is_momentum_bullish', False) else 'BEARISH'}")
 
 
+class _RollingMean:
+    """
+    Streaming rolling(window).mean(): NaN until the window holds `window`
+    non-NaN values. The running sum is rebuilt from the buffer once per
+    window length (and whenever a non-finite value leaves) to stop drift.
+    """
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.nan_count = 0
+        self._updates = 0
+    
+    def update(self, value: float) -> float:
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if np.isnan(old):
+                self.nan_count -= 1
+            elif np.isfinite(old):
+                self.total -= old
+            else:
+                self._updates = self.window  # force a rebuild below
+        
+        self.values.append(value)
+        if np.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+        
+        self._updates += 1
+        if self._updates >= self.window:
+            self.total = sum(v for v in self.values if not np.isnan(v))
+            self._updates = 0
+        
+        if len(self.values) < self.window or self.nan_count:
+            return np.nan
+        return self.total / self.window
+
+
+class _RollingStd:
+    """Streaming rolling(window).std() (ddof=1) via sliding Welford updates"""
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.nan_count = 0
+        self._updates = 0
+        self._rebuild()
+    
+    def _rebuild(self) -> None:
+        valid = [v for v in self.values if not np.isnan(v)]
+        self.count = len(valid)
+        self.mean = sum(valid) / self.count if valid else 0.0
+        self.m2 = sum((v - self.mean) ** 2 for v in valid)
+    
+    def _add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    def _remove(self, value: float) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (value - self.mean)
+    
+    def update(self, value: float) -> float:
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if np.isnan(old):
+                self.nan_count -= 1
+            else:
+                self._remove(old)
+        
+        self.values.append(value)
+        if np.isnan(value):
+            self.nan_count += 1
+        else:
+            self._add(value)
+        
+        self._updates += 1
+        if self._updates >= self.window:
+            self._rebuild()
+            self._updates = 0
+        
+        if len(self.values) < self.window or self.nan_count or self.window < 2:
+            return np.nan
+        return np.sqrt(max(self.m2, 0.0) / (self.window - 1))
+
+
+class _EWMean:
+    """Streaming ewm(span=span).mean(), same recurrence as pandas (adjust=True)"""
+    
+    def __init__(self, span: int):
+        com = (span - 1) / 2
+        self.decay = 1 - 1 / (1 + com)
+        self.weighted = None
+        self.old_weight = 1.0
+    
+    def update(self, value: float) -> float:
+        if self.weighted is None:
+            self.weighted = value
+        elif self.weighted == self.weighted:
+            self.old_weight *= self.decay
+            if value == value:
+                if self.weighted != value:
+                    self.weighted = (self.old_weight * self.weighted + value) / (self.old_weight + 1.0)
+                self.old_weight += 1.0
+        elif value == value:
+            self.weighted = value
+        return self.weighted
+
+
+class RegimeState:
+    """
+    Incremental RegimeDetector state, updated one closed candle at a time
+    
+    Keeps running window sums for ATR, +DM/-DM, DX, the ATR average and
+    Bollinger width, EMA accumulators and a short close buffer for momentum,
+    so each update is O(1). update() returns the RegimeResult that
+    detect_regime gives on all bars seen so far, within float tolerance.
+    
+    Usage:
+        state = RegimeState(RegimeDetector())
+        for _, bar in data.iterrows():
+            regime = state.update(bar)
+    """
+    
+    def __init__(self, detector: Optional[RegimeDetector] = None):
+        self.detector = detector or RegimeDetector()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Drop all accumulated state"""
+        detector = self.detector
+        
+        self.bar_count = 0
+        self._prev_high = np.nan
+        self._prev_low = np.nan
+        self._closes = deque(maxlen=max(detector.momentum_fast, detector.momentum_slow) + 1)
+        
+        self._atr = _RollingMean(detector.atr_period)
+        self._atr_ma = _RollingMean(20)
+        self._plus_dm = _RollingMean(detector.adx_period)
+        self._minus_dm = _RollingMean(detector.adx_period)
+        self._adx = _RollingMean(detector.adx_period)
+        self._bb_mean = _RollingMean(detector.bb_period)
+        self._bb_std = _RollingStd(detector.bb_period)
+        self._ema_fast = _EWMean(detector.ema_fast)
+        self._ema_slow = _EWMean(detector.ema_slow)
+        
+        self.last_result = None
+    
+    def _momentum(self, close: float, period: int) -> float:
+        if len(self._closes) <= period:
+            return np.nan
+        past = self._closes[-1 - period]
+        return ((close - past) / past) * 100
+    
+    def update(self, bar) -> RegimeResult:
+        """
+        Add one closed candle and return the regime as of that candle
+        
+        Args:
+            bar: Mapping with high/low/close (e.g. a DataFrame row)
+            
+        Returns:
+            RegimeResult matching detect_regime on all bars seen so far
+        """
+        detector = self.detector
+        high = np.float64(bar['high'])
+        low = np.float64(bar['low'])
+        close = np.float64(bar['close'])
+        prev_close = self._closes[-1] if self._closes else np.nan
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # True range; NaN on the first bar like the shifted-close Series version
+            true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+            atr = self._atr.update(true_range)
+            atr_ma = self._atr_ma.update(atr)
+            
+            # Directional movement with negative moves clipped to zero
+            plus_dm = high - self._prev_high
+            minus_dm = (low - self._prev_low) * -1
+            plus_dm = 0.0 if plus_dm < 0 else plus_dm
+            minus_dm = 0.0 if minus_dm < 0 else minus_dm
+            
+            plus_di = 100 * (self._plus_dm.update(plus_dm) / atr)
+            minus_di = 100 * (self._minus_dm.update(minus_dm) / atr)
+            dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            adx = self._adx.update(dx)
+            
+            # Bollinger width: (upper - lower) / sma * 100
+            sma = self._bb_mean.update(close)
+            std = self._bb_std.update(close)
+            bb_width = (((sma + std * detector.bb_std) - (sma - std * detector.bb_std)) / sma) * 100
+            
+            ema_fast = self._ema_fast.update(close)
+            ema_slow = self._ema_slow.update(close)
+            price_vs_fast = ((close - ema_fast) / ema_fast) * 100
+            price_vs_slow = ((close - ema_slow) / ema_slow) * 100
+            ema_trend = ((ema_fast - ema_slow) / ema_slow) * 100
+            
+            self._closes.append(close)
+            momentum_fast = self._momentum(close, detector.momentum_fast)
+            momentum_slow = self._momentum(close, detector.momentum_slow)
+            
+            atr_ratio = atr / atr_ma if atr_ma > 0 else 1.0
+        
+        self._prev_high = high
+        self._prev_low = low
+        self.bar_count += 1
+        
+        if self.bar_count < detector._min_bars():
+            self.last_result = detector._insufficient_data_result()
+        else:
+            self.last_result = detector._classify_regime(
+                atr_ratio, adx, bb_width, price_vs_fast, price_vs_slow,
+                ema_trend, momentum_fast, momentum_slow
+            )
+        
+        return self.last_result
+
+
+class RegimeTransition(NamedTuple):
+    """Confirmed regime change for one symbol"""
+    symbol: str
+    previous: Optional[MarketRegime]    # None for the first confirmed regime
+    regime: MarketRegime
+    confidence: float
+    bar_index: int                      # Bars observed for the symbol when confirmed
+    timestamp: object                   # Bar timestamp, if supplied
+    result: RegimeResult
+
+
+class _SymbolRegime:
+    """Per-symbol hysteresis state of a RegimeTracker"""
+    
+    def __init__(self, detector: RegimeDetector):
+        self.state = RegimeState(detector)
+        self.regime: Optional[MarketRegime] = None
+        self.candidate: Optional[MarketRegime] = None
+        self.candidate_bars = 0
+        self.dwell_bars = 0
+        self.bar_count = 0
+        self.last_timestamp = None
+        self.last_result: Optional[RegimeResult] = None
+
+
+class RegimeTracker:
+    """
+    Emits RegimeTransition events only when a symbol's regime changes
+    
+    A new regime must be detected on confirm_bars consecutive bars, and the
+    current regime must have been held for at least min_dwell_bars, before a
+    transition is emitted; the first regime detected with enough history is
+    emitted immediately (previous=None). Insufficient-data results are
+    ignored. State is kept per symbol so publishers only handle deltas.
+    
+    Usage:
+        tracker = RegimeTracker(RegimeDetector(), confirm_bars=3, min_dwell_bars=5)
+        transition = tracker.update('BTCUSDT', bar, timestamp)
+        if transition:
+            publish(transition)
+    """
+    
+    def __init__(self, detector: Optional[RegimeDetector] = None,
+                 confirm_bars: int = 3, min_dwell_bars: int = 5):
+        if confirm_bars < 1:
+            raise ValueError(f"confirm_bars must be >= 1, got {confirm_bars}")
+        if min_dwell_bars < 0:
+            raise ValueError(f"min_dwell_bars must be >= 0, got {min_dwell_bars}")
+        
+        self.detector = detector or RegimeDetector()
+        self.confirm_bars = confirm_bars
+        self.min_dwell_bars = min_dwell_bars
+        self._symbols: Dict[str, _SymbolRegime] = {}
+    
+    def _symbol_state(self, symbol: str) -> _SymbolRegime:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = _SymbolRegime(self.detector)
+        return state
+    
+    def update(self, symbol: str, bar, timestamp=None) -> Optional[RegimeTransition]:
+        """
+        Add one closed candle for symbol via its incremental RegimeState
+        
+        Args:
+            symbol: Symbol key
+            bar: Mapping with high/low/close (e.g. a DataFrame row)
+            timestamp: Optional bar timestamp carried on the event
+            
+        Returns:
+            RegimeTransition if the bar confirms a regime change, else None
+        """
+        state = self._symbol_state(symbol)
+        return self._advance(symbol, state, state.state.update(bar), timestamp)
+    
+    def observe(self, symbol: str, result: RegimeResult, timestamp=None) -> Optional[RegimeTransition]:
+        """
+        Feed an already computed RegimeResult (e.g. from detect_regime)
+        
+        When timestamp is given, repeated observations of the same bar do not
+        count towards confirmation or dwell time; the latest one is kept.
+        
+        Returns:
+            RegimeTransition if the result confirms a regime change, else None
+        """
+        state = self._symbol_state(symbol)
+        if timestamp is not None and timestamp == state.last_timestamp:
+            state.last_result = result
+            return None
+        
+        return self._advance(symbol, state, result, timestamp)
+    
+    def _advance(self, symbol: str, state: _SymbolRegime, result: RegimeResult,
+                 timestamp) -> Optional[RegimeTransition]:
+        state.bar_count += 1
+        state.last_timestamp = timestamp
+        state.last_result = result
+        
+        # Not enough history for a meaningful regime
+        if not result.components:
+            return None
+        
+        if state.regime is None:
+            return self._confirm(symbol, state, result, timestamp)
+        
+        state.dwell_bars += 1
+        
+        if result.regime == state.regime:
+            state.candidate = None
+            state.candidate_bars = 0
+            return None
+        
+        if result.regime == state.candidate:
+            state.candidate_bars += 1
+        else:
+            state.candidate = result.regime
+            state.candidate_bars = 1
+        
+        if state.candidate_bars >= self.confirm_bars and state.dwell_bars >= self.min_dwell_bars:
+            return self._confirm(symbol, state, result, timestamp)
+        
+        return None
+    
+    def _confirm(self, symbol: str, state: _SymbolRegime, result: RegimeResult,
+                 timestamp) -> RegimeTransition:
+        transition = RegimeTransition(
+            symbol=symbol,
+            previous=state.regime,
+            regime=result.regime,
+            confidence=result.confidence,
+            bar_index=state.bar_count,
+            timestamp=timestamp,
+            result=result
+        )
+        
+        state.regime = result.regime
+        state.candidate = None
+        state.candidate_bars = 0
+        state.dwell_bars = 0
+        
+        previous = transition.previous.value if transition.previous else "NONE"
+        logger.info(f"Regime transition {symbol}: {previous} -> {result.regime.value} ({result.confidence:.1f}%)")
+        return transition
+    
+    def current(self, symbol: str) -> Optional[MarketRegime]:
+        """Confirmed regime for symbol (None before the first confirmation)"""
+        state = self._symbols.get(symbol)
+        return state.regime if state else None
+    
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+    
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Drop the state of one symbol, or of every symbol"""
+        if symbol is None:
+            self._symbols.clear()
+        else:
+            self._symbols.pop(symbol, None)
+
+
 if __name__ == "__main__":
     # Example usage
     pass
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Rolling highest/lowest (Pine ta.highest / ta.lowest)
+Vectorized for whole series and deque-based for bar-by-bar updates
+"""
+
+import numpy as np
+from collections import deque
+from typing import Tuple
+
+
+def _rolling_extreme(values: np.ndarray, window: int, reduce: np.ufunc) -> np.ndarray:
+    """
+    van Herk / Gil-Werman rolling reduction with np.fmax or np.fmin
+
+    The series is padded with window - 1 NaNs in front, split into blocks of
+    `window`, and every window is covered by one block suffix and the next
+    block prefix. fmax/fmin skip NaN, so the first bars see partial windows
+    and an all-NaN window stays NaN, like rolling(window, min_periods=1).
+    """
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+
+    values = np.asarray(values, dtype=float)
+    bars = len(values)
+    if bars == 0:
+        return np.empty(0)
+
+    padded_len = -(-(bars + window - 1) // window) * window
+    padded = np.full(padded_len, np.nan)
+    padded[window - 1:window - 1 + bars] = values
+    blocks = padded.reshape(-1, window)
+
+    prefix = reduce.accumulate(blocks, axis=1).ravel()
+    suffix = reduce.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    return reduce(suffix[:bars], prefix[window - 1:window - 1 + bars])
+
+
+def rolling_highest(values: np.ndarray, window: int) -> np.ndarray:
+    """ta.highest(values, window) for every bar, partial windows at the start"""
+    return _rolling_extreme(values, window, np.fmax)
+
+
+def rolling_lowest(values: np.ndarray, window: int) -> np.ndarray:
+    """ta.lowest(values, window) for every bar, partial windows at the start"""
+    return _rolling_extreme(values, window, np.fmin)
+
+
+def channel_width_series(high: np.ndarray, low: np.ndarray, lookback: int, width_pct: float) -> np.ndarray:
+    """
+    PulseWave channel width for every bar
+    Matches Pine Script: (ta.highest(cwLookback) - ta.lowest(cwLookback)) * ChannelW / 100
+    """
+    return (rolling_highest(high, lookback) - rolling_lowest(low, lookback)) * width_pct / 100
+
+
+class RollingExtremes:
+    """
+    Streaming ta.highest/ta.lowest over the last `window` bars
+
+    Monotonic deques of (bar_index, value) give O(1) amortized updates.
+    NaN never becomes the extreme, matching rolling_highest/rolling_lowest.
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all bars"""
+        self.bar_count = 0
+        self._highs = deque()
+        self._lows = deque()
+
+    def update(self, high: float, low: float) -> Tuple[float, float]:
+        """
+        Push one bar
+
+        Returns:
+            Tuple of (highest, lowest) over the window ending at this bar
+        """
+        index = self.bar_count
+        expired = index - self.window
+
+        if not np.isnan(high):
+            while self._highs and self._highs[-1][1] <= high:
+                self._highs.pop()
+            self._highs.append((index, high))
+        if not np.isnan(low):
+            while self._lows and self._lows[-1][1] >= low:
+                self._lows.pop()
+            self._lows.append((index, low))
+
+        while self._highs and self._highs[0][0] <= expired:
+            self._highs.popleft()
+        while self._lows and self._lows[0][0] <= expired:
+            self._lows.popleft()
+
+        self.bar_count += 1
+        return self.highest, self.lowest
+
+    @property
+    def highest(self) -> float:
+        return self._highs[0][1] if self._highs else np.nan
+
+    @property
+    def lowest(self) -> float:
+        return self._lows[0][1] if self._lows else np.nan
+
+
+if __name__ == "__main__":
+    # Example usage
+    pass
@@ -0,0 +1,108 @@
+"""
+Shared-memory transport for OHLCV frames
+Lets process pools read price columns in place instead of unpickling DataFrames
+"""
+
+import pandas as pd
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, Hashable, NamedTuple, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class FrameSpec(NamedTuple):
+    """Location of one frame's columns inside a shared block"""
+    shm_name: str
+    offset: int                 # Byte offset of the first column
+    length: int                 # Number of bars
+    columns: Tuple[str, ...]
+
+
+class SharedFrames:
+    """
+    Copies the numeric columns of many DataFrames into one shared-memory block
+
+    Each frame is stored column-major as float64 and described by a small
+    FrameSpec that can be sent to worker processes, which rebuild the frame
+    with attach_frame(). The index is not shared; SR and indicator code
+    only reads columns by position.
+
+    Use as a context manager so the block is unlinked when the pool is done:
+
+        with SharedFrames(frames) as shared:
+            specs = shared.specs
+    """
+
+    def __init__(self, frames: Dict[Hashable, pd.DataFrame], columns: Tuple[str, ...] = OHLCV_COLUMNS):
+        layout = {}
+        offset = 0
+
+        for key, data in frames.items():
+            frame_columns = tuple(col for col in columns if col in data.columns)
+            layout[key] = (offset, len(data), frame_columns)
+            offset += len(frame_columns) * len(data) * 8
+
+        # SharedMemory rejects size 0
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.specs: Dict[Hashable, FrameSpec] = {}
+
+        for key, (offset, length, frame_columns) in layout.items():
+            block = np.ndarray((len(frame_columns), length), dtype=np.float64,
+                               buffer=self._shm.buf, offset=offset)
+            for k, col in enumerate(frame_columns):
+                block[k] = frames[key][col].to_numpy(dtype=np.float64)
+            self.specs[key] = FrameSpec(self._shm.name, offset, length, frame_columns)
+
+        logger.debug(f"Shared {len(self.specs)} frames in {self._shm.size} bytes ({self._shm.name})")
+
+    def close(self) -> None:
+        """Release and unlink the shared block"""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> 'SharedFrames':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Blocks attached by this (worker) process, kept open for its lifetime
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def attach_frame(spec: FrameSpec, index: Optional[pd.Index] = None) -> pd.DataFrame:
+    """
+    Rebuild a DataFrame view over a shared block described by spec
+
+    Args:
+        spec: FrameSpec produced by SharedFrames
+        index: Optional index to attach (defaults to a RangeIndex)
+
+    Returns:
+        DataFrame whose columns are zero-copy views of the shared block
+    """
+    shm = _attached.get(spec.shm_name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=spec.shm_name)
+        _attached[spec.shm_name] = shm
+
+    block = np.ndarray((len(spec.columns), spec.length), dtype=np.float64,
+                       buffer=shm.buf, offset=spec.offset)
+
+    return pd.DataFrame(
+        {col: block[k] for k, col in enumerate(spec.columns)},
+        index=index,
+        copy=False
+    )
+
+
+if __name__ == "__main__":
+    # Example usage
+    pass
@@ -6,13 +6,17 @@ to generate LONG/SHORT/NEUTRAL signals with entry, stop loss, take profit levels
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, NamedTuple
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, NamedTuple, Union
 from enum import Enum
 import logging
 
-from sr_engine import SupportResistanceEngine, SRResult, SRLevel
+from sr_engine import SupportResistanceEngine, SRResult, SRLevel, SRHistory
 from regime_detector import RegimeDetector, RegimeResult, MarketRegime
 from confluence_scorer import ConfluenceScorer, ConfluenceResult, SignalDirection
+from indicators import IndicatorFrame, indicator_frame
+from reasoning import Reason, Reasoning
+from timeframes import ResampleCache, bar_minutes, timeframe_minutes
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +37,25 @@ class TradingSignal(NamedTuple):
     confidence: float  # 0-100
     confluence_score: float  # 0-100
     risk_reward_ratio: float
-    reasoning: List[str]
+    reasoning: Reasoning    # Rendered to text on access
     sr_context: Dict[str, SRResult]
     regime_context: RegimeResult
     confluence_context: ConfluenceResult
 
 
+class SignalSeries(NamedTuple):
+    """Per-bar inputs of generate_signal, precomputed once for a whole DataFrame"""
+    data: pd.DataFrame
+    close: np.ndarray
+    sr_history: SRHistory
+    regime_series: pd.DataFrame
+    totals: Dict[SignalDirection, np.ndarray]                 # Confluence total per direction
+    factor_scores: Dict[SignalDirection, Dict[str, np.ndarray]]
+    factor_labels: Dict[str, tuple]                           # name -> (label, weighted max)
+    atr: np.ndarray
+    indicators: IndicatorFrame
+
+
 class SignalGenerator:
     """
     Generates trading signals by combining:
@@ -53,6 +70,10 @@ class SignalGenerator:
     - Calculate confluence score
     - Determine entry, stop loss, take profit levels
     - Apply minimum confidence and risk/reward filters
+    
+    With early_exit, confluence scoring of an opportunity stops as soon as it
+    can no longer reach min_confluence_score or beat the best opportunity so
+    far; the chosen signal is the same as with full scoring.
     """
     
     def __init__(
@@ -63,7 +84,8 @@ class SignalGenerator:
         min_confluence_score: float = 45.0,
         min_risk_reward: float = 1.5,
         max_stop_loss_pct: float = 3.0,
-        position_size_method: str = "fixed"  # "fixed", "percent", "atr"
+        position_size_method: str = "fixed",  # "fixed", "percent", "atr"
+        early_exit: bool = True
     ):
         self.sr_engine = sr_engine
         self.regime_detector = regime_detector
@@ -72,69 +94,67 @@ class SignalGenerator:
         self.min_risk_reward = min_risk_reward
         self.max_stop_loss_pct = max_stop_loss_pct
         self.position_size_method = position_size_method
+        self.early_exit = early_exit
+        self._resample_cache = ResampleCache()
         
-    def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_atr(self, data: pd.DataFrame, period: int = 14,
+                       indicators: Optional[IndicatorFrame] = None) -> float:
         """Calculate current Average True Range"""
-        high = data['high']
-        low = data['low']
-        close = data['close']
-        
-        high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean().iloc[-1]
-        
-        return atr
+        return indicator_frame(data, indicators).atr(period).iloc[-1]
     
     def _identify_signal_opportunities(self, data: pd.DataFrame, sr_results: Dict[str, SRResult]) -> List[SignalDirection]:
         """
         Identify potential signal opportunities based on S/R level proximity and price action
         """
+        return self._opportunities_at(data['close'].iloc[-1], data['close'].iloc[-2], sr_results)
+    
+    def _opportunities_at(self, current_price: float, previous_close: float,
+                          sr_results: Dict[str, SRResult]) -> List[SignalDirection]:
+        """_identify_signal_opportunities for the last two closes"""
         opportunities = []
-        current_price = data['close'].iloc[-1]
-        previous_close = data['close'].iloc[-2]
         
         # Check all timeframes for S/R level interactions
         for timeframe, sr_result in sr_results.items():
-            for level in sr_result.levels:
+            # Only consider levels within reasonable distance (3%)
+            for level in sr_result.level_index.within_pct(current_price, 3.0):
                 distance_pct = abs(level.mid - current_price) / current_price * 100
                 
-                # Only consider levels within reasonable distance (3%)
-                if distance_pct <= 3.0:
-                    
-                    # Long signal opportunity: bouncing off support
-                    if (level.mid < current_price and not level.is_resistance and 
-                        previous_close <= level.mid and current_price > level.mid):
-                        opportunities.append(SignalDirection.LONG)
-                        logger.info(f"Long opportunity: bouncing off support at {level.mid}")
-                    
-                    # Short signal opportunity: rejecting at resistance
-                    elif (level.mid > current_price and level.is_resistance and 
-                          previous_close >= level.mid and current_price < level.mid):
-                        opportunities.append(SignalDirection.SHORT)
-                        logger.info(f"Short opportunity: rejecting at resistance at {level.mid}")
-                    
-                    # Breakout opportunities
-                    elif distance_pct <= 1.0:  # Very close to level
-                        if level.is_resistance:
-                            opportunities.append(SignalDirection.LONG)  # Potential breakout up
-                        else:
-                            opportunities.append(SignalDirection.SHORT)  # Potential breakdown
+                # Long signal opportunity: bouncing off support
+                if (level.mid < current_price and not level.is_resistance and 
+                    previous_close <= level.mid and current_price > level.mid):
+                    opportunities.append(SignalDirection.LONG)
+                    logger.info(f"Long opportunity: bouncing off support at {level.mid}")
+                
+                # Short signal opportunity: rejecting at resistance
+                elif (level.mid > current_price and level.is_resistance and 
+                      previous_close >= level.mid and current_price < level.mid):
+                    opportunities.append(SignalDirection.SHORT)
+                    logger.info(f"Short opportunity: rejecting at resistance at {level.mid}")
+                
+                # Breakout opportunities
+                elif distance_pct <= 1.0:  # Very close to level
+                    if level.is_resistance:
+                        opportunities.append(SignalDirection.LONG)  # Potential breakout up
+                    else:
+                        opportunities.append(SignalDirection.SHORT)  # Potential breakdown
         
         # Remove duplicates and return
         return list(set(opportunities))
     
-    def _calculate_stop_loss(self, data: pd.DataFrame, signal_direction: SignalDirection,
-                           entry_price: float, sr_results: Dict[str, SRResult]) -> float:
+    def _calculate_stop_loss(self, data: Optional[pd.DataFrame], signal_direction: SignalDirection,
+                           entry_price: float, sr_results: Dict[str, SRResult],
+                           indicators: Optional[IndicatorFrame] = None,
+                           current_atr: Optional[float] = None) -> float:
         """
         Calculate stop loss level based on:
         1. Nearby S/R levels
         2. ATR-based risk
         3. Maximum loss percentage
+        
+        current_atr, when given, replaces the ATR computed from data.
         """
-        current_atr = self._calculate_atr(data)
+        if current_atr is None:
+            current_atr = self._calculate_atr(data, indicators=indicators)
         max_stop_distance = entry_price * self.max_stop_loss_pct / 100
         
         # Find relevant S/R levels for stop placement
@@ -148,8 +168,8 @@ class SignalGenerator:
             stop_candidates.append(entry_price - current_atr * 1.5)
             
             # S/R level based stop
-            for level in primary_sr.levels:
-                if level.mid < entry_price and not level.is_resistance:
+            for level in primary_sr.level_index.below(entry_price):
+                if not level.is_resistance:
                     # Place stop slightly below support level
                     stop_candidates.append(level.low - (level.high - level.low) * 0.1)
             
@@ -168,8 +188,8 @@ class SignalGenerator:
             stop_candidates.append(entry_price + current_atr * 1.5)
             
             # S/R level based stop
-            for level in primary_sr.levels:
-                if level.mid > entry_price and level.is_resistance:
+            for level in primary_sr.level_index.above(entry_price):
+                if level.is_resistance:
                     # Place stop slightly above resistance level
                     stop_candidates.append(level.high + (level.high - level.low) * 0.1)
             
@@ -194,36 +214,25 @@ class SignalGenerator:
         min_profit_target = risk * self.min_risk_reward
         
         # Find S/R levels that could act as profit targets
-        primary_sr = list(sr_results.values())[0]
-        target_candidates = []
+        index = list(sr_results.values())[0].level_index
         
         if signal_direction == SignalDirection.LONG:
-            # Look for resistance levels above entry as targets
-            for level in primary_sr.levels:
-                if level.mid > entry_price and level.is_resistance:
-                    target_candidates.append(level.mid)
-            
             # Minimum target based on risk/reward
             min_target = entry_price + min_profit_target
-            target_candidates.append(min_target)
             
-            # Choose closest reasonable target that meets minimum R:R
-            valid_targets = [t for t in target_candidates if t >= min_target]
-            take_profit = min(valid_targets) if valid_targets else min_target
+            # Choose closest resistance above entry that meets minimum R:R
+            targets = [lvl.mid for lvl in index.beyond(min_target, above=True)
+                       if lvl.mid > entry_price and lvl.is_resistance]
+            take_profit = min(targets[:1] + [min_target])
             
         else:  # SHORT
-            # Look for support levels below entry as targets
-            for level in primary_sr.levels:
-                if level.mid < entry_price and not level.is_resistance:
-                    target_candidates.append(level.mid)
-            
             # Minimum target based on risk/reward
             min_target = entry_price - min_profit_target
-            target_candidates.append(min_target)
             
-            # Choose closest reasonable target that meets minimum R:R
-            valid_targets = [t for t in target_candidates if t <= min_target]
-            take_profit = max(valid_targets) if valid_targets else min_target
+            # Choose closest support below entry that meets minimum R:R
+            targets = [lvl.mid for lvl in index.beyond(min_target, above=False)
+                       if lvl.mid < entry_price and not lvl.is_resistance]
+            take_profit = max(targets[:1] + [min_target])
         
         return take_profit
     
@@ -247,34 +256,95 @@ class SignalGenerator:
         
         return min(overall_confidence, 95.0)  # Cap at 95%
     
-    def generate_signal(self, data: pd.DataFrame, 
-                       timeframes: List[str] = None) -> TradingSignal:
+    def _timeframe_frames(self, data: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                          timeframes: Optional[List[str]]) -> Dict[str, pd.DataFrame]:
+        """
+        Bars for every analysed timeframe, primary first
+        
+        A {tf: DataFrame} mapping is used as given. For a single DataFrame,
+        timeframes[0] labels its own bars and every later timeframe longer than
+        the bar spacing is resampled from it (cached); other labels reuse the
+        primary bars.
+        """
+        if isinstance(data, dict):
+            timeframes = timeframes or list(data)
+            missing = [tf for tf in timeframes if tf not in data]
+            if missing:
+                raise ValueError(f"No data for timeframes: {missing}")
+            return {tf: data[tf] for tf in timeframes}
+        
+        if timeframes is None:
+            timeframes = ["current"]
+        
+        primary_minutes = bar_minutes(data)
+        frames = {}
+        for k, tf in enumerate(timeframes):
+            minutes = timeframe_minutes(tf)
+            if k > 0 and minutes is not None and primary_minutes and minutes > primary_minutes:
+                frames[tf] = self._resample_cache.resample(data, tf)
+            else:
+                frames[tf] = data
+        return frames
+    
+    def generate_signal(self, data: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                       timeframes: List[str] = None,
+                       indicators: Optional[IndicatorFrame] = None) -> TradingSignal:
         """
         Generate trading signal for given data
         
         Args:
-            data: OHLCV DataFrame
-            timeframes: List of timeframe identifiers for multi-TF analysis
+            data: OHLCV DataFrame of the primary timeframe, or a
+                {timeframe: DataFrame} mapping (primary first)
+            timeframes: List of timeframe identifiers for multi-TF analysis;
+                higher timeframes are resampled from a single DataFrame
+            indicators: Optional shared IndicatorFrame for the primary data
             
         Returns:
             TradingSignal with complete analysis
         """
-        if timeframes is None:
-            timeframes = ["current"]
+        frames = self._timeframe_frames(data, timeframes)
+        data = next(iter(frames.values()))
         
         current_price = data['close'].iloc[-1]
+        indicators = indicator_frame(data, indicators)
         
-        # Step 1: Calculate S/R levels (assuming single timeframe for now)
+        # Step 1: Calculate S/R levels once per distinct frame
         sr_results = {}
-        for tf in timeframes:
-            sr_results[tf] = self.sr_engine.calculate_sr_levels(data, tf)
+        computed = {}
+        for tf, frame in frames.items():
+            if id(frame) in computed:
+                sr_results[tf] = replace(computed[id(frame)], timeframe=tf)
+            else:
+                sr_results[tf] = computed[id(frame)] = self.sr_engine.calculate_sr_levels(frame, tf)
         
         # Step 2: Detect market regime
-        regime_result = self.regime_detector.detect_regime(data)
+        regime_result = self.regime_detector.detect_regime(data, indicators)
         
         # Step 3: Identify signal opportunities
         opportunities = self._identify_signal_opportunities(data, sr_results)
         
+        def score(opportunity: SignalDirection, min_score: Optional[float]) -> Optional[ConfluenceResult]:
+            return self.confluence_scorer.calculate_confluence_score(
+                data, sr_results, regime_result, opportunity, indicators, min_score
+            )
+        
+        return self._build_signal(
+            current_price, sr_results, regime_result, opportunities, score,
+            lambda: self._calculate_atr(data, indicators=indicators)
+        )
+    
+    def _build_signal(self, current_price: float, sr_results: Dict[str, SRResult],
+                      regime_result: RegimeResult, opportunities: List[SignalDirection],
+                      score: Callable[[SignalDirection, Optional[float]], Optional[ConfluenceResult]],
+                      current_atr: Callable[[], float]) -> TradingSignal:
+        """
+        Steps 4-8 of generate_signal: pick the best opportunity and build the trade
+        
+        Args:
+            score: Returns the ConfluenceResult of an opportunity (None if it
+                provably cannot reach the given minimum score)
+            current_atr: Returns the ATR at the current bar for stop placement
+        """
         if not opportunities:
             # No clear opportunities - return neutral signal
             return TradingSignal(
@@ -285,7 +355,7 @@ class SignalGenerator:
                 confidence=0.0,
                 confluence_score=0.0,
                 risk_reward_ratio=0.0,
-                reasoning=["No clear S/R level interaction detected"],
+                reasoning=Reasoning(["No clear S/R level interaction detected"]),
                 sr_context=sr_results,
                 regime_context=regime_result,
                 confluence_context=None
@@ -295,12 +365,17 @@ class SignalGenerator:
         best_signal = None
         best_confluence = None
         best_score = 0.0
+        pruned = False
         
         for opportunity in opportunities:
-            # Calculate confluence score for this direction
-            confluence_result = self.confluence_scorer.calculate_confluence_score(
-                data, sr_results, regime_result, opportunity
-            )
+            # Calculate confluence score for this direction; with early exit the
+            # scorer gives up once neither the minimum nor the best so far is reachable
+            min_score = max(self.min_confluence_score, best_score) if self.early_exit else None
+            confluence_result = score(opportunity, min_score)
+            
+            if confluence_result is None:
+                pruned = True
+                continue
             
             if confluence_result.total_score > best_score:
                 best_score = confluence_result.total_score
@@ -309,6 +384,11 @@ class SignalGenerator:
         
         # Step 5: Check if signal meets minimum requirements
         if best_score < self.min_confluence_score:
+            if pruned and best_confluence is None:
+                reasoning = Reasoning([Reason("Confluence score cannot reach minimum {}", (self.min_confluence_score,))])
+            else:
+                reasoning = Reasoning([Reason("Confluence score {:.1f} below minimum {}",
+                                              (best_score, self.min_confluence_score))])
             return TradingSignal(
                 signal=Signal.NEUTRAL,
                 entry_price=current_price,
@@ -317,7 +397,7 @@ class SignalGenerator:
                 confidence=best_score,
                 confluence_score=best_score,
                 risk_reward_ratio=0.0,
-                reasoning=[f"Confluence score {best_score:.1f} below minimum {self.min_confluence_score}"],
+                reasoning=reasoning,
                 sr_context=sr_results,
                 regime_context=regime_result,
                 confluence_context=best_confluence
@@ -325,7 +405,7 @@ class SignalGenerator:
         
         # Step 6: Calculate entry, stop loss, and take profit
         entry_price = current_price  # Market entry for now
-        stop_loss = self._calculate_stop_loss(data, best_signal, entry_price, sr_results)
+        stop_loss = self._calculate_stop_loss(None, best_signal, entry_price, sr_results, current_atr=current_atr())
         take_profit = self._calculate_take_profit(best_signal, entry_price, stop_loss, sr_results)
         
         # Calculate risk/reward ratio
@@ -343,7 +423,7 @@ class SignalGenerator:
                 confidence=best_score * 0.5,  # Reduce confidence
                 confluence_score=best_score,
                 risk_reward_ratio=risk_reward_ratio,
-                reasoning=[f"Risk/reward {risk_reward_ratio:.2f} below minimum {self.min_risk_reward}"],
+                reasoning=Reasoning([Reason("Risk/reward {:.2f} below minimum {}", (risk_reward_ratio, self.min_risk_reward))]),
                 sr_context=sr_results,
                 regime_context=regime_result,
                 confluence_context=best_confluence
@@ -353,13 +433,13 @@ class SignalGenerator:
         confidence = self._calculate_confidence(best_confluence, regime_result)
         
         # Step 8: Build reasoning
-        reasoning = [
-            f"Signal direction: {best_signal.value}",
-            f"Confluence score: {best_score:.1f}/100",
-            f"Risk/reward ratio: {risk_reward_ratio:.2f}",
-            f"Regime: {regime_result.regime.value} ({regime_result.confidence:.1f}%)"
-        ]
-        reasoning.extend(best_confluence.reasoning[:3])  # Top 3 confluence factors
+        reasoning = Reasoning([
+            Reason("Signal direction: {}", (best_signal.value,)),
+            Reason("Confluence score: {:.1f}/100", (best_score,)),
+            Reason("Risk/reward ratio: {:.2f}", (risk_reward_ratio,)),
+            Reason("Regime: {} ({:.1f}%)", (regime_result.regime.value, regime_result.confidence))
+        ])
+        reasoning += best_confluence.reasoning[:3]  # Top 3 confluence factors
         
         return TradingSignal(
             signal=Signal.LONG if best_signal == SignalDirection.LONG else Signal.SHORT,
@@ -375,6 +455,72 @@ class SignalGenerator:
             confluence_context=best_confluence
         )
     
+    def precompute(self, data: pd.DataFrame, indicators: Optional[IndicatorFrame] = None) -> SignalSeries:
+        """
+        Compute the S/R history, regime series, confluence scores and ATR of
+        every bar in one pass, for signal_at()
+        
+        Args:
+            data: OHLCV DataFrame (single timeframe)
+            indicators: Optional shared IndicatorFrame for data
+            
+        Returns:
+            SignalSeries for data
+        """
+        indicators = indicator_frame(data, indicators)
+        sr_history = self.sr_engine.calculate_sr_history(data)
+        regime_series = self.regime_detector.detect_regime_series(data, indicators)
+        scores = self.confluence_scorer.score_series(data, sr_history, regime_series, indicators)
+        factors = self.confluence_scorer.enabled_factors
+        
+        totals = {}
+        factor_scores = {}
+        for direction in (SignalDirection.LONG, SignalDirection.SHORT):
+            prefix = direction.value.lower()
+            totals[direction] = scores[f'{prefix}_total'].to_numpy()
+            factor_scores[direction] = {
+                factor.name: scores[f'{prefix}_{factor.name}'].to_numpy() for factor in factors
+            }
+        
+        return SignalSeries(
+            data=data,
+            close=data['close'].to_numpy(dtype=float),
+            sr_history=sr_history,
+            regime_series=regime_series,
+            totals=totals,
+            factor_scores=factor_scores,
+            factor_labels={factor.name: (factor.label, factor.weighted_max) for factor in factors},
+            atr=indicators.atr(14).to_numpy(dtype=float),
+            indicators=indicators
+        )
+    
+    def signal_at(self, series: SignalSeries, i: int) -> TradingSignal:
+        """
+        The signal generate_signal(data.iloc[:i+1]) gives, read from a SignalSeries
+        
+        Direction, prices, scores and confidence are identical; the confluence
+        reasoning lists factor points without the per-factor detail text.
+        """
+        if i < 1:
+            raise IndexError("generate_signal needs at least two bars")
+        
+        close = series.close
+        sr_result = series.sr_history.result_at(i)
+        sr_results = {sr_result.timeframe: sr_result}
+        regime_result = self.regime_detector.regime_result_at(series.regime_series, i)
+        opportunities = self._opportunities_at(close[i], close[i - 1], sr_results)
+        
+        def score(opportunity: SignalDirection, min_score: Optional[float]) -> ConfluenceResult:
+            breakdown = {name: values[i] for name, values in series.factor_scores[opportunity].items()}
+            reasoning = Reasoning(
+                Reason("{} ({:.1f}/{:g})", (label, breakdown[name], weighted_max))
+                for name, (label, weighted_max) in series.factor_labels.items()
+            )
+            return ConfluenceResult(series.totals[opportunity][i], opportunity, breakdown, reasoning)
+        
+        return self._build_signal(close[i], sr_results, regime_result, opportunities, score,
+                                  lambda: series.atr[i])
+    
     def print_signal_analysis(self, signal: TradingSignal) -> None:
         """Print comprehensive signal analysis"""
         print(f"\n{'='*50}")
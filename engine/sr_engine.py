@@ -5,9 +5,18 @@ Replicates the exact pivot-based S/R clustering algorithm from Pine Script
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, NamedTuple
+from typing import Dict, List, Tuple, Optional, NamedTuple, Union
 import logging
-from dataclasses import dataclass
+from itertools import product
+from bisect import bisect_left, bisect_right, insort
+from collections import deque, OrderedDict
+import hashlib
+from dataclasses import dataclass, field, replace
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from shared_data import SharedFrames, FrameSpec, attach_frame
+from rolling_extremes import RollingExtremes, channel_width_series
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,6 +34,88 @@ class SRLevel:
     distance_pct: float = 0.0
 
 
+class SRLevelIndex:
+    """
+    Price-sorted view over a list of SRLevels for bisect-based lookups
+    
+    Levels keep their list position as tie-breaker, so every query picks the
+    same level a linear scan of SRResult.levels would. NaN mids never compare
+    true against a price and are left out.
+    """
+    
+    def __init__(self, levels: List[SRLevel]):
+        self.levels = levels
+        self._order = sorted(
+            (pos for pos, level in enumerate(levels) if level.mid == level.mid),
+            key=lambda pos: levels[pos].mid
+        )
+        self._mids = [float(levels[pos].mid) for pos in self._order]
+    
+    def _nearest_first(self, positions: List[int], price: float) -> List[SRLevel]:
+        ranked = sorted(positions, key=lambda pos: (abs(self.levels[pos].mid - price), pos))
+        return [self.levels[pos] for pos in ranked]
+    
+    def below(self, price: float) -> List[SRLevel]:
+        """Levels with mid < price, nearest first"""
+        return self._nearest_first(self._order[:bisect_left(self._mids, price)], price)
+    
+    def above(self, price: float) -> List[SRLevel]:
+        """Levels with mid > price, nearest first"""
+        return self._nearest_first(self._order[bisect_right(self._mids, price):], price)
+    
+    def nearest_below(self, price: float) -> Optional[SRLevel]:
+        """Level with the highest mid < price (first in list order on equal mids)"""
+        k = bisect_left(self._mids, price)
+        if k == 0:
+            return None
+        return self.levels[self._order[bisect_left(self._mids, self._mids[k - 1])]]
+    
+    def nearest_above(self, price: float) -> Optional[SRLevel]:
+        """Level with the lowest mid > price (first in list order on equal mids)"""
+        k = bisect_right(self._mids, price)
+        if k == len(self._mids):
+            return None
+        return self.levels[self._order[k]]
+    
+    def within_pct(self, price: float, max_distance_pct: float, side: Optional[str] = None) -> List[SRLevel]:
+        """
+        Levels whose distance from price is <= max_distance_pct, in list order
+        
+        Args:
+            price: Reference price
+            max_distance_pct: Distance limit as a percentage of price
+            side: 'below' (mid <= price), 'above' (mid >= price) or None for both
+        """
+        def in_range(k):
+            return abs(self._mids[k] - price) / price * 100 <= max_distance_pct
+        
+        positions = []
+        
+        if side in (None, 'below'):
+            k = bisect_right(self._mids, price) - 1
+            while k >= 0 and in_range(k):
+                positions.append(self._order[k])
+                k -= 1
+        
+        if side in (None, 'above'):
+            k = bisect_right(self._mids, price) if side is None else bisect_left(self._mids, price)
+            while k < len(self._mids) and in_range(k):
+                positions.append(self._order[k])
+                k += 1
+        
+        return [self.levels[pos] for pos in sorted(positions)]
+    
+    def beyond(self, price: float, above: bool = True) -> List[SRLevel]:
+        """Levels at or beyond price (mid >= price, or mid <= price when above=False), nearest first"""
+        if price != price:
+            return []
+        if above:
+            positions = self._order[bisect_left(self._mids, price):]
+        else:
+            positions = self._order[:bisect_right(self._mids, price)]
+        return self._nearest_first(positions, price)
+
+
 @dataclass
 class SRResult:
     """Contains all S/R levels for a timeframe"""
@@ -33,6 +124,296 @@ class SRResult:
     current_price: float
     channel_width: float
     pivot_count: int
+    _level_index: Optional[SRLevelIndex] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def level_index(self) -> SRLevelIndex:
+        """Price-sorted index over levels, built on first use"""
+        if self._level_index is None or self._level_index.levels is not self.levels:
+            self._level_index = SRLevelIndex(self.levels)
+        return self._level_index
+
+
+# One row per S/R level, same fields and order as SRLevel
+SR_LEVEL_DTYPE = np.dtype([
+    ('mid', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('strength', 'i8'),
+    ('is_resistance', '?'),
+    ('distance_pct', 'f8'),
+])
+
+
+class SRResultArray:
+    """
+    Columnar SRResult: all levels of a timeframe in one structured array
+
+    Rows use SR_LEVEL_DTYPE and keep SRResult.levels order (strength
+    descending). Use to_result() where the dataclass form is needed.
+    """
+    __slots__ = ('levels', 'timeframe', 'current_price', 'channel_width', 'pivot_count')
+
+    def __init__(self, levels: np.ndarray, timeframe: str, current_price: float,
+                 channel_width: float, pivot_count: int):
+        self.levels = levels
+        self.timeframe = timeframe
+        self.current_price = current_price
+        self.channel_width = channel_width
+        self.pivot_count = pivot_count
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def __repr__(self) -> str:
+        return (f"SRResultArray(timeframe={self.timeframe!r}, levels={len(self.levels)}, "
+                f"current_price={self.current_price}, channel_width={self.channel_width}, "
+                f"pivot_count={self.pivot_count})")
+
+    @classmethod
+    def from_clusters(cls, clusters: List[Tuple[float, float, int]], timeframe: str,
+                      current_price: float, channel_width: float, pivot_count: int) -> 'SRResultArray':
+        """Build from (high, low, strength) clusters, same math as SRResult levels"""
+        levels = np.empty(len(clusters), dtype=SR_LEVEL_DTYPE)
+
+        if clusters:
+            highs, lows, strengths = zip(*clusters)
+            levels['high'] = highs
+            levels['low'] = lows
+            levels['strength'] = strengths
+            levels['mid'] = np.round((levels['high'] + levels['low']) / 2, 8)
+            levels['is_resistance'] = levels['mid'] >= current_price
+            levels['distance_pct'] = np.abs(levels['mid'] - current_price) / current_price * 100
+
+        return cls(levels, timeframe, current_price, channel_width, pivot_count)
+
+    @classmethod
+    def from_result(cls, sr_result: SRResult) -> 'SRResultArray':
+        """Pack an SRResult into columnar form"""
+        levels = np.array(
+            [(level.mid, level.high, level.low, level.strength, level.is_resistance, level.distance_pct)
+             for level in sr_result.levels],
+            dtype=SR_LEVEL_DTYPE
+        )
+        return cls(levels, sr_result.timeframe, sr_result.current_price,
+                   sr_result.channel_width, sr_result.pivot_count)
+
+    def to_result(self) -> SRResult:
+        """Expand into the SRResult / SRLevel dataclasses"""
+        levels = self.levels
+        sr_levels = [
+            SRLevel(
+                mid=levels['mid'][k],
+                high=levels['high'][k],
+                low=levels['low'][k],
+                strength=int(levels['strength'][k]),
+                is_resistance=bool(levels['is_resistance'][k]),
+                distance_pct=levels['distance_pct'][k]
+            )
+            for k in range(len(levels))
+        ]
+
+        return SRResult(
+            levels=sr_levels,
+            timeframe=self.timeframe,
+            current_price=self.current_price,
+            channel_width=self.channel_width,
+            pivot_count=self.pivot_count
+        )
+
+
+@dataclass
+class SRHistory:
+    """
+    S/R levels as they were at every bar of a series, in compact array form
+    
+    Level arrays have shape (bars, max_sr_levels) and are ordered like
+    SRResult.levels (strength descending); unused slots hold NaN / 0.
+    """
+    timeframe: str
+    index: pd.Index
+    close: np.ndarray           # Current price at each bar
+    mids: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    strengths: np.ndarray
+    level_counts: np.ndarray    # Valid levels per bar
+    channel_width: np.ndarray
+    pivot_count: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.close)
+    
+    def result_at(self, i: int) -> SRResult:
+        """Rebuild the SRResult that calculate_sr_levels(data.iloc[:i+1]) returns"""
+        current_price = self.close[i]
+        sr_levels = []
+        
+        for k in range(self.level_counts[i]):
+            mid = self.mids[i, k]
+            sr_levels.append(SRLevel(
+                mid=mid,
+                high=self.highs[i, k],
+                low=self.lows[i, k],
+                strength=int(self.strengths[i, k]),
+                is_resistance=mid >= current_price,
+                distance_pct=abs(mid - current_price) / current_price * 100
+            ))
+        
+        return SRResult(
+            levels=sr_levels,
+            timeframe=self.timeframe,
+            current_price=current_price,
+            channel_width=self.channel_width[i],
+            pivot_count=int(self.pivot_count[i])
+        )
+
+    def array_at(self, i: int) -> SRResultArray:
+        """Columnar form of result_at(i)"""
+        count = self.level_counts[i]
+        current_price = self.close[i]
+        levels = np.empty(count, dtype=SR_LEVEL_DTYPE)
+        levels['mid'] = self.mids[i, :count]
+        levels['high'] = self.highs[i, :count]
+        levels['low'] = self.lows[i, :count]
+        levels['strength'] = self.strengths[i, :count]
+        levels['is_resistance'] = levels['mid'] >= current_price
+        levels['distance_pct'] = np.abs(levels['mid'] - current_price) / current_price * 100
+
+        return SRResultArray(levels, self.timeframe, current_price,
+                             self.channel_width[i], int(self.pivot_count[i]))
+
+
+class SRCacheInfo(NamedTuple):
+    """S/R memo statistics, like functools.lru_cache's cache_info()"""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _pivot_mask(values: np.ndarray, period: int, is_high: bool) -> np.ndarray:
+    """
+    Strict pivot test for every bar that has `period` bars on both sides
+
+    A bar is a pivot high when no neighbour within `period` bars is >= it
+    (<= for pivot lows), matching ta.pivothigh/ta.pivotlow. NaN neighbours
+    never disqualify a pivot, same as the scalar comparison they replace.
+
+    Returns:
+        Boolean array of length len(values) - 2 * period, aligned to bar `period`
+    """
+    windows = np.lib.stride_tricks.sliding_window_view(values, 2 * period + 1)
+    center = windows[:, period:period + 1]
+    neighbours = np.delete(windows, period, axis=1)
+
+    if is_high:
+        blocked = neighbours >= center
+    else:
+        blocked = neighbours <= center
+
+    return ~blocked.any(axis=1)
+
+
+def _expand_clusters(values: List[float], channel_width: float) -> List[Tuple[int, int, int]]:
+    """
+    Grow the Pine Script cluster around every pivot without the O(n^2) scan
+    
+    For each base pivot the reference algorithm visits all pivots in order and
+    absorbs one when the cluster stays within channel_width. The cluster only
+    ever widens, so the window of acceptable values only ever narrows:
+    - a pivot inside [low, high] is always absorbed without changing the bounds
+    - a pivot rejected once stays rejected for the rest of the scan
+    Therefore the strength is simply the number of pivots inside the final
+    bounds, and the bounds only change at the earliest-visited pivot lying in
+    the acceptable-but-outside fringe. Both are answered on the value-sorted
+    pivots by bisection, so each base costs a few O(log n) steps.
+    
+    Args:
+        values: Pivot values as Python floats, in visiting order
+        channel_width: Maximum cluster width
+        
+    Returns:
+        One (high_index, low_index, strength) candidate per pivot, in input order
+    """
+    count = len(values)
+    if not channel_width >= 0:
+        # Even the base pivot fails the width test (negative or NaN width)
+        return [(i, i, 0) for i in range(count)]
+    
+    order = sorted(range(count), key=values.__getitem__)
+    sorted_values = [values[k] for k in order]
+    
+    # The expansion only depends on the current bounds, so every intermediate
+    # (low, high) state resolves to the same final bounds whichever base reached it
+    resolved = {}
+    
+    candidates = []
+    for base in range(count):
+        low_index = high_index = base
+        cluster_low = cluster_high = values[base]
+        path = []
+        
+        while True:
+            state = (cluster_low, cluster_high)
+            if state in resolved:
+                low_index, high_index = resolved[state]
+                break
+            path.append(state)
+            
+            # Below the cluster: absorbed while cluster_high - pivot <= channel_width.
+            # Bisect the algebraic threshold, then settle the exact float test.
+            low_pos = bisect_left(sorted_values, cluster_low)
+            below_start = bisect_left(sorted_values, cluster_high - channel_width, 0, low_pos)
+            while below_start > 0 and cluster_high - sorted_values[below_start - 1] <= channel_width:
+                below_start -= 1
+            while below_start < low_pos and not cluster_high - sorted_values[below_start] <= channel_width:
+                below_start += 1
+            
+            # Above the cluster: absorbed while pivot - cluster_low <= channel_width
+            high_pos = bisect_right(sorted_values, cluster_high, low_pos)
+            above_end = bisect_right(sorted_values, cluster_low + channel_width, high_pos)
+            while above_end > high_pos and sorted_values[above_end - 1] - cluster_low > channel_width:
+                above_end -= 1
+            while above_end < count and not sorted_values[above_end] - cluster_low > channel_width:
+                above_end += 1
+            
+            # Earliest-visited fringe pivot on either side moves the bounds
+            below_next = min(order[below_start:low_pos], default=count)
+            above_next = min(order[high_pos:above_end], default=count)
+            
+            if below_next == above_next:  # Both sides empty
+                break
+            
+            if below_next < above_next:
+                low_index = below_next
+                cluster_low = values[below_next]
+            else:
+                high_index = above_next
+                cluster_high = values[above_next]
+        
+        for state in path:
+            resolved[state] = (low_index, high_index)
+        
+        num_pivots = (bisect_right(sorted_values, values[high_index]) -
+                      bisect_left(sorted_values, values[low_index]))
+        candidates.append((high_index, low_index, num_pivots))
+    
+    return candidates
+
+
+def _batch_sr_levels(engine: 'SupportResistanceEngine', data: pd.DataFrame, key: Tuple[str, str]) -> SRResult:
+    """S/R levels for one (symbol, timeframe) frame of a batch; errors give an empty result"""
+    try:
+        return engine.calculate_sr_levels(data, key[1])
+    except Exception as e:
+        logger.error(f"Error calculating S/R for {key}: {e}")
+        return SRResult([], key[1], data['close'].iloc[-1], 0.0, 0)
+
+
+def _batch_sr_task(engine: 'SupportResistanceEngine', spec: FrameSpec, key: Tuple[str, str]) -> SRResult:
+    """Process-pool entry point: attach the shared frame and run the engine on it"""
+    return _batch_sr_levels(engine, attach_frame(spec), key)
 
 
 class SupportResistanceEngine:
@@ -49,6 +430,10 @@ class SupportResistanceEngine:
     7. Sort by strength and return top levels
     """
     
+    # Parameters that sweep_sr_levels can vary
+    SWEEP_PARAMS = ('pivot_period', 'max_pivots', 'channel_width_pct',
+                    'max_sr_levels', 'min_strength', 'lookback_period')
+    
     def __init__(
         self,
         pivot_period: int = 10,
@@ -57,7 +442,8 @@ class SupportResistanceEngine:
         max_sr_levels: int = 8,
         min_strength: int = 3,
         lookback_period: int = 400,
-        source: str = "High/Low"  # "High/Low" or "Close/Open"
+        source: str = "High/Low",  # "High/Low" or "Close/Open"
+        cache_size: int = 128      # Memoized calculate_sr_levels results, 0 disables
     ):
         self.pivot_period = pivot_period
         self.max_pivots = max_pivots
@@ -66,7 +452,48 @@ class SupportResistanceEngine:
         self.min_strength = min_strength
         self.lookback_period = lookback_period
         self.source = source
+        self.cache_size = cache_size
+        self.cache_clear()
+    
+    def __getstate__(self) -> dict:
+        # Worker processes start with an empty memo
+        state = self.__dict__.copy()
+        state['_sr_cache'] = OrderedDict()
+        return state
+    
+    def cache_info(self) -> SRCacheInfo:
+        """Hit/miss counters and size of the calculate_sr_levels memo"""
+        return SRCacheInfo(self._cache_hits, self._cache_misses, self.cache_size, len(self._sr_cache))
+    
+    def cache_clear(self) -> None:
+        """Empty the calculate_sr_levels memo and reset its counters"""
+        self._sr_cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    def _cache_key(self, data: pd.DataFrame) -> tuple:
+        """
+        Engine parameters plus a cheap fingerprint of data
+        
+        The fingerprint is the length, first/last index labels and a blake2b
+        digest of the price columns over the most recent lookback_period bars
+        (or the pivot window, if longer). Edits to older bars that keep all
+        of these unchanged are not detected; call cache_clear() after those.
+        """
+        tail = max(self.lookback_period, self.pivot_period * 2 + 1)
+        digest = hashlib.blake2b(digest_size=16)
         
+        for col in ('open', 'high', 'low', 'close'):
+            if col in data.columns:
+                digest.update(col.encode())
+                digest.update(np.ascontiguousarray(data[col].to_numpy()[-tail:]).tobytes())
+        
+        bounds = (data.index[0], data.index[-1]) if len(data) else ()
+        params = (self.pivot_period, self.max_pivots, self.channel_width_pct, self.max_sr_levels,
+                  self.min_strength, self.lookback_period, self.source)
+        
+        return params + (len(data),) + bounds + (digest.hexdigest(),)
+    
     def _detect_pivots(self, data: pd.DataFrame) -> np.ndarray:
         """
         Detect pivot highs and lows exactly like Pine Script ta.pivothigh/ta.pivotlow
@@ -85,124 +512,110 @@ class SupportResistanceEngine:
             low_values = np.minimum(data['close'].values, data['open'].values)
         
         pivots = np.full(len(data), np.nan)
-        
-        # Detect pivot highs
-        for i in range(self.pivot_period, len(high_values) - self.pivot_period):
-            is_pivot_high = True
-            center_val = high_values[i]
-            
-            # Check left side
-            for j in range(i - self.pivot_period, i):
-                if high_values[j] >= center_val:
-                    is_pivot_high = False
-                    break
-            
-            if is_pivot_high:
-                # Check right side
-                for j in range(i + 1, i + self.pivot_period + 1):
-                    if high_values[j] >= center_val:
-                        is_pivot_high = False
-                        break
-            
-            if is_pivot_high:
-                pivots[i] = center_val
-        
-        # Detect pivot lows
-        for i in range(self.pivot_period, len(low_values) - self.pivot_period):
-            is_pivot_low = True
-            center_val = low_values[i]
-            
-            # Check left side
-            for j in range(i - self.pivot_period, i):
-                if low_values[j] <= center_val:
-                    is_pivot_low = False
-                    break
-            
-            if is_pivot_low:
-                # Check right side
-                for j in range(i + 1, i + self.pivot_period + 1):
-                    if low_values[j] <= center_val:
-                        is_pivot_low = False
-                        break
-            
-            if is_pivot_low:
-                # Only set if no pivot high already exists at this position
-                if np.isnan(pivots[i]):
-                    pivots[i] = center_val
-        
+
+        window = 2 * self.pivot_period + 1
+        if len(data) < window:
+            return pivots
+
+        is_pivot_high = _pivot_mask(np.asarray(high_values, dtype=float), self.pivot_period, is_high=True)
+        is_pivot_low = _pivot_mask(np.asarray(low_values, dtype=float), self.pivot_period, is_high=False)
+
+        # Pivot highs win over pivot lows on the same bar
+        center = slice(self.pivot_period, len(data) - self.pivot_period)
+        high_center = high_values[center]
+        pivots[center] = np.where(
+            is_pivot_high & ~np.isnan(high_center),
+            high_center,
+            np.where(is_pivot_low, low_values[center], np.nan)
+        )
+
         return pivots
     
-    def _calculate_channel_width(self, data: pd.DataFrame) -> float:
-        """
-        Calculate dynamic channel width based on price range
-        Matches Pine Script: (ta.highest(cwLookback) - ta.lowest(cwLookback)) * ChannelW / 100
-        """
+    def _lookback_extremes(self, data: pd.DataFrame) -> Tuple[float, float]:
+        """ta.highest(high) and ta.lowest(low) over the last lookback_period bars"""
         if len(data) < self.lookback_period:
             lookback_data = data
         else:
             lookback_data = data.tail(self.lookback_period)
         
-        highest = lookback_data['high'].max()
-        lowest = lookback_data['low'].min()
+        return lookback_data['high'].max(), lookback_data['low'].min()
+    
+    def _calculate_channel_width(self, data: pd.DataFrame) -> float:
+        """
+        Calculate dynamic channel width based on price range
+        Matches Pine Script: (ta.highest(cwLookback) - ta.lowest(cwLookback)) * ChannelW / 100
+        """
+        highest, lowest = self._lookback_extremes(data)
         
         channel_width = (highest - lowest) * self.channel_width_pct / 100
         return channel_width
     
+    def channel_width_series(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Channel width as of every bar, using whatever part of the lookback exists
+        
+        Element i equals _calculate_channel_width(data.iloc[:i+1]).
+        """
+        return channel_width_series(
+            data['high'].to_numpy(dtype=float), data['low'].to_numpy(dtype=float),
+            self.lookback_period, self.channel_width_pct
+        )
+    
+    def _recent_pivots(self, pivot_array: np.ndarray) -> List[float]:
+        """Valid pivots, most recent first, capped at max_pivots"""
+        positions = np.flatnonzero(~np.isnan(pivot_array))
+        return list(pivot_array[positions[::-1][:self.max_pivots]])
+    
     def _cluster_pivots(self, pivot_values: List[float], channel_width: float) -> List[Tuple[float, float, int]]:
         """
         Cluster pivots within channel width and calculate strength
         Returns list of (high, low, strength) tuples
         
-        This replicates the core Pine Script clustering algorithm exactly
+        This replicates the core Pine Script clustering algorithm exactly:
+        same clusters, strengths, overlap removal and ordering, but without
+        comparing every pivot with every other pivot (see _expand_clusters)
         """
-        clusters = []
+        # Plain floats keep the bisect/compare hot loop fast; results map back by index
+        values = [float(pivot) for pivot in pivot_values]
+        candidates = _expand_clusters(values, float(channel_width))
         
-        for i, pivot_base in enumerate(pivot_values):
-            cluster_low = pivot_base
-            cluster_high = pivot_base
-            num_pivots = 0
-            
-            # Find all pivots within channel width of this pivot
-            for j, pivot_test in enumerate(pivot_values):
-                if pivot_test <= cluster_low:
-                    width = cluster_high - pivot_test
-                else:
-                    width = pivot_test - cluster_low
-                
-                if width <= channel_width:
-                    if pivot_test <= cluster_high:
-                        cluster_low = min(cluster_low, pivot_test)
-                    else:
-                        cluster_high = max(cluster_high, pivot_test)
-                    num_pivots += 1
+        # Accepted clusters by insertion sequence, plus sorted (bound, seq) indexes
+        # so overlap checks only touch clusters whose high or low lies in range
+        clusters = {}
+        by_high = []
+        by_low = []
+        
+        for seq, (high_index, low_index, num_pivots) in enumerate(candidates):
+            cluster_high = values[high_index]
+            cluster_low = values[low_index]
             
-            # Check if this cluster overlaps with existing clusters
-            is_valid = True
-            overlapping_indices = []
+            overlapping = set()
+            for bounds in (by_high, by_low):
+                start = bisect_left(bounds, (cluster_low, -1))
+                stop = bisect_right(bounds, (cluster_high, len(candidates)))
+                overlapping.update(existing_seq for _, existing_seq in bounds[start:stop])
             
-            for k, (existing_high, existing_low, existing_strength) in enumerate(clusters):
-                # Check for overlap
-                if ((existing_high >= cluster_low and existing_high <= cluster_high) or 
-                    (existing_low >= cluster_low and existing_low <= cluster_high)):
-                    
-                    if num_pivots >= existing_strength:
-                        # New cluster is stronger, mark existing for removal
-                        overlapping_indices.append(k)
-                    else:
-                        # Existing cluster is stronger, don't add new one
-                        is_valid = False
-                        break
+            # Existing cluster is stronger, don't add new one
+            if any(clusters[k][2] > num_pivots for k in overlapping):
+                continue
             
-            if is_valid and num_pivots >= self.min_strength:
-                # Remove overlapping weaker clusters (in reverse order to maintain indices)
-                for idx in sorted(overlapping_indices, reverse=True):
-                    clusters.pop(idx)
+            if num_pivots >= self.min_strength:
+                # Remove overlapping weaker clusters
+                for k in overlapping:
+                    existing_high, existing_low, _ = clusters.pop(k)
+                    by_high.pop(bisect_left(by_high, (values[existing_high], k)))
+                    by_low.pop(bisect_left(by_low, (values[existing_low], k)))
                 
-                clusters.append((cluster_high, cluster_low, num_pivots))
+                clusters[seq] = (high_index, low_index, num_pivots)
+                insort(by_high, (cluster_high, seq))
+                insort(by_low, (cluster_low, seq))
         
-        # Sort by strength (descending) and limit to max levels
-        clusters.sort(key=lambda x: x[2], reverse=True)
-        return clusters[:self.max_sr_levels]
+        # Sort by strength (descending, ties in insertion order) and limit to max levels
+        ranked = sorted(clusters.items(), key=lambda item: (-item[1][2], item[0]))
+        return [
+            (pivot_values[high_index], pivot_values[low_index], num_pivots)
+            for _, (high_index, low_index, num_pivots) in ranked[:self.max_sr_levels]
+        ]
     
     def calculate_sr_levels(self, data: pd.DataFrame, timeframe: str = "current") -> SRResult:
         """
@@ -213,26 +626,69 @@ class SupportResistanceEngine:
             timeframe: String identifier for timeframe
             
         Returns:
-            SRResult containing all calculated levels
+            SRResult containing all calculated levels; a fresh SRResult and
+            levels list on every call, cached or not (the SRLevel objects of
+            a cached result are shared and must not be modified)
+        """
+        if self.cache_size <= 0:
+            return self._calculate_sr_levels(data, timeframe)
+        
+        key = self._cache_key(data)
+        cached = self._sr_cache.get(key)
+        
+        if cached is not None:
+            self._cache_hits += 1
+            self._sr_cache.move_to_end(key)
+        else:
+            self._cache_misses += 1
+            cached = self._calculate_sr_levels(data, timeframe)
+            self._sr_cache[key] = cached
+            
+            if len(self._sr_cache) > self.cache_size:
+                self._sr_cache.popitem(last=False)
+        
+        # Copy, so callers editing their result or its levels list cannot alter the cache
+        return replace(cached, levels=list(cached.levels), timeframe=timeframe)
+    
+    def _calculate_sr_levels(self, data: pd.DataFrame, timeframe: str) -> SRResult:
+        """Uncached calculate_sr_levels"""
+        clusters, channel_width, pivot_count = self._sr_clusters(data)
+        return self._build_sr_result(
+            clusters, timeframe, data['close'].iloc[-1], channel_width, pivot_count
+        )
+    
+    def calculate_sr_levels_array(self, data: pd.DataFrame, timeframe: str = "current") -> SRResultArray:
+        """
+        Columnar variant of calculate_sr_levels, no SRLevel objects are built
+        
+        Returns:
+            SRResultArray with the same levels as calculate_sr_levels
+        """
+        clusters, channel_width, pivot_count = self._sr_clusters(data)
+        return SRResultArray.from_clusters(
+            clusters, timeframe, data['close'].iloc[-1], channel_width, pivot_count
+        )
+    
+    def _sr_clusters(self, data: pd.DataFrame) -> Tuple[List[Tuple[float, float, int]], float, int]:
+        """
+        Pivot detection, channel width and clustering for the last bar of data
+        
+        Returns:
+            Tuple of (clusters, channel_width, pivot_count)
         """
         if len(data) < self.pivot_period * 2 + 1:
             logger.warning(f"Insufficient data for pivot detection. Need at least {self.pivot_period * 2 + 1} bars")
-            return SRResult([], timeframe, data['close'].iloc[-1], 0.0, 0)
+            return [], 0.0, 0
         
         # Detect pivots
         pivot_array = self._detect_pivots(data)
         
         # Extract valid pivots (most recent first)
-        valid_pivots = []
-        for i in range(len(pivot_array) - 1, -1, -1):
-            if not np.isnan(pivot_array[i]):
-                valid_pivots.append(pivot_array[i])
-                if len(valid_pivots) >= self.max_pivots:
-                    break
+        valid_pivots = self._recent_pivots(pivot_array)
         
         if len(valid_pivots) < self.min_strength:
             logger.info(f"Insufficient pivots found: {len(valid_pivots)}")
-            return SRResult([], timeframe, data['close'].iloc[-1], 0.0, len(valid_pivots))
+            return [], 0.0, len(valid_pivots)
         
         # Calculate channel width
         channel_width = self._calculate_channel_width(data)
@@ -240,8 +696,11 @@ class SupportResistanceEngine:
         # Cluster pivots
         clusters = self._cluster_pivots(valid_pivots, channel_width)
         
-        # Convert clusters to SRLevel objects
-        current_price = data['close'].iloc[-1]
+        return clusters, channel_width, len(valid_pivots)
+    
+    def _build_sr_result(self, clusters: List[Tuple[float, float, int]], timeframe: str,
+                         current_price: float, channel_width: float, pivot_count: int) -> SRResult:
+        """Convert (high, low, strength) clusters into an SRResult relative to current_price"""
         sr_levels = []
         
         for high, low, strength in clusters:
@@ -267,29 +726,239 @@ class SupportResistanceEngine:
             timeframe=timeframe,
             current_price=current_price,
             channel_width=channel_width,
-            pivot_count=len(valid_pivots)
+            pivot_count=pivot_count
         )
     
-    def calculate_multi_timeframe_sr(self, data_dict: Dict[str, pd.DataFrame]) -> Dict[str, SRResult]:
+    def calculate_sr_history(self, data: pd.DataFrame, timeframe: str = "current") -> SRHistory:
+        """
+        Calculate the S/R levels as they were at every bar in one forward sweep
+        
+        Equivalent to calling calculate_sr_levels(data.iloc[:i+1]) for every i,
+        but pivots and channel widths are computed once for the whole series
+        and clustering only reruns when the pivot set or channel width changes.
+        
+        Args:
+            data: DataFrame with OHLC columns
+            timeframe: String identifier for timeframe
+            
+        Returns:
+            SRHistory with per-bar level arrays padded to max_sr_levels
+        """
+        bars = len(data)
+        close = data['close'].to_numpy(dtype=float)
+        
+        mids = np.full((bars, self.max_sr_levels), np.nan)
+        highs = np.full((bars, self.max_sr_levels), np.nan)
+        lows = np.full((bars, self.max_sr_levels), np.nan)
+        strengths = np.zeros((bars, self.max_sr_levels), dtype=int)
+        level_counts = np.zeros(bars, dtype=int)
+        channel_width = np.zeros(bars)
+        pivot_count = np.zeros(bars, dtype=int)
+        
+        # A pivot at bar k is only confirmed pivot_period bars later
+        pivot_array = self._detect_pivots(data)
+        pivot_positions = np.flatnonzero(~np.isnan(pivot_array))
+        confirmed = np.searchsorted(pivot_positions, np.arange(bars) - self.pivot_period, side='right')
+        
+        width_series = self.channel_width_series(data)
+        
+        cluster_key = None
+        cluster_rows = None
+        
+        for i in range(self.pivot_period * 2, bars):
+            num_confirmed = confirmed[i]
+            num_pivots = min(num_confirmed, self.max_pivots)
+            pivot_count[i] = num_pivots
+            
+            if num_pivots < self.min_strength:
+                continue
+            
+            channel_width[i] = width_series[i]
+            
+            key = (num_confirmed, width_series[i])
+            if key != cluster_key:
+                recent = pivot_positions[num_confirmed - num_pivots:num_confirmed][::-1]
+                clusters = self._cluster_pivots(list(pivot_array[recent]), width_series[i])
+                cluster_rows = np.array(clusters, dtype=float).reshape(-1, 3)
+                cluster_key = key
+            
+            count = len(cluster_rows)
+            level_counts[i] = count
+            highs[i, :count] = cluster_rows[:, 0]
+            lows[i, :count] = cluster_rows[:, 1]
+            strengths[i, :count] = cluster_rows[:, 2]
+        
+        # Same rounding as _build_sr_result
+        mids[:] = np.round((highs + lows) / 2, 8)
+        
+        return SRHistory(
+            timeframe=timeframe,
+            index=data.index,
+            close=close,
+            mids=mids,
+            highs=highs,
+            lows=lows,
+            strengths=strengths,
+            level_counts=level_counts,
+            channel_width=channel_width,
+            pivot_count=pivot_count
+        )
+    
+    def _with_params(self, **overrides) -> 'SupportResistanceEngine':
+        """Copy of this engine with some parameters replaced"""
+        params = {name: getattr(self, name) for name in self.SWEEP_PARAMS}
+        params.update(overrides)
+        return SupportResistanceEngine(source=self.source, cache_size=0, **params)
+    
+    def sweep_sr_levels(self, data: pd.DataFrame, param_grid: Dict[str, List],
+                        timeframe: str = "current") -> pd.DataFrame:
+        """
+        Calculate S/R levels for every combination of a parameter grid
+        
+        Pivots are detected once per distinct pivot_period and the lookback
+        high/low once per distinct lookback_period; only clustering runs per
+        configuration, and max_sr_levels just truncates a shared clustering.
+        
+        Args:
+            data: DataFrame with OHLC columns
+            param_grid: {parameter: [values]} over SWEEP_PARAMS; parameters not
+                in the grid keep this engine's value
+            timeframe: String identifier for timeframe
+            
+        Returns:
+            DataFrame indexed by the parameter tuple plus 'rank' (1 = strongest),
+            one row per level with the SRLevel fields, channel_width and
+            pivot_count. Configurations without levels get a single rank-0 row.
+        """
+        unknown = set(param_grid) - set(self.SWEEP_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown S/R sweep parameters: {sorted(unknown)}")
+        
+        grid = {name: list(param_grid.get(name, [getattr(self, name)])) for name in self.SWEEP_PARAMS}
+        current_price = data['close'].iloc[-1]
+        max_levels = max(grid['max_sr_levels'])
+        
+        pivots_by_period = {
+            period: self._with_params(pivot_period=period)._detect_pivots(data)
+            for period in set(grid['pivot_period'])
+        }
+        extremes_by_lookback = {
+            lookback: self._with_params(lookback_period=lookback)._lookback_extremes(data)
+            for lookback in set(grid['lookback_period'])
+        }
+        
+        clusters_cache = {}
+        rows = []
+        
+        for config in product(*(grid[name] for name in self.SWEEP_PARAMS)):
+            engine = self._with_params(**dict(zip(self.SWEEP_PARAMS, config)))
+            
+            if len(data) < engine.pivot_period * 2 + 1:
+                sr_result = SRResult([], timeframe, current_price, 0.0, 0)
+            else:
+                valid_pivots = engine._recent_pivots(pivots_by_period[engine.pivot_period])
+                
+                if len(valid_pivots) < engine.min_strength:
+                    sr_result = SRResult([], timeframe, current_price, 0.0, len(valid_pivots))
+                else:
+                    highest, lowest = extremes_by_lookback[engine.lookback_period]
+                    channel_width = (highest - lowest) * engine.channel_width_pct / 100
+                    
+                    cluster_key = (engine.pivot_period, engine.max_pivots, engine.lookback_period,
+                                   engine.channel_width_pct, engine.min_strength)
+                    if cluster_key not in clusters_cache:
+                        clusters_cache[cluster_key] = engine._with_params(
+                            max_sr_levels=max_levels
+                        )._cluster_pivots(valid_pivots, channel_width)
+                    
+                    sr_result = engine._build_sr_result(
+                        clusters_cache[cluster_key][:engine.max_sr_levels],
+                        timeframe, current_price, channel_width, len(valid_pivots)
+                    )
+            
+            base = dict(zip(self.SWEEP_PARAMS, config))
+            base.update(channel_width=sr_result.channel_width, pivot_count=sr_result.pivot_count)
+            
+            if not sr_result.levels:
+                rows.append({**base, 'rank': 0, 'mid': np.nan, 'high': np.nan, 'low': np.nan,
+                             'strength': 0, 'is_resistance': False, 'distance_pct': np.nan})
+            
+            for rank, level in enumerate(sr_result.levels, 1):
+                rows.append({**base, 'rank': rank, 'mid': level.mid, 'high': level.high,
+                             'low': level.low, 'strength': level.strength,
+                             'is_resistance': bool(level.is_resistance),
+                             'distance_pct': level.distance_pct})
+        
+        columns = list(self.SWEEP_PARAMS) + ['rank', 'mid', 'high', 'low', 'strength',
+                                             'is_resistance', 'distance_pct', 'channel_width', 'pivot_count']
+        return pd.DataFrame(rows, columns=columns).set_index(list(self.SWEEP_PARAMS) + ['rank'])
+    
+    def calculate_multi_timeframe_sr(self, data_dict: Dict[str, pd.DataFrame],
+                                     columnar: bool = False) -> Dict[str, Union[SRResult, SRResultArray]]:
         """
         Calculate S/R levels for multiple timeframes
         
         Args:
             data_dict: Dictionary of {timeframe: DataFrame}
+            columnar: Return SRResultArray values instead of SRResult
             
         Returns:
-            Dictionary of {timeframe: SRResult}
+            Dictionary of {timeframe: SRResult}, or {timeframe: SRResultArray}
+            with columnar=True
         """
         results = {}
         
         for timeframe, data in data_dict.items():
             try:
-                results[timeframe] = self.calculate_sr_levels(data, timeframe)
+                if columnar:
+                    results[timeframe] = self.calculate_sr_levels_array(data, timeframe)
+                else:
+                    results[timeframe] = self.calculate_sr_levels(data, timeframe)
                 logger.info(f"Calculated {len(results[timeframe].levels)} S/R levels for {timeframe}")
             except Exception as e:
                 logger.error(f"Error calculating S/R for {timeframe}: {e}")
-                results[timeframe] = SRResult([], timeframe, data['close'].iloc[-1], 0.0, 0)
+                empty = SRResult([], timeframe, data['close'].iloc[-1], 0.0, 0)
+                results[timeframe] = SRResultArray.from_result(empty) if columnar else empty
+        
+        return results
+    
+    def calculate_sr_batch(self, frames: Dict[Tuple[str, str], pd.DataFrame],
+                           workers: Optional[int] = None) -> Dict[Tuple[str, str], SRResult]:
+        """
+        Calculate S/R levels for many (symbol, timeframe) frames in a process pool
+        
+        OHLC columns are copied once into shared memory and workers read them
+        in place, so only the small FrameSpec and the SRResult cross process
+        boundaries. Prices are shared as float64.
+        
+        Args:
+            frames: Dictionary of {(symbol, timeframe): DataFrame}
+            workers: Number of worker processes (default: CPU count, 1 runs in-process)
+            
+        Returns:
+            Dictionary of {(symbol, timeframe): SRResult} in input order
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        if workers <= 1 or len(frames) <= 1:
+            return {key: _batch_sr_levels(self, data, key) for key, data in frames.items()}
         
+        workers = min(workers, len(frames))
+        keys = list(frames)
+        
+        with SharedFrames(frames, columns=('open', 'high', 'low', 'close')) as shared:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    _batch_sr_task,
+                    [self] * len(keys),
+                    [shared.specs[key] for key in keys],
+                    keys,
+                    chunksize=max(1, len(keys) // (workers * 4))
+                )
+                results = dict(zip(keys, results))
+        
+        logger.info(f"Calculated S/R for {len(results)} frames with {workers} workers")
         return results
     
     def get_nearest_levels(self, sr_result: SRResult, current_price: float = None) -> Tuple[Optional[SRLevel], Optional[SRLevel]]:
@@ -299,26 +968,20 @@ class SupportResistanceEngine:
         Returns:
             Tuple of (nearest_support, nearest_resistance)
         """
+        if isinstance(sr_result, SRResultArray):
+            sr_result = sr_result.to_result()
+        
         if current_price is None:
             current_price = sr_result.current_price
         
-        nearest_support = None
-        nearest_resistance = None
-        
-        for level in sr_result.levels:
-            if level.mid < current_price:
-                # Support level
-                if nearest_support is None or level.mid > nearest_support.mid:
-                    nearest_support = level
-            elif level.mid > current_price:
-                # Resistance level  
-                if nearest_resistance is None or level.mid < nearest_resistance.mid:
-                    nearest_resistance = level
-        
-        return nearest_support, nearest_resistance
+        index = sr_result.level_index
+        return index.nearest_below(current_price), index.nearest_above(current_price)
     
     def print_sr_analysis(self, sr_result: SRResult) -> None:
         """Print formatted S/R analysis"""
+        if isinstance(sr_result, SRResultArray):
+            sr_result = sr_result.to_result()
+        
         print(f"\n=== S/R Analysis - {sr_result.timeframe} ===")
         print(f"Current Price: ${sr_result.current_price:.4f}")
         print(f"Channel Width: ${sr_result.channel_width:.4f} ({self.channel_width_pct}%)")
@@ -343,6 +1006,121 @@ class SupportResistanceEngine:
                 print(f"Resistance: ${nearest_resistance.mid:.4f} (strength: {nearest_resistance.strength})")
 
 
+class StreamingSREngine:
+    """
+    Incremental S/R state that is updated one closed candle at a time.
+    
+    Produces the same SRResult as SupportResistanceEngine.calculate_sr_levels
+    on the data seen so far, without recomputing from the full history:
+    1. Keep the last 2 * pivot_period + 1 source values and confirm the pivot
+       at the centre bar, i.e. pivot_period bars late like Pine does
+    2. Keep the most recent max_pivots pivots in a ring buffer
+    3. Track ta.highest/ta.lowest over lookback_period with RollingExtremes
+    4. Re-cluster only when the pivot set or the channel width changes
+    
+    Usage:
+        stream = StreamingSREngine(SupportResistanceEngine(), timeframe="4h")
+        for _, bar in data.iterrows():
+            sr_result = stream.update(bar)
+    """
+    
+    def __init__(self, sr_engine: Optional[SupportResistanceEngine] = None, timeframe: str = "current"):
+        self.sr_engine = sr_engine or SupportResistanceEngine()
+        self.timeframe = timeframe
+        self.reset()
+    
+    def reset(self) -> None:
+        """Drop all accumulated state"""
+        window = self.sr_engine.pivot_period * 2 + 1
+        
+        self.bar_count = 0
+        self._source_highs = deque(maxlen=window)
+        self._source_lows = deque(maxlen=window)
+        self._pivots = deque(maxlen=self.sr_engine.max_pivots)  # Most recent first
+        self._pivot_version = 0
+        
+        # ta.highest/ta.lowest for the channel width lookback
+        self._extremes = RollingExtremes(self.sr_engine.lookback_period)
+        
+        self._cluster_key = None
+        self._clusters = []
+    
+    def _is_pivot(self, window: deque, is_high: bool) -> bool:
+        """Strict pivot test for the centre of a full window (same rules as _pivot_mask)"""
+        period = self.sr_engine.pivot_period
+        center_val = window[period]
+        
+        for k, value in enumerate(window):
+            if k == period:
+                continue
+            if (value >= center_val) if is_high else (value <= center_val):
+                return False
+        
+        return True
+    
+    def _update_pivots(self, source_high: float, source_low: float) -> None:
+        """Confirm the pivot pivot_period bars back once the window is full"""
+        self._source_highs.append(source_high)
+        self._source_lows.append(source_low)
+        
+        if len(self._source_highs) < self._source_highs.maxlen:
+            return
+        
+        period = self.sr_engine.pivot_period
+        pivot_value = None
+        
+        if self._is_pivot(self._source_highs, is_high=True) and not np.isnan(self._source_highs[period]):
+            pivot_value = self._source_highs[period]
+        elif self._is_pivot(self._source_lows, is_high=False) and not np.isnan(self._source_lows[period]):
+            pivot_value = self._source_lows[period]
+        
+        if pivot_value is not None:
+            self._pivots.appendleft(pivot_value)
+            self._pivot_version += 1
+    
+    def _channel_width(self) -> float:
+        """(ta.highest - ta.lowest) * ChannelW / 100 over the tracked lookback"""
+        return (self._extremes.highest - self._extremes.lowest) * self.sr_engine.channel_width_pct / 100
+    
+    def update(self, bar) -> SRResult:
+        """
+        Add one closed candle and return the S/R levels as of that candle
+        
+        Args:
+            bar: Mapping with open/high/low/close (e.g. a DataFrame row)
+            
+        Returns:
+            SRResult identical to calculate_sr_levels on all bars seen so far
+        """
+        if self.sr_engine.source == "High/Low":
+            source_high = bar['high']
+            source_low = bar['low']
+        else:  # Close/Open
+            source_high = np.maximum(bar['close'], bar['open'])
+            source_low = np.minimum(bar['close'], bar['open'])
+        
+        self._update_pivots(source_high, source_low)
+        self._extremes.update(bar['high'], bar['low'])
+        self.bar_count += 1
+        
+        current_price = bar['close']
+        pivot_count = len(self._pivots)
+        
+        if self.bar_count < self.sr_engine.pivot_period * 2 + 1 or pivot_count < self.sr_engine.min_strength:
+            return SRResult([], self.timeframe, current_price, 0.0, pivot_count)
+        
+        channel_width = self._channel_width()
+        
+        cluster_key = (self._pivot_version, channel_width)
+        if cluster_key != self._cluster_key:
+            self._clusters = self.sr_engine._cluster_pivots(list(self._pivots), channel_width)
+            self._cluster_key = cluster_key
+        
+        return self.sr_engine._build_sr_result(
+            self._clusters, self.timeframe, current_price, channel_width, pivot_count
+        )
+
+
 if __name__ == "__main__":
     # Example usage
     pass
\ No newline at end of file
@@ -0,0 +1,447 @@
+"""
+Parameter sweep
+Runs PulseWaveBacktester over a grid of PulseWavePlatform-style configs in a
+process pool and ranks the results
+
+The OHLCV data is copied once into shared memory. Configs that differ only in
+signal thresholds or backtest settings share one SignalGenerator.precompute
+(S/R history, regime series, confluence scores), and each worker keeps one
+IndicatorFrame, so indicator windows are computed once per worker. Groups
+larger than their share of the pool are split into chunks, and a worker
+precomputes a group once however many of its chunks it runs. Finished
+results are appended to a JSONL file as they arrive, and a rerun with the
+same file skips configs that are already there. The file starts with a
+fingerprint of the base config, data and min_bars_for_signal, and a run
+whose fingerprint differs refuses to resume from it.
+"""
+
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import os
+import logging
+
+from sr_engine import SupportResistanceEngine
+from regime_detector import RegimeDetector
+from confluence_scorer import ConfluenceScorer
+from signal_generator import SignalGenerator, SignalSeries
+from backtester import PulseWaveBacktester, PositionSizing, BacktestResult
+from indicators import IndicatorFrame
+from shared_data import SharedFrames, attach_frame
+
+logger = logging.getLogger(__name__)
+
+# Config keys read by the backtester rather than the signal components
+BACKTEST_KEYS = ('position_sizing', 'position_size', 'commission', 'slippage',
+                 'max_bars_held', 'initial_capital')
+
+# SignalGenerator settings that only filter precomputed scores
+SIGNAL_THRESHOLD_KEYS = ('min_confluence_score', 'min_risk_reward', 'max_stop_loss_pct',
+                         'early_exit_scoring')
+
+# BacktestResult fields reported per config
+METRIC_COLUMNS = ('total_return', 'win_rate', 'profit_factor', 'max_drawdown', 'sharpe_ratio',
+                  'expectancy', 'total_trades', 'winning_trades', 'losing_trades', 'avg_bars_held')
+
+
+def expand_grid(grid: Dict[str, Iterable]) -> List[Dict[str, Any]]:
+    """
+    Every combination of a parameter grid, in grid order
+
+    Args:
+        grid: Dictionary of {config key: candidate values}
+
+    Returns:
+        List of {config key: value} dictionaries
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in product(*(list(grid[key]) for key in keys))]
+
+
+def config_key(params: Dict[str, Any]) -> str:
+    """Stable text key of a parameter set, used to match JSONL rows on resume"""
+    return json.dumps(params, sort_keys=True, default=_json_value)
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, PositionSizing):
+        return value.value
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize sweep parameter {value!r}")
+
+
+def build_signal_generator(config: dict) -> SignalGenerator:
+    """SignalGenerator wired from a config dictionary (PulseWavePlatform builds its components here too)"""
+    sr_engine = SupportResistanceEngine(
+        pivot_period=config.get('pivot_period', 10),
+        max_pivots=config.get('max_pivots', 60),
+        channel_width_pct=config.get('channel_width_pct', 10),
+        max_sr_levels=config.get('max_sr_levels', 8),
+        min_strength=config.get('min_strength', 3),
+        lookback_period=config.get('lookback_period', 400),
+        cache_size=config.get('sr_cache_size', 128)
+    )
+    regime_detector = RegimeDetector(
+        atr_period=config.get('atr_period', 14),
+        adx_period=config.get('adx_period', 14),
+        bb_period=config.get('bb_period', 20),
+        ema_fast=config.get('ema_fast', 20),
+        ema_slow=config.get('ema_slow', 50)
+    )
+    confluence_scorer = ConfluenceScorer(
+        rsi_period=config.get('rsi_period', 14),
+        volume_ma_period=config.get('volume_ma_period', 20),
+        proximity_threshold_pct=config.get('proximity_threshold_pct', 2.0),
+        factors=config.get('confluence_factors')
+    )
+    return SignalGenerator(
+        sr_engine=sr_engine,
+        regime_detector=regime_detector,
+        confluence_scorer=confluence_scorer,
+        min_confluence_score=config.get('min_confluence_score', 45.0),
+        min_risk_reward=config.get('min_risk_reward', 1.5),
+        max_stop_loss_pct=config.get('max_stop_loss_pct', 3.0),
+        early_exit=config.get('early_exit_scoring', True)
+    )
+
+
+def build_backtester(config: dict, signal_generator: SignalGenerator) -> PulseWaveBacktester:
+    """PulseWaveBacktester from the backtest keys of a config dictionary"""
+    return PulseWaveBacktester(
+        signal_generator,
+        position_sizing=PositionSizing(config.get('position_sizing', PositionSizing.PERCENT)),
+        position_size=config.get('position_size', 0.02),
+        commission=config.get('commission', 0.001),
+        slippage=config.get('slippage', 0.0005),
+        max_bars_held=config.get('max_bars_held', 100),
+        initial_capital=config.get('initial_capital', 100000)
+    )
+
+
+def _precompute_key(config: dict) -> str:
+    """Configs with equal keys produce the same SignalSeries"""
+    shared = {key: value for key, value in config.items()
+              if key not in BACKTEST_KEYS and key not in SIGNAL_THRESHOLD_KEYS}
+    return config_key(shared)
+
+
+def result_row(params: Dict[str, Any], result: Optional[BacktestResult] = None,
+               error: Optional[str] = None) -> Dict[str, Any]:
+    """JSON-ready row: config key, parameters, METRIC_COLUMNS (NaN without a result) and error"""
+    key = config_key(params)
+    row = {'key': key, **json.loads(key)}
+    for column in METRIC_COLUMNS:
+        if result is None:
+            row[column] = float('nan')
+        else:
+            value = getattr(result, column)
+            row[column] = value if isinstance(value, int) else float(value)
+    row['error'] = error
+    return row
+
+
+def _run_group(data: pd.DataFrame, indicators: IndicatorFrame, group: List[Dict[str, Any]],
+               base_config: dict, min_bars_for_signal: int) -> List[Dict[str, Any]]:
+    """Backtest configs that share one precompute; errors are recorded per config"""
+    try:
+        signal_series = precompute_signals(data, indicators, {**base_config, **group[0]})
+    except Exception as e:
+        logger.error(f"Error precomputing signals for {config_key(group[0])}: {e}")
+        return [result_row(params, error=str(e)) for params in group]
+
+    rows = []
+    for params in group:
+        config = {**base_config, **params}
+        try:
+            backtester = build_backtester(config, build_signal_generator(config))
+            result = backtester.run_backtest(data, min_bars_for_signal=min_bars_for_signal,
+                                             signal_series=signal_series)
+            rows.append(result_row(params, result))
+        except Exception as e:
+            logger.error(f"Error backtesting {config_key(params)}: {e}")
+            rows.append(result_row(params, error=str(e)))
+    return rows
+
+
+# Data attached by this (worker) process in _init_sweep_worker, and the
+# (precompute key, SignalSeries) of the last group it precomputed
+_worker_data: Optional[pd.DataFrame] = None
+_worker_indicators: Optional[IndicatorFrame] = None
+_worker_signals: Optional[Tuple[str, SignalSeries]] = None
+
+
+def _init_sweep_worker(spec, index: pd.Index) -> None:
+    """Process-pool initializer: attach the shared OHLCV frame once per worker"""
+    global _worker_data, _worker_indicators
+    _worker_data = attach_frame(spec, index)
+    _worker_indicators = IndicatorFrame(_worker_data)
+
+
+def precompute_signals(data: pd.DataFrame, indicators: IndicatorFrame, config: dict) -> SignalSeries:
+    """
+    SignalGenerator.precompute for a config
+
+    In a pool worker the last result is kept, so consecutive chunks of one
+    precompute group reuse it.
+    """
+    global _worker_signals
+    key = _precompute_key(config)
+    if indicators is _worker_indicators and _worker_signals is not None and _worker_signals[0] == key:
+        return _worker_signals[1]
+
+    signal_series = build_signal_generator(config).precompute(data, indicators)
+    if indicators is _worker_indicators:
+        _worker_signals = (key, signal_series)
+    return signal_series
+
+
+def _chunk_groups(groups: List[list], workers: int) -> List[list]:
+    """Split groups into about `workers` chunks in total, keeping a group's chunks adjacent"""
+    parts = -(-workers // len(groups))
+    chunks = []
+    for group in groups:
+        size = -(-len(group) // parts)
+        chunks.extend(group[i:i + size] for i in range(0, len(group), size))
+    return chunks
+
+
+def _group_task(task: Callable, group: list, args: tuple) -> Any:
+    """Process-pool entry point: run task(data, indicators, group, *args) on the worker's shared frame"""
+    return task(_worker_data, _worker_indicators, group, *args)
+
+
+def sweep_fingerprint(data: pd.DataFrame, base_config: dict, min_bars_for_signal: int) -> str:
+    """Hash of everything besides the grid parameters that sweep results depend on"""
+    digest = hashlib.sha256(config_key({'base_config': base_config,
+                                        'min_bars_for_signal': min_bars_for_signal}).encode())
+    # Index and values, so the date range is covered as well as the prices
+    digest.update(pd.util.hash_pandas_object(data).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Rows of a sweep JSONL file by config key (a truncated last line is ignored)"""
+    rows = {}
+    if not os.path.exists(path):
+        return rows
+
+    with open(path) as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping incomplete line in {path}")
+                continue
+            if 'key' in row:    # Not the fingerprint header
+                rows[row['key']] = row
+    return rows
+
+
+def _check_fingerprint(path: str, fingerprint: str) -> None:
+    """Write the fingerprint header to a new results file, or check an existing file's header"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        with open(path, 'w') as f:
+            f.write(json.dumps({'fingerprint': fingerprint}) + '\n')
+        return
+
+    with open(path) as f:
+        try:
+            stored = json.loads(f.readline()).get('fingerprint')
+        except json.JSONDecodeError:
+            stored = None
+    if stored != fingerprint:
+        raise ValueError(f"{path} holds results for a different base config, data or "
+                         f"min_bars_for_signal; remove it or choose another output_path")
+
+
+def _trim_partial_line(path: str) -> None:
+    """Drop an unterminated last line (a write cut short by a crash) before appending"""
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'rb+') as f:
+        content = f.read()
+        end = content.rfind(b'\n') + 1
+        if end < len(content):
+            f.truncate(end)
+
+
+class ParameterSweep:
+    """
+    Grid search over PulseWaveBacktester configs
+
+    Usage:
+        sweep = ParameterSweep(base_config, workers=8)
+        table = sweep.run(data, {'min_confluence_score': [40, 45, 50],
+                                 'min_strength': [2, 3]},
+                          output_path='sweep.jsonl')
+        sweep.print_results(table)
+    """
+
+    def __init__(self, base_config: Optional[dict] = None, workers: Optional[int] = None,
+                 min_bars_for_signal: int = 100, rank_by: str = 'sharpe_ratio'):
+        """
+        Args:
+            base_config: Config shared by every run (PulseWavePlatform keys plus
+                position_sizing, position_size, commission, slippage,
+                max_bars_held and initial_capital)
+            workers: Number of worker processes (default: CPU count, 1 runs in-process)
+            min_bars_for_signal: Passed to run_backtest
+            rank_by: Metric column the results table is sorted by (descending)
+        """
+        self.base_config = dict(base_config or {})
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.min_bars_for_signal = min_bars_for_signal
+        self.rank_by = rank_by
+
+    def group_configs(self, items: list, params: Optional[Callable] = None) -> List[list]:
+        """
+        Split configs into groups that share one SignalGenerator.precompute
+
+        Args:
+            items: Parameter dictionaries, or records holding one
+            params: Reads the parameter dictionary of an item (default: the item itself)
+
+        Returns:
+            Lists of items, in first-seen order
+        """
+        groups: Dict[str, list] = {}
+        for item in items:
+            config = {**self.base_config, **(params(item) if params else item)}
+            groups.setdefault(_precompute_key(config), []).append(item)
+        return list(groups.values())
+
+    def run(self, data: pd.DataFrame, grid: Dict[str, Iterable],
+            output_path: Optional[str] = None,
+            start_date: Optional[str] = None,
+            end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Backtest every config of the grid
+
+        Args:
+            data: OHLCV DataFrame with datetime index
+            grid: Dictionary of {config key: candidate values}
+            output_path: JSONL file that results are appended to as they
+                finish; configs already in it are not run again. Raises
+                ValueError if it was written with a different base config,
+                data (after the date filter) or min_bars_for_signal
+            start_date: Start date for backtest (optional)
+            end_date: End date for backtest (optional)
+
+        Returns:
+            Ranked results table (see rank_results)
+        """
+        if start_date:
+            data = data[data.index >= start_date]
+        if end_date:
+            data = data[data.index <= end_date]
+
+        configs = expand_grid(grid)
+        if output_path:
+            _trim_partial_line(output_path)
+            _check_fingerprint(output_path, sweep_fingerprint(data, self.base_config,
+                                                              self.min_bars_for_signal))
+        done = load_results(output_path) if output_path else {}
+        rows = [done[config_key(params)] for params in configs if config_key(params) in done]
+        pending = [params for params in configs if config_key(params) not in done]
+        groups = self.group_configs(pending)
+
+        logger.info(f"Sweeping {len(pending)} configs in {len(groups)} precompute groups "
+                    f"({len(rows)} already done)")
+
+        output = open(output_path, 'a') if output_path else None
+        try:
+            for group_rows in self.map_groups(data, groups, _run_group,
+                                              self.base_config, self.min_bars_for_signal):
+                rows.extend(group_rows)
+                if output is not None:
+                    for row in group_rows:
+                        output.write(json.dumps(row) + '\n')
+                    output.flush()
+        finally:
+            if output is not None:
+                output.close()
+
+        # Grid order, so ties rank the same whatever order the pool finished in
+        order = {config_key(params): k for k, params in enumerate(configs)}
+        rows.sort(key=lambda row: order[row['key']])
+        return self.rank_results(rows)
+
+    def map_groups(self, data: pd.DataFrame, groups: List[list], task: Callable, *args) -> Iterator:
+        """
+        Run task(data, indicators, group, *args) for every group in the pool
+
+        task must be a module-level function that reads its SignalSeries
+        through precompute_signals. Each worker attaches the shared data once
+        and passes the same IndicatorFrame to every group it runs. With fewer
+        groups than workers, groups are split into chunks that each run as a
+        task, so a small grid still fills the pool.
+
+        Yields:
+            Task results (one per group, or per chunk in the pool) in
+            completion order
+        """
+        workers = min(self.workers, sum(len(group) for group in groups))
+
+        if workers <= 1:
+            indicators = IndicatorFrame(data)
+            for group in groups:
+                yield task(data, indicators, group, *args)
+            return
+
+        with SharedFrames({'data': data}) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                     initargs=(shared.specs['data'], data.index)) as pool:
+                # Chunks are queued in order, so a worker meets a group's chunks
+                # back to back and precompute_signals runs once per group per worker
+                futures = [pool.submit(_group_task, task, chunk, args)
+                           for chunk in _chunk_groups(groups, workers)]
+                for future in as_completed(futures):
+                    yield future.result()
+
+    def rank_results(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Results table sorted by rank_by, best first
+
+        Args:
+            rows: Result rows from run or load_results
+
+        Returns:
+            DataFrame with one row per config (grid parameters, metrics and
+            error), indexed by rank starting at 1
+        """
+        table = pd.DataFrame(rows)
+        if table.empty:
+            return table
+
+        table = table.drop(columns='key').sort_values(
+            self.rank_by, ascending=False, na_position='last', kind='stable'
+        ).reset_index(drop=True)
+        table.index = pd.RangeIndex(1, len(table) + 1, name='rank')
+        return table
+
+    def print_results(self, table: pd.DataFrame, top: int = 10) -> None:
+        """Print the best configs of a results table"""
+        print(f"\n{'='*60}")
+        print(f"PULSEWAVE PARAMETER SWEEP (top {min(top, len(table))} of {len(table)} by {self.rank_by})")
+        print(f"{'='*60}")
+
+        if table.empty:
+            print("No results")
+            return
+
+        print(table.head(top).drop(columns='error').to_string(float_format=lambda x: f"{x:.2f}"))
+
+        errors = int(table['error'].notna().sum())
+        if errors:
+            print(f"\n{errors} configs failed (see the error column)")
+
+
+if __name__ == "__main__":
+    # Example usage
+    pass
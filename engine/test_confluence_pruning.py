@@ -0,0 +1,103 @@
+"""
+Early-exit confluence scoring test
+Scores sample bars with and without min_score and checks that finished
+scores match a full evaluation, that pruned calls never reach the expensive
+indicator factors, and that a fully scored signal is never pruned
+"""
+
+import sys
+import logging
+
+import numpy as np
+
+from demo import generate_sample_ohlcv_data
+from sr_engine import SupportResistanceEngine
+from regime_detector import RegimeDetector
+from confluence_scorer import ConfluenceScorer, SignalDirection
+
+logging.disable(logging.CRITICAL)
+
+EXPENSIVE_FACTORS = ('volume_confirmation', 'trend_alignment')
+
+
+def scoring_inputs(num_bars: int = 600, step: int = 25, seed: int = 3):
+    """(data, sr_results, regime_result) for bars spread over a sample series"""
+    np.random.seed(seed)
+    data = generate_sample_ohlcv_data(num_bars, 100)
+    sr_engine = SupportResistanceEngine(min_strength=2, cache_size=0)
+    regime_detector = RegimeDetector()
+
+    for i in range(100, num_bars, step):
+        window = data.iloc[:i + 1]
+        sr_results = {tf: sr_engine.calculate_sr_levels(window, tf) for tf in ('4h', '1d')}
+        yield window, sr_results, regime_detector.detect_regime(window)
+
+
+def calls(scorer: ConfluenceScorer, name: str) -> int:
+    timing = scorer.factor_timings.get(name)
+    return timing.calls if timing else 0
+
+
+def test_expensive_factors_scored_last():
+    order = sorted(ConfluenceScorer().enabled_factors, key=lambda factor: factor.cost)
+    assert [factor.name for factor in order[-len(EXPENSIVE_FACTORS):]] == list(EXPENSIVE_FACTORS)
+
+
+def test_pruned_calls_skip_expensive_factors(min_score: float = 60.0):
+    scorer = ConfluenceScorer()
+    reference = ConfluenceScorer()
+    pruned = 0
+
+    for window, sr_results, regime_result in scoring_inputs():
+        for direction in (SignalDirection.LONG, SignalDirection.SHORT):
+            before = {name: calls(scorer, name) for name in EXPENSIVE_FACTORS}
+            result = scorer.calculate_confluence_score(window, sr_results, regime_result, direction,
+                                                       min_score=min_score)
+            full = reference.calculate_confluence_score(window, sr_results, regime_result, direction)
+
+            if result is None:
+                pruned += 1
+                assert full.total_score < min_score
+                for name in EXPENSIVE_FACTORS:
+                    assert calls(scorer, name) == before[name], f"pruned call scored {name}"
+            else:
+                assert result == full
+
+    assert pruned, "no call was pruned; raise min_score"
+
+
+def test_fully_scored_result_not_pruned():
+    # With one factor there is nothing left to skip once it is scored
+    scorer = ConfluenceScorer(factors={name: name == 'regime_alignment' for name in ConfluenceScorer().factors})
+
+    for window, sr_results, regime_result in scoring_inputs(step=100):
+        full = scorer.calculate_confluence_score(window, sr_results, regime_result, SignalDirection.LONG)
+        result = scorer.calculate_confluence_score(window, sr_results, regime_result, SignalDirection.LONG,
+                                                   min_score=full.total_score + 1)
+        assert result == full
+
+
+def main():
+    """Run all early-exit checks"""
+    tests = [test_expensive_factors_scored_last, test_pruned_calls_skip_expensive_factors,
+             test_fully_scored_result_not_pruned]
+
+    print("Testing early-exit confluence scoring...")
+    print("=" * 50)
+
+    all_good = True
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            all_good = False
+
+    print("=" * 50)
+    if not all_good:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+IndicatorFrame reuse test
+Checks that indicator_frame only reuses a frame built on the same DataFrame
+object and computes fresh indicators for anything else, including a copy
+whose last bar was updated in place
+"""
+
+import sys
+import logging
+
+import numpy as np
+
+from demo import generate_sample_ohlcv_data
+from indicators import IndicatorFrame, indicator_frame
+from regime_detector import RegimeDetector
+
+logging.disable(logging.CRITICAL)
+
+
+def sample_data(num_bars: int = 300, seed: int = 3):
+    np.random.seed(seed)
+    return generate_sample_ohlcv_data(num_bars, 100)
+
+
+def test_same_data_reuses_frame():
+    data = sample_data()
+    frame = IndicatorFrame(data)
+    assert indicator_frame(data, frame) is frame
+
+
+def test_updated_copy_gets_fresh_frame():
+    live = sample_data()
+    frame = IndicatorFrame(live)
+    frame.atr(14)
+
+    # Same length and index, but the forming candle moved
+    updated = live.copy()
+    updated.iloc[-1, updated.columns.get_loc('high')] *= 1.05
+    updated.iloc[-1, updated.columns.get_loc('close')] *= 1.05
+
+    fresh = indicator_frame(updated, frame)
+    assert fresh is not frame and fresh.data is updated
+
+    detector = RegimeDetector()
+    expected = detector._calculate_atr(updated).iloc[-1]
+    assert detector._calculate_atr(updated, frame).iloc[-1] == expected
+    assert expected != frame.atr(detector.atr_period).iloc[-1]
+
+
+def test_prefix_gets_fresh_frame():
+    data = sample_data()
+    frame = IndicatorFrame(data)
+    prefix = data.iloc[:200]
+
+    assert indicator_frame(prefix, frame).rsi(14).equals(IndicatorFrame(prefix).rsi(14))
+
+
+def main():
+    """Run all IndicatorFrame reuse checks"""
+    tests = [test_same_data_reuses_frame, test_updated_copy_gets_fresh_frame, test_prefix_gets_fresh_frame]
+
+    print("Testing IndicatorFrame reuse...")
+    print("=" * 50)
+
+    all_good = True
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            all_good = False
+
+    print("=" * 50)
+    if not all_good:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Parity test for SupportResistanceEngine._cluster_pivots
+Runs the original O(n^2) Pine Script clustering and the fast implementation
+on randomized pivot sets and checks that they return identical clusters
+"""
+
+import sys
+
+import numpy as np
+
+from sr_engine import SupportResistanceEngine
+
+
+def cluster_pivots_reference(pivot_values, channel_width, min_strength, max_sr_levels):
+    """Original pairwise clustering, kept verbatim as the reference"""
+    clusters = []
+
+    for i, pivot_base in enumerate(pivot_values):
+        cluster_low = pivot_base
+        cluster_high = pivot_base
+        num_pivots = 0
+
+        # Find all pivots within channel width of this pivot
+        for j, pivot_test in enumerate(pivot_values):
+            if pivot_test <= cluster_low:
+                width = cluster_high - pivot_test
+            else:
+                width = pivot_test - cluster_low
+
+            if width <= channel_width:
+                if pivot_test <= cluster_high:
+                    cluster_low = min(cluster_low, pivot_test)
+                else:
+                    cluster_high = max(cluster_high, pivot_test)
+                num_pivots += 1
+
+        # Check if this cluster overlaps with existing clusters
+        is_valid = True
+        overlapping_indices = []
+
+        for k, (existing_high, existing_low, existing_strength) in enumerate(clusters):
+            # Check for overlap
+            if ((existing_high >= cluster_low and existing_high <= cluster_high) or
+                (existing_low >= cluster_low and existing_low <= cluster_high)):
+
+                if num_pivots >= existing_strength:
+                    # New cluster is stronger, mark existing for removal
+                    overlapping_indices.append(k)
+                else:
+                    # Existing cluster is stronger, don't add new one
+                    is_valid = False
+                    break
+
+        if is_valid and num_pivots >= min_strength:
+            # Remove overlapping weaker clusters (in reverse order to maintain indices)
+            for idx in sorted(overlapping_indices, reverse=True):
+                clusters.pop(idx)
+
+            clusters.append((cluster_high, cluster_low, num_pivots))
+
+    # Sort by strength (descending) and limit to max levels
+    clusters.sort(key=lambda x: x[2], reverse=True)
+    return clusters[:max_sr_levels]
+
+
+def random_pivot_set(rng):
+    """Pivot values shaped like real data: a drifting price with repeated ticks"""
+    count = int(rng.integers(0, 400))
+    price = float(rng.uniform(1, 50000))
+    values = price * (1 + np.cumsum(rng.normal(0, 0.01, count)))
+
+    # Coarse rounding produces exact ties, which exercise the <= / >= edges
+    decimals = int(rng.integers(-1, 4))
+    values = np.round(values, decimals)
+
+    price_range = float(values.max() - values.min()) if count else 1.0
+    channel_width = price_range * float(rng.choice([0.0, 0.02, 0.05, 0.1, 0.25, 1.0]))
+
+    return list(values), channel_width
+
+
+def test_cluster_parity_randomized(trials: int = 200, seed: int = 7):
+    rng = np.random.default_rng(seed)
+
+    for trial in range(trials):
+        pivot_values, channel_width = random_pivot_set(rng)
+        engine = SupportResistanceEngine(
+            min_strength=int(rng.integers(0, 6)),
+            max_sr_levels=int(rng.integers(1, 20))
+        )
+
+        expected = cluster_pivots_reference(
+            pivot_values, channel_width, engine.min_strength, engine.max_sr_levels
+        )
+        actual = engine._cluster_pivots(pivot_values, channel_width)
+
+        assert actual == expected, (
+            f"trial {trial}: {len(pivot_values)} pivots, width {channel_width}\n"
+            f"expected {expected}\nactual   {actual}"
+        )
+
+
+def test_cluster_parity_degenerate_widths():
+    engine = SupportResistanceEngine(min_strength=0)
+    pivot_values = [10.0, 10.0, 11.0, 9.5, 10.0]
+
+    for channel_width in (0.0, -1.0, float('nan'), float('inf')):
+        expected = cluster_pivots_reference(
+            pivot_values, channel_width, engine.min_strength, engine.max_sr_levels
+        )
+        assert engine._cluster_pivots(pivot_values, channel_width) == expected, channel_width
+
+
+def main():
+    """Run all parity checks"""
+    tests = [test_cluster_parity_randomized, test_cluster_parity_degenerate_widths]
+
+    print("Testing S/R clustering parity...")
+    print("=" * 50)
+
+    all_good = True
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            all_good = False
+
+    print("=" * 50)
+    if not all_good:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,10 +29,18 @@ def main():
     """Test all module files"""
     files_to_test = [
         'sr_engine.py',
+        'shared_data.py',
+        'rolling_extremes.py',
+        'indicators.py',
+        'reasoning.py',
+        'timeframes.py',
         'regime_detector.py', 
         'confluence_scorer.py',
         'signal_generator.py',
         'backtester.py',
+        'sweep.py',
+        'walk_forward.py',
+        'portfolio.py',
         'data_fetcher.py',
         'main.py',
         '__init__.py'
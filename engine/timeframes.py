@@ -0,0 +1,113 @@
+"""
+Timeframe helpers
+Parses Binance-style timeframe labels and resamples OHLCV frames to higher
+timeframes, with a small cache for repeated multi-timeframe analysis
+"""
+
+import pandas as pd
+from collections import OrderedDict
+from typing import Hashable, Optional
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Minutes per timeframe unit ('1M' is treated as 30 days for ordering)
+_UNIT_MINUTES = {'m': 1, 'h': 60, 'd': 1440, 'w': 10080, 'M': 43200}
+
+_TIMEFRAME_PATTERN = re.compile(r'^(\d+)([mhdwM])$')
+
+OHLCV_AGGREGATION = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def timeframe_minutes(timeframe: str) -> Optional[int]:
+    """Length of a timeframe label such as '15m', '4h' or '1d' in minutes (None if not a timeframe)"""
+    match = _TIMEFRAME_PATTERN.match(str(timeframe))
+    if not match:
+        return None
+    return int(match.group(1)) * _UNIT_MINUTES[match.group(2)]
+
+
+def bar_minutes(data: pd.DataFrame) -> Optional[float]:
+    """Typical bar spacing of a DatetimeIndex frame in minutes (median gap)"""
+    if not isinstance(data.index, pd.DatetimeIndex) or len(data) < 2:
+        return None
+    return data.index.to_series().diff().median().total_seconds() / 60
+
+
+def resample_ohlcv(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars into a higher timeframe
+
+    Bins are aligned like exchange candles: minute/hour/day timeframes to
+    the Unix epoch, '1w' to Monday and '1M' to the first of the month. The
+    last bin may be partial, like a still-open exchange candle.
+
+    Args:
+        data: OHLCV DataFrame with a DatetimeIndex
+        timeframe: Target timeframe label (e.g. '1d')
+
+    Returns:
+        Resampled DataFrame with the columns of data that have an aggregation
+    """
+    minutes = timeframe_minutes(timeframe)
+    if minutes is None:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    if not isinstance(data.index, pd.DatetimeIndex):
+        raise ValueError("Resampling requires a DatetimeIndex")
+
+    unit = timeframe[-1]
+    if unit == 'w':
+        resampler = data.resample(f"{minutes // 10080}W-MON", label='left', closed='left')
+    elif unit == 'M':
+        resampler = data.resample(f"{minutes // 43200}MS")
+    else:
+        resampler = data.resample(f"{minutes}min", origin='epoch')
+
+    aggregation = {col: how for col, how in OHLCV_AGGREGATION.items() if col in data.columns}
+    return resampler.agg(aggregation).dropna(subset=['close'])
+
+
+class ResampleCache:
+    """
+    LRU cache of resample_ohlcv results
+
+    Entries are keyed by timeframe, length, first/last timestamp and the last
+    bar's values, which identifies append-only frames (including a last bar
+    that is still being updated) without hashing every row.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[Hashable, pd.DataFrame]" = OrderedDict()
+
+    def _key(self, data: pd.DataFrame, timeframe: str) -> Hashable:
+        if len(data) == 0:
+            return (timeframe, 0)
+        return (timeframe, len(data), data.index[0], data.index[-1],
+                tuple(data.iloc[-1].to_numpy(dtype=float).tolist()))
+
+    def resample(self, data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        key = self._key(data, timeframe)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        resampled = resample_ohlcv(data, timeframe)
+        if self.maxsize > 0:
+            self._cache[key] = resampled
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return resampled
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+if __name__ == "__main__":
+    # Example usage
+    pass
@@ -0,0 +1,286 @@
+"""
+Walk-forward analysis
+Optimizes a parameter grid on rolling in-sample windows and evaluates each
+window's best config on the out-of-sample bars that follow, stitching the
+out-of-sample trades and equity into one run
+
+Runs on ParameterSweep's process pool, one task per chunk of (window,
+config) pairs that share a precompute. Each config group's
+SignalGenerator.precompute runs on the full data once per worker and is
+shared by every window: the precomputed series are causal, so a window ending
+at bar j is backtested on a prefix of them, and indicators carry their full
+history into each window instead of restarting cold.
+"""
+
+import pandas as pd
+import numpy as np
+from dataclasses import replace
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import json
+import logging
+
+from backtester import BacktestResult, Trade
+from indicators import IndicatorFrame
+from sweep import (ParameterSweep, build_backtester, build_signal_generator, config_key,
+                   expand_grid, precompute_signals, result_row)
+
+logger = logging.getLogger(__name__)
+
+
+class WalkForwardWindow(NamedTuple):
+    """Bar positions of one walk-forward step; each range is [start, end)"""
+    in_sample_start: int
+    in_sample_end: int
+    out_of_sample_end: int
+
+    @property
+    def out_of_sample_start(self) -> int:
+        return self.in_sample_end
+
+
+class WalkForwardResult(NamedTuple):
+    """Walk-forward results"""
+    windows: pd.DataFrame         # One row per window: dates, chosen params, in/out-of-sample metrics
+    trades: List[Trade]           # Out-of-sample trades of every window, rescaled to stitched capital
+    equity_curve: pd.Series       # Stitched out-of-sample equity
+    result: BacktestResult        # Metrics of the stitched out-of-sample run
+
+
+def _in_sample_group(data: pd.DataFrame, indicators: IndicatorFrame,
+                     group: List[Tuple[int, Dict[str, Any], WalkForwardWindow]],
+                     base_config: dict) -> List[Dict[str, Any]]:
+    """In-sample result rows of (window, params, window bars) items whose configs share a precompute"""
+    try:
+        signal_series = precompute_signals(data, indicators, {**base_config, **group[0][1]})
+    except Exception as e:
+        logger.error(f"Error precomputing signals for {config_key(group[0][1])}: {e}")
+        return [{**result_row(params, error=str(e)), 'window': w} for w, params, _ in group]
+
+    rows = []
+    for w, params, window in group:
+        config = {**base_config, **params}
+        try:
+            backtester = build_backtester(config, build_signal_generator(config))
+            result = backtester.run_backtest(data.iloc[:window.in_sample_end],
+                                             min_bars_for_signal=window.in_sample_start,
+                                             signal_series=signal_series)
+            row = result_row(params, result)
+        except Exception as e:
+            logger.error(f"Error backtesting {config_key(params)} in window {w}: {e}")
+            row = result_row(params, error=str(e))
+        row['window'] = w
+        rows.append(row)
+    return rows
+
+
+def _out_of_sample_group(data: pd.DataFrame, indicators: IndicatorFrame,
+                         group: List[Tuple[int, Dict[str, Any], WalkForwardWindow]],
+                         base_config: dict) -> List[Tuple[int, Optional[BacktestResult], Optional[str]]]:
+    """Out-of-sample (window, result, error) of the windows whose chosen configs share a precompute"""
+    try:
+        signal_series = precompute_signals(data, indicators, {**base_config, **group[0][1]})
+    except Exception as e:
+        logger.error(f"Error precomputing signals for {config_key(group[0][1])}: {e}")
+        return [(w, None, str(e)) for w, _, _ in group]
+
+    results = []
+    for w, params, window in group:
+        config = {**base_config, **params}
+        try:
+            backtester = build_backtester(config, build_signal_generator(config))
+            result = backtester.run_backtest(data.iloc[:window.out_of_sample_end],
+                                             min_bars_for_signal=window.out_of_sample_start,
+                                             signal_series=signal_series)
+            results.append((w, result, None))
+        except Exception as e:
+            logger.error(f"Error backtesting {config_key(params)} out of sample in window {w}: {e}")
+            results.append((w, None, str(e)))
+    return results
+
+
+class WalkForward:
+    """
+    Rolling in-sample optimization with out-of-sample evaluation
+
+    Windows start after warmup_bars and step by out_of_sample_bars, so the
+    out-of-sample ranges are back to back. With anchored=True every
+    in-sample range starts at warmup_bars and grows instead of rolling.
+
+    Each out-of-sample window is simulated from initial_capital. The
+    stitched curve compounds the window returns, and trades are rescaled to
+    the capital at their window's start, which is exact for the
+    capital-proportional sizing methods (percent, ATR, Kelly). As in
+    run_backtest, a position still open at a window's end is not recorded
+    as a trade.
+
+    Usage:
+        walk_forward = WalkForward(in_sample_bars=1000, out_of_sample_bars=250, workers=8)
+        result = walk_forward.run(data, {'min_confluence_score': [40, 45, 50],
+                                         'min_risk_reward': [1.5, 2.0]})
+        walk_forward.print_results(result)
+    """
+
+    def __init__(self, in_sample_bars: int, out_of_sample_bars: int,
+                 base_config: Optional[dict] = None, anchored: bool = False,
+                 workers: Optional[int] = None, warmup_bars: int = 100,
+                 rank_by: str = 'sharpe_ratio'):
+        """
+        Args:
+            in_sample_bars: Bars per optimization window
+            out_of_sample_bars: Bars per evaluation window (and the step)
+            base_config: Config shared by every run (see ParameterSweep)
+            anchored: Grow in-sample windows from warmup_bars instead of rolling
+            workers: Number of worker processes (default: CPU count, 1 runs in-process)
+            warmup_bars: Bars before the first window, for indicators and S/R history
+            rank_by: Metric that picks each window's config (highest wins)
+        """
+        # run_backtest needs at least 50 bars after its first signal bar
+        if in_sample_bars < 50 or out_of_sample_bars < 50:
+            raise ValueError("Walk-forward windows need at least 50 bars each")
+
+        self.in_sample_bars = in_sample_bars
+        self.out_of_sample_bars = out_of_sample_bars
+        self.anchored = anchored
+        self.warmup_bars = warmup_bars
+        self.rank_by = rank_by
+        self.sweep = ParameterSweep(base_config, workers=workers,
+                                    min_bars_for_signal=warmup_bars, rank_by=rank_by)
+
+    def windows(self, num_bars: int) -> List[WalkForwardWindow]:
+        """Walk-forward windows that fit in num_bars bars"""
+        windows = []
+        start = self.warmup_bars
+        while start + self.in_sample_bars + self.out_of_sample_bars <= num_bars:
+            in_sample_end = start + self.in_sample_bars
+            windows.append(WalkForwardWindow(
+                self.warmup_bars if self.anchored else start,
+                in_sample_end,
+                in_sample_end + self.out_of_sample_bars
+            ))
+            start += self.out_of_sample_bars
+        return windows
+
+    def _best_configs(self, rows: List[Dict[str, Any]],
+                      configs: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Highest in-sample rank_by row per window (grid order breaks ties)"""
+        order = {config_key(params): k for k, params in enumerate(configs)}
+        best: Dict[int, Dict[str, Any]] = {}
+        for row in sorted(rows, key=lambda row: order[row['key']]):
+            score = row[self.rank_by]
+            if np.isnan(score):
+                continue
+            current = best.get(row['window'])
+            if current is None or score > current[self.rank_by]:
+                best[row['window']] = row
+        return best
+
+    def run(self, data: pd.DataFrame, grid: Dict[str, Iterable]) -> WalkForwardResult:
+        """
+        Optimize on every in-sample window, then evaluate out of sample
+
+        Args:
+            data: OHLCV DataFrame with datetime index
+            grid: Dictionary of {config key: candidate values}
+
+        Returns:
+            WalkForwardResult
+        """
+        windows = self.windows(len(data))
+        if not windows:
+            raise ValueError("Insufficient data for a walk-forward window")
+
+        configs = expand_grid(grid)
+        runs = [(w, params, window) for params in configs for w, window in enumerate(windows)]
+        groups = self.sweep.group_configs(runs, params=lambda item: item[1])
+        logger.info(f"Walk-forward over {len(windows)} windows, {len(configs)} configs "
+                    f"in {len(groups)} precompute groups")
+
+        # In-sample: every config on every window, chunks of a group sharing its precompute
+        rows = []
+        for group_rows in self.sweep.map_groups(data, groups, _in_sample_group, self.sweep.base_config):
+            rows.extend(group_rows)
+        best = self._best_configs(rows, configs)
+
+        # Out-of-sample: each window's chosen config, windows grouped by precompute
+        by_key = {config_key(params): params for params in configs}
+        selections = [(w, by_key[best[w]['key']], windows[w]) for w in sorted(best)]
+        out_of_sample_groups = self.sweep.group_configs(selections, params=lambda item: item[1])
+
+        results: Dict[int, Tuple[Optional[BacktestResult], Optional[str]]] = {}
+        for group_results in self.sweep.map_groups(data, out_of_sample_groups, _out_of_sample_group,
+                                                   self.sweep.base_config):
+            for w, result, error in group_results:
+                results[w] = (result, error)
+
+        return self._stitch(data, windows, best, results)
+
+    def _stitch(self, data: pd.DataFrame, windows: List[WalkForwardWindow],
+                best: Dict[int, Dict[str, Any]],
+                results: Dict[int, Tuple[Optional[BacktestResult], Optional[str]]]) -> WalkForwardResult:
+        """Chain the out-of-sample windows into one trade list, equity curve and result"""
+        backtester = build_backtester(self.sweep.base_config, build_signal_generator(self.sweep.base_config))
+        initial_capital = backtester.initial_capital
+        capital = initial_capital
+
+        trades = []
+        pieces = []
+        window_rows = []
+        for w, window in enumerate(windows):
+            row = {
+                'in_sample_start': data.index[window.in_sample_start],
+                'out_of_sample_start': data.index[window.out_of_sample_start],
+                'out_of_sample_end': data.index[window.out_of_sample_end - 1],
+            }
+            result, error = results.get(w, (None, None))
+            if w in best:
+                row.update(json.loads(best[w]['key']))
+                row[f'in_sample_{self.rank_by}'] = best[w][self.rank_by]
+            else:
+                error = "No in-sample result"
+
+            if result is not None:
+                scale = capital / initial_capital
+                equity = result.equity_curve * scale
+                pieces.append(equity if not pieces else equity.iloc[1:])
+                trades.extend(replace(trade, position_size=trade.position_size * scale, pnl=trade.pnl * scale)
+                              for trade in result.trades)
+                capital = equity.iloc[-1]
+
+            row.update({f'out_of_sample_{column}': value
+                        for column, value in result_row({}, result).items()
+                        if column not in ('key', 'error')})
+            row['error'] = error
+            window_rows.append(row)
+
+        equity_curve = pd.concat(pieces) if pieces else pd.Series([initial_capital], dtype=float)
+        return WalkForwardResult(
+            windows=pd.DataFrame(window_rows),
+            trades=trades,
+            equity_curve=equity_curve,
+            result=backtester.calculate_metrics(trades, equity_curve, data)
+        )
+
+    def print_results(self, result: WalkForwardResult) -> None:
+        """Print the per-window table and the stitched out-of-sample summary"""
+        print(f"\n{'='*60}")
+        print(f"PULSEWAVE WALK-FORWARD ({len(result.windows)} windows, optimized for {self.rank_by})")
+        print(f"{'='*60}")
+
+        columns = [col for col in result.windows.columns
+                   if not col.startswith('out_of_sample_') or col in (
+                       'out_of_sample_start', 'out_of_sample_total_return',
+                       'out_of_sample_sharpe_ratio', 'out_of_sample_total_trades')]
+        print(result.windows[columns].to_string(float_format=lambda x: f"{x:.2f}"))
+
+        stitched = result.result
+        print(f"\n📊 STITCHED OUT-OF-SAMPLE")
+        print(f"Total Return:      {stitched.total_return:8.2f}%")
+        print(f"Total Trades:      {stitched.total_trades:8d}")
+        print(f"Win Rate:          {stitched.win_rate:8.2f}%")
+        print(f"Max Drawdown:      {stitched.max_drawdown:8.2f}%")
+        print(f"Sharpe Ratio:      {stitched.sharpe_ratio:8.2f}")
+
+
+if __name__ == "__main__":
+    # Example usage
+    pass